@@ -0,0 +1,252 @@
+"""
+Admission control untuk /api/chat, /api/chat/batch dan /api/chat/stream.
+Request yang diproses bersamaan dibatasi; kelebihannya menunggu di antrean
+berukuran tetap dengan batas waktu tunggu. Jika antrean penuh atau waktu
+tunggu habis, request langsung ditolak (503) alih-alih ikut memperpanjang
+latency semua user. Batch diberi bobot sejumlah pesannya. Rate limit per
+client (token bucket) bersifat opsional.
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Callable, Deque, Dict, Hashable, Iterator, Optional, Tuple
+
+
+class AdmissionRejected(Exception):
+    """Request ditolak karena server kelebihan beban"""
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(reason)
+        self.reason = reason            # "queue_full" atau "timeout"
+        self.retry_after = retry_after  # saran detik sebelum mencoba lagi
+
+
+class AdmissionController:
+    """Batas concurrency + antrean tunggu berukuran tetap dengan deadline"""
+
+    def __init__(self, max_concurrent: int, max_queue: int, queue_timeout: float,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        max_concurrent : jumlah request yang boleh diproses bersamaan (<= 0 = tanpa batas)
+        max_queue      : jumlah request yang boleh menunggu slot
+        queue_timeout  : detik maksimal menunggu slot sebelum ditolak
+        """
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._clock = clock
+        self._condition = threading.Condition()
+
+        self.in_flight = 0
+        self.queued = 0
+        self.admitted = 0
+        self.rejected: Dict[str, int] = {'queue_full': 0, 'timeout': 0}
+        # Request ditolak yang tetap dijawab dari cache respons
+        self.shed_cached = 0
+
+    def weight(self, weight: int) -> int:
+        """Jumlah slot untuk request berbobot `weight` (mis. jumlah pesan batch), maksimal semua slot"""
+        return max(1, min(weight, self.max_concurrent))
+
+    def acquire(self, weight: int = 1):
+        """Ambil `weight` slot; raise AdmissionRejected jika antrean penuh atau deadline lewat"""
+        if self.max_concurrent <= 0:
+            return
+
+        weight = self.weight(weight)
+        with self._condition:
+            if self.in_flight + weight <= self.max_concurrent and self.queued == 0:
+                self.in_flight += weight
+                self.admitted += 1
+                return
+
+            if self.queued >= self.max_queue:
+                self.rejected['queue_full'] += 1
+                raise AdmissionRejected('queue_full', self.queue_timeout)
+
+            self.queued += 1
+            deadline = self._clock() + self.queue_timeout
+            try:
+                while self.in_flight + weight > self.max_concurrent:
+                    remaining = deadline - self._clock()
+                    if remaining <= 0:
+                        self.rejected['timeout'] += 1
+                        raise AdmissionRejected('timeout', self.queue_timeout)
+                    self._condition.wait(remaining)
+            finally:
+                self.queued -= 1
+
+            self.in_flight += weight
+            self.admitted += 1
+
+    def release(self, weight: int = 1):
+        if self.max_concurrent <= 0:
+            return
+        with self._condition:
+            self.in_flight -= self.weight(weight)
+            # Semua dibangunkan: yang butuh slot lebih sedikit bisa masuk duluan
+            self._condition.notify_all()
+
+    def saturated(self) -> bool:
+        """True jika antrean penuh (request baru pasti ditolak)"""
+        return self.max_concurrent > 0 and self.queued >= self.max_queue
+
+    def record_cached_reply(self):
+        with self._condition:
+            self.shed_cached += 1
+
+    @contextmanager
+    def admit(self, weight: int = 1) -> Iterator[None]:
+        """with controller.admit(): ... (slot dilepas otomatis)"""
+        self.acquire(weight)
+        try:
+            yield
+        finally:
+            self.release(weight)
+
+    def stats(self) -> Dict[str, int]:
+        """Snapshot gauge & counter"""
+        with self._condition:
+            return {
+                'in_flight': self.in_flight,
+                'queue_depth': self.queued,
+                'admitted': self.admitted,
+                'rejected_queue_full': self.rejected['queue_full'],
+                'rejected_timeout': self.rejected['timeout'],
+                'shed_cached': self.shed_cached,
+            }
+
+
+class AsyncAdmissionController(AdmissionController):
+    """
+    AdmissionController untuk event loop asyncio (asgi.py): request menunggu slot
+    sebagai future di event loop (FIFO), bukan memblokir thread.
+    Semua method dipanggil dari thread event loop.
+    """
+
+    def __init__(self, max_concurrent: int, max_queue: int, queue_timeout: float):
+        super().__init__(max_concurrent, max_queue, queue_timeout)
+        # (slot, future) yang menunggu, urut kedatangan
+        self._waiters: Deque[Tuple[int, asyncio.Future]] = deque()
+
+    async def acquire_async(self, weight: int = 1):
+        """Ambil `weight` slot; raise AdmissionRejected jika antrean penuh atau deadline lewat"""
+        if self.max_concurrent <= 0:
+            return
+
+        weight = self.weight(weight)
+        if self.in_flight + weight <= self.max_concurrent and not self._waiters:
+            self.in_flight += weight
+            self.admitted += 1
+            return
+
+        if self.queued >= self.max_queue:
+            self.rejected['queue_full'] += 1
+            raise AdmissionRejected('queue_full', self.queue_timeout)
+
+        future = asyncio.get_running_loop().create_future()
+        waiter = (weight, future)
+        self._waiters.append(waiter)
+        self.queued += 1
+        try:
+            await asyncio.wait_for(asyncio.shield(future), self.queue_timeout)
+        except asyncio.TimeoutError:
+            # Slot bisa saja diberikan tepat saat deadline lewat: tetap dipakai
+            if not future.done():
+                self.rejected['timeout'] += 1
+                raise AdmissionRejected('timeout', self.queue_timeout)
+        except asyncio.CancelledError:
+            # Slot yang sudah diberikan tepat saat request dibatalkan dikembalikan
+            if future.done():
+                self.release(weight)
+            raise
+        finally:
+            self.queued -= 1
+            if not future.done():
+                future.cancel()
+                self._waiters.remove(waiter)
+
+    @asynccontextmanager
+    async def admit_async(self, weight: int = 1) -> AsyncIterator[None]:
+        """async with controller.admit_async(): ... (slot dilepas otomatis)"""
+        await self.acquire_async(weight)
+        try:
+            yield
+        finally:
+            self.release(weight)
+
+    def release(self, weight: int = 1):
+        if self.max_concurrent <= 0:
+            return
+        self.in_flight -= self.weight(weight)
+        # FIFO: hanya kepala antrean yang boleh masuk, agar batch tidak kelaparan
+        while self._waiters and self.in_flight + self._waiters[0][0] <= self.max_concurrent:
+            weight, future = self._waiters.popleft()
+            self.in_flight += weight
+            self.admitted += 1
+            future.set_result(None)
+
+    def saturated(self) -> bool:
+        return self.max_concurrent > 0 and self.queued >= self.max_queue
+
+
+class TokenBucketLimiter:
+    """Rate limit per client: `rate` token per detik, maksimal `burst` token tersimpan"""
+
+    def __init__(self, rate: float, burst: int, max_clients: int = 10000,
+                 clock: Callable[[], float] = time.monotonic):
+        """rate <= 0 menonaktifkan rate limit; max_clients membatasi memori (LRU)"""
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._clock = clock
+        self._lock = threading.Lock()
+        # client -> [token, waktu_isi_terakhir]
+        self._buckets: "OrderedDict[Hashable, list]" = OrderedDict()
+        self.limited = 0
+
+    def allow(self, client: Hashable, cost: int = 1) -> bool:
+        """
+        Kurangi `cost` token milik client (mis. jumlah pesan batch); False jika tidak cukup.
+        Request yang lebih mahal dari burst hanya lolos dengan bucket penuh dan
+        meninggalkan token negatif, jadi client harus menunggu sampai terisi lagi.
+        """
+        if self.rate <= 0:
+            return True
+
+        now = self._clock()
+        with self._lock:
+            bucket = self._buckets.get(client)
+            if bucket is None:
+                bucket = self._buckets[client] = [float(self.burst), now]
+                if len(self._buckets) > self.max_clients:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(client)
+                bucket[0] = min(float(self.burst), bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+
+            if bucket[0] >= min(float(cost), float(self.burst)):
+                bucket[0] -= cost
+                return True
+            self.limited += 1
+            return False
+
+    def retry_after(self) -> float:
+        """Detik sampai satu token baru tersedia"""
+        return 1.0 / self.rate if self.rate > 0 else 0.0
+
+
+def client_address(remote_addr: Optional[str], forwarded_for: Optional[str], trusted_hops: int) -> str:
+    """
+    Identitas client untuk rate limit. X-Forwarded-For hanya dipercaya jika ada
+    `trusted_hops` proxy milik kita di depan server: alamat yang ditambahkan proxy
+    terluar (entri ke-`trusted_hops` dari kanan). Entri di kirinya bisa diisi client.
+    """
+    if trusted_hops > 0 and forwarded_for:
+        hops = [hop.strip() for hop in forwarded_for.split(",")]
+        return hops[-trusted_hops] if len(hops) >= trusted_hops else hops[0]
+    return remote_addr or ""
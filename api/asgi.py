@@ -0,0 +1,329 @@
+"""
+Entry point ASGI untuk self-hosting di luar Vercel.
+Route sama dengan index.py (/, /healthz, /readyz, /api/chat, /api/chat/batch,
+/api/chat/stream), tetapi koneksi dilayani asyncio sehingga client lambat tidak
+mengikat worker. /api/chat memakai body terkompresi, ETag, session, Server-Timing,
+metrik dan jawaban cache saat beban berlebih yang sama seperti index.py.
+Klasifikasi (CPU-bound) dijalankan di thread pool yang dibatasi, dengan rate
+limit dan admission control yang sama seperti index.py.
+
+Jalankan (butuh uvicorn):
+    uvicorn api.asgi:app --host 0.0.0.0 --port 5000
+atau lewat config.SERVER_MODE = "asgi" dan `python -m api.serve`.
+"""
+
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .admission import AdmissionRejected, AsyncAdmissionController, TokenBucketLimiter, client_address
+from .chatbot_logic import get_bot, get_bot_reply, get_bot_responses, is_bot_ready
+from .config import (ADMISSION_MAX_CONCURRENT, ADMISSION_MAX_QUEUE, ADMISSION_QUEUE_TIMEOUT, ASGI_EXECUTOR_WORKERS,
+                     ASGI_MAX_PENDING, MAX_BATCH_SIZE, MAX_MESSAGE_LENGTH, MAX_REQUEST_BYTES, RATE_LIMIT_BURST,
+                     RATE_LIMIT_PER_SECOND, STREAM_CHUNK_SIZE, TRUSTED_PROXY_HOPS)
+from .encoded_responses import EncodedResponses
+from .metrics import metrics, server_timing_header
+from .sessions import MAX_SESSION_ID_LENGTH
+from .streaming import iter_reply_events, sse_event
+
+
+class _HTTPError(Exception):
+    """Error yang langsung dikembalikan sebagai respons JSON"""
+
+    def __init__(self, status: int, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status = status
+        # Detik untuk header Retry-After (429/503)
+        self.retry_after = retry_after
+
+
+class ChatASGIApp:
+    """Aplikasi ASGI minimal tanpa framework tambahan"""
+
+    def __init__(self, executor_workers: int = ASGI_EXECUTOR_WORKERS, max_pending: int = ASGI_MAX_PENDING):
+        self._executor = ThreadPoolExecutor(max_workers=executor_workers, thread_name_prefix="classify")
+        # Batasi jumlah tugas yang antre di executor; request lain menunggu di event loop
+        self._pending = asyncio.Semaphore(max_pending)
+        # Batas beban semua route chat, sama seperti index.py
+        self.admission = AsyncAdmissionController(ADMISSION_MAX_CONCURRENT, ADMISSION_MAX_QUEUE,
+                                                  ADMISSION_QUEUE_TIMEOUT)
+        self.rate_limiter = TokenBucketLimiter(RATE_LIMIT_PER_SECOND, RATE_LIMIT_BURST)
+        # Body JSON + gzip/brotli + ETag semua teks respons, disiapkan saat startup
+        self.response_bodies: Optional[EncodedResponses] = None
+        self._routes: Dict[Tuple[str, str], Callable] = {
+            ("GET", "/"): self._home,
+            ("GET", "/healthz"): self._healthz,
+            ("GET", "/readyz"): self._readyz,
+            ("POST", "/api/chat"): self._chat,
+            ("POST", "/api/chat/batch"): self._chat_batch,
+            ("POST", "/api/chat/stream"): self._chat_stream,
+        }
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http":
+            await self._handle_http(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                # Bangun chatbot sebelum menerima request pertama
+                await self._run(self._load)
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self._executor.shutdown(wait=True)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    def _load(self):
+        if self.response_bodies is None:
+            self.response_bodies = EncodedResponses(get_bot().known_responses())
+
+    async def _run(self, func: Callable, *args):
+        """Jalankan fungsi CPU-bound di executor tanpa memblokir event loop"""
+        async with self._pending:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+
+    async def _run_admitted(self, scope, weight: int, func: Callable, *args):
+        """_run di bawah rate limit (weight token) dan admission control (weight slot)"""
+        if not self.rate_limiter.allow(self._client_id(scope), max(1, weight)):
+            raise _HTTPError(429, "Terlalu banyak request", self.rate_limiter.retry_after())
+        try:
+            async with self.admission.admit_async(weight):
+                return await self._run(func, *args)
+        except AdmissionRejected as e:
+            raise _HTTPError(503, "Server sedang sibuk", e.retry_after)
+
+    @staticmethod
+    def _header(scope, name: bytes) -> Optional[str]:
+        """Nilai header request (name huruf kecil), None jika tidak ada"""
+        value = dict(scope.get("headers") or []).get(name)
+        return value.decode("latin-1") if value is not None else None
+
+    def _client_id(self, scope) -> str:
+        """Identitas client untuk rate limit (X-Forwarded-For hanya di belakang TRUSTED_PROXY_HOPS proxy)"""
+        client = scope.get("client")
+        return client_address(client[0] if client else None, self._header(scope, b"x-forwarded-for"),
+                              TRUSTED_PROXY_HOPS)
+
+    def _session_id(self, scope, data: dict) -> Optional[str]:
+        """Session id client dari field JSON "session_id" atau header X-Session-Id (opsional)"""
+        session_id = data.get("session_id") or self._header(scope, b"x-session-id")
+        if isinstance(session_id, str) and 0 < len(session_id) <= MAX_SESSION_ID_LENGTH:
+            return session_id
+        return None
+
+    async def _handle_http(self, scope, receive, send):
+        method = scope["method"]
+        path = scope["path"]
+
+        if method == "OPTIONS":
+            await self._send_preflight(scope, send)
+            return
+
+        handler = self._routes.get((method, path))
+        if handler is None:
+            allowed = [m for (m, p) in self._routes if p == path]
+            status = 405 if allowed else 404
+            await self._send_json(send, status, {"error": "Method not allowed" if allowed else "Not found"})
+            return
+
+        try:
+            await handler(scope, receive, send)
+        except _HTTPError as e:
+            headers = None
+            if e.retry_after is not None:
+                headers = [(b"retry-after", str(max(1, round(e.retry_after))).encode("latin-1"))]
+            await self._send_json(send, e.status, {"error": str(e)}, headers)
+        except Exception as e:
+            await self._send_json(send, 500, {"error": str(e)})
+
+    async def _read_json(self, receive, timings: Optional[Dict[str, float]] = None) -> dict:
+        body = bytearray()
+        while True:
+            message = await receive()
+            body.extend(message.get("body", b""))
+            if MAX_REQUEST_BYTES and len(body) > MAX_REQUEST_BYTES:
+                raise _HTTPError(413, f"Body melebihi {MAX_REQUEST_BYTES} byte")
+            if not message.get("more_body", False):
+                break
+
+        if not body:
+            return {}
+        start = perf_counter()
+        try:
+            data = json.loads(body)
+        except ValueError:
+            raise _HTTPError(400, "Body bukan JSON yang valid")
+        if not isinstance(data, dict):
+            raise _HTTPError(400, "Body harus berupa objek JSON")
+        if timings is not None:
+            timings['parse'] = perf_counter() - start
+        return data
+
+    @staticmethod
+    def _check_length(message):
+        """Tolak pesan melebihi MAX_MESSAGE_LENGTH (sama seperti index.py)"""
+        if MAX_MESSAGE_LENGTH > 0 and isinstance(message, str) and len(message) > MAX_MESSAGE_LENGTH:
+            raise _HTTPError(413, f"Pesan melebihi {MAX_MESSAGE_LENGTH} karakter")
+
+    # ---- Route ----
+
+    async def _home(self, scope, receive, send):
+        await self._send(send, 200, b"Chatbot API ASGI aktif", "text/plain; charset=utf-8")
+
+    async def _healthz(self, scope, receive, send):
+        await self._send_json(send, 200, {"status": "ok"})
+
+    async def _readyz(self, scope, receive, send):
+        if not is_bot_ready():
+            await self._send_json(send, 503, {"status": "loading"})
+        elif self.admission.saturated():
+            await self._send_json(send, 503, {"status": "busy"})
+        else:
+            await self._send_json(send, 200, {"status": "ready"})
+
+    async def _chat(self, scope, receive, send):
+        timings = metrics.new_timings()
+        user_message = None
+        try:
+            data = await self._read_json(receive, timings)
+            user_message = data.get("message", "")
+            self._check_length(user_message)
+            reply = await self._run_admitted(scope, 1, get_bot_reply, user_message, timings,
+                                             self._session_id(scope, data))
+        except _HTTPError as e:
+            # Saat admission menolak (503) jawaban cache tetap boleh dipakai; rate limit selalu 429
+            if e.status == 503 and isinstance(user_message, str):
+                cached = get_bot().cached_reply(user_message)
+                if cached is not None:
+                    self.admission.record_cached_reply()
+                    body, headers = self._chat_body(scope, cached.response)
+                    await self._send(send, 200, body, "application/json", headers + [(b"x-load-shed", b"cached")])
+                    if metrics.enabled:
+                        metrics.record_request("/api/chat", 200, {})
+                    return
+            if metrics.enabled:
+                metrics.record_request("/api/chat", e.status, timings)
+            raise
+        except Exception:
+            if metrics.enabled:
+                metrics.record_request("/api/chat", 500, timings)
+            raise
+
+        start = perf_counter()
+        body, headers = self._chat_body(scope, reply.response)
+        if timings is not None:
+            timings['serialize'] = perf_counter() - start
+            headers.append((b"server-timing", server_timing_header(timings).encode("latin-1")))
+            metrics.record_request("/api/chat", 200, timings, reply.intent.value, reply.fallback_used)
+        await self._send(send, 200, body, "application/json", headers)
+
+    async def _chat_batch(self, scope, receive, send):
+        data = await self._read_json(receive)
+        messages = data.get("messages")
+
+        if not isinstance(messages, list) or not all(isinstance(m, str) for m in messages):
+            raise _HTTPError(400, "Field 'messages' harus berupa list string")
+        if len(messages) > MAX_BATCH_SIZE:
+            raise _HTTPError(400, f"Maksimal {MAX_BATCH_SIZE} pesan per batch")
+        for message in messages:
+            self._check_length(message)
+
+        # Satu batch = sejumlah pesannya, baik untuk rate limit maupun slot admission
+        replies = await self._run_admitted(scope, len(messages), get_bot_responses, messages)
+        await self._send_json(send, 200, {"results": [reply.to_dict() for reply in replies]})
+
+    async def _chat_stream(self, scope, receive, send):
+        data = await self._read_json(receive)
+        user_message = data.get("message", "")
+        self._check_length(user_message)
+
+        # Ditolak (429/503) atau klasifikasi selesai sebelum header stream dikirim
+        reply, error = None, None
+        try:
+            reply = await self._run_admitted(scope, 1, get_bot_reply, user_message)
+        except _HTTPError:
+            raise
+        except Exception as e:
+            error = e
+
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": self._headers("text/event-stream; charset=utf-8", [
+                (b"cache-control", b"no-cache"),
+                (b"x-accel-buffering", b"no"),
+            ]),
+        })
+        if error is None:
+            for event in iter_reply_events(reply, STREAM_CHUNK_SIZE):
+                await send({"type": "http.response.body", "body": event.encode("utf-8"), "more_body": True})
+        else:
+            event = sse_event("error", {"error": str(error)})
+            await send({"type": "http.response.body", "body": event.encode("utf-8"), "more_body": True})
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    # ---- Helper respons ----
+
+    def _chat_body(self, scope, text: str) -> Tuple[bytes, List[Tuple[bytes, bytes]]]:
+        """Body {"response": text} yang sudah di-encode sesuai Accept-Encoding, beserta header-nya"""
+        if self.response_bodies is None:
+            # Server ASGI tanpa lifespan: siapkan saat request pertama
+            self._load()
+        encoded = self.response_bodies.body(text)
+        body, encoding = encoded.select(self.response_bodies.encodings(self._header(scope, b"accept-encoding") or ""))
+        # ETag = sidik jari isi jawaban, bukan validator cache (lihat _encoded_chat_response di index.py)
+        headers = [
+            (b"etag", encoded.etag.encode("latin-1")),
+            (b"vary", b"Accept-Encoding"),
+            (b"access-control-expose-headers", b"ETag"),
+        ]
+        if encoding is not None:
+            headers.append((b"content-encoding", encoding.encode("latin-1")))
+        return body, headers
+
+    @staticmethod
+    def _headers(content_type: str, extra: Optional[List[Tuple[bytes, bytes]]] = None) -> List[Tuple[bytes, bytes]]:
+        # Izinkan semua origin, sama seperti CORS(app) di index.py
+        headers = [
+            (b"content-type", content_type.encode("latin-1")),
+            (b"access-control-allow-origin", b"*"),
+        ]
+        return headers + (extra or [])
+
+    async def _send(self, send, status: int, body: bytes, content_type: str,
+                    extra: Optional[List[Tuple[bytes, bytes]]] = None):
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": self._headers(content_type, [(b"content-length", str(len(body)).encode("latin-1"))]
+                                     + (extra or [])),
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    async def _send_json(self, send, status: int, payload: dict,
+                         extra: Optional[List[Tuple[bytes, bytes]]] = None):
+        await self._send(send, status, json.dumps(payload).encode("utf-8"), "application/json", extra)
+
+    async def _send_preflight(self, scope, send):
+        request_headers = dict(scope.get("headers") or [])
+        allow_headers = request_headers.get(b"access-control-request-headers", b"*")
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": self._headers("text/plain; charset=utf-8", [
+                (b"access-control-allow-methods", b"GET, POST, OPTIONS"),
+                (b"access-control-allow-headers", allow_headers),
+                (b"content-length", b"0"),
+            ]),
+        })
+        await send({"type": "http.response.body", "body": b""})
+
+
+app = ChatASGIApp()
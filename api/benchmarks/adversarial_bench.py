@@ -0,0 +1,148 @@
+"""
+Benchmark input adversarial: latency classify() untuk pesan yang sengaja
+memancing backtracking regex, dibandingkan antara pencocokan regex (re) dan
+LinearPatternSet (guarded), lalu dengan batas waktu pencocokan pola
+(time_budget, lihat CLASSIFY_TIME_BUDGET). Budget hanya memotong tahap
+pattern_match; normalisasi dan skor keyword tetap berjalan penuh (linear),
+jadi latency total bisa melebihi budget.
+Jenis pesan per ukuran (karakter):
+  pattern   awal setiap pola ber-`.+` diulang tanpa penutup (diambil yang terburuk)
+  generator MessageGenerator.adversarial dipotong ke ukuran tersebut
+  mixed     gabungan awal semua pola ber-`.+` diulang
+  token     satu token sangat panjang (koreksi typo SymSpell)
+Classifier guarded dibuat baru untuk tiap ukuran (cache DFA kosong), kasus
+terburuk bagi server karena penyerang selalu mengirim pesan baru.
+Eksponen pertumbuhan = kemiringan log(latency maks) terhadap log(ukuran);
+~1 berarti linear. Ukuran di atas MAX_MESSAGE_LENGTH ditolak 413 oleh API,
+tetapi tetap diukur di sini untuk pemanggil classifier langsung.
+Jalankan dari root repo:
+    python -m api.benchmarks.adversarial_bench --sizes 500 1000 2000 4000 8000 --budget-size 200000
+"""
+
+import argparse
+import math
+import random
+import time
+from typing import Dict, List
+
+from api.benchmarks.corpus import MessageGenerator, instantiate_pattern
+from api.chatbot_logic import IntentClassifier
+from api.config import CLASSIFY_TIME_BUDGET
+
+
+def repeat_to(text: str, size: int) -> str:
+    return ((text + " ") * (size // (len(text) + 1) + 1))[:size]
+
+
+def pattern_heads(classifier: IntentClassifier, rng: random.Random) -> List[str]:
+    """Contoh kalimat tiap pola ber-`.+` tanpa bagian terakhirnya (pola tidak pernah selesai cocok)"""
+    heads = []
+    for config in classifier.intent_patterns.values():
+        for pattern in config['patterns']:
+            if '.+' in pattern:
+                words = instantiate_pattern(pattern, rng).split()
+                heads.append(" ".join(words[:max(1, len(words) - 1)]))
+    return heads
+
+
+def adversarial_messages(classifier: IntentClassifier, size: int, seed: int) -> Dict[str, List[str]]:
+    rng = random.Random(seed)
+    heads = pattern_heads(classifier, rng)
+    generator = MessageGenerator(classifier, seed)
+    generated = []
+    for _ in range(10):
+        message, _ = generator.adversarial()
+        generated.append(repeat_to(message, size))
+    return {
+        'pattern': [repeat_to(head, size) for head in heads],
+        'generator': generated,
+        'mixed': [repeat_to(" ".join(heads), size)],
+        'token': ["sirkular" * (size // 8)],
+    }
+
+
+def latencies(classifier: IntentClassifier, messages: List[str]) -> List[float]:
+    result = []
+    for message in messages:
+        start = time.perf_counter()
+        classifier.classify(message)
+        result.append(time.perf_counter() - start)
+    return sorted(result)
+
+
+def stage_maxima(classifier: IntentClassifier, messages: List[str]) -> Dict[str, float]:
+    """Latency maks total dan tahap pattern_match dari score(timings)"""
+    total = pattern = 0.0
+    for message in messages:
+        timings: Dict[str, float] = {}
+        start = time.perf_counter()
+        classifier.score(message, timings)
+        total = max(total, time.perf_counter() - start)
+        pattern = max(pattern, timings['pattern_match'])
+    return {'total': total, 'pattern_match': pattern}
+
+
+def percentile(values: List[float], q: float) -> float:
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def growth_exponent(sizes: List[int], worst: List[float]) -> float:
+    """Kemiringan regresi log(latency) terhadap log(ukuran)"""
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(max(value, 1e-7)) for value in worst]
+    mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+    return (sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+            / sum((x - mean_x) ** 2 for x in xs))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 1000, 2000, 4000, 8000])
+    parser.add_argument("--budget", type=float, default=CLASSIFY_TIME_BUDGET or 0.05,
+                        help="Batas waktu pencocokan pola (detik)")
+    parser.add_argument("--budget-size", type=int, default=200000,
+                        help="Ukuran pesan untuk menguji batas waktu (cukup besar agar budget habis)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    # Tanpa batas waktu: yang diukur murni biaya pencocokan
+    backends = {'re': IntentClassifier(guarded=False), 'guarded': None}
+
+    print(f"{'ukuran':>7} {'jenis':<10} " + " ".join(
+        f"{name + ' p50':>12} {name + ' p99':>12} {name + ' maks':>12}" for name in backends))
+    worst = {name: [] for name in backends}
+    for size in args.sizes:
+        messages = adversarial_messages(backends['re'], size, args.seed)
+        backends['guarded'] = IntentClassifier(time_budget=0)
+        size_worst = {name: 0.0 for name in backends}
+        for kind, kind_messages in messages.items():
+            row = f"{size:>7} {kind:<10} "
+            for name, classifier in backends.items():
+                values = latencies(classifier, kind_messages)
+                size_worst[name] = max(size_worst[name], values[-1])
+                row += " ".join(f"{percentile(values, q) * 1000:>9.2f} ms" for q in (0.5, 0.99, 1.0)) + " "
+            print(row)
+        for name in backends:
+            worst[name].append(size_worst[name])
+
+    if len(args.sizes) > 1:
+        print("\nEksponen pertumbuhan latency maks (1 = linear):")
+        for name in backends:
+            print(f"  {name:<8} {growth_exponent(args.sizes, worst[name]):.2f}")
+
+    # Batas waktu memotong pencocokan pola; normalisasi dan skor keyword (Aho-Corasick)
+    # tetap linear dan berjalan penuh, jadi total = budget + biaya linear keduanya
+    messages = adversarial_messages(backends['re'], args.budget_size, args.seed)
+    budget_messages = messages['mixed'] + messages['generator'][:3]
+    print(f"\nPesan {args.budget_size:,} karakter, batas waktu pencocokan pola {args.budget * 1000:.0f} ms "
+          f"(normalisasi & skor keyword tidak dibatasi):")
+    for label, budget in (("tanpa budget", 0.0), ("dengan budget", args.budget)):
+        classifier = IntentClassifier(time_budget=budget)
+        maxima = stage_maxima(classifier, budget_messages)
+        print(f"  {label:<14} maks total {maxima['total'] * 1000:7.1f} ms, pattern_match "
+              f"{maxima['pattern_match'] * 1000:7.1f} ms, {classifier.budget_exhausted}/{len(budget_messages)} "
+              f"pesan memakai hasil parsial")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Micro-benchmark classifier EcoBuddy dengan gerbang regresi.
+
+Mengukur secara terpisah:
+    classify           IntentClassifier.classify
+    match_pattern      IntentClassifier._match_pattern (semua intent)
+    keyword_score      IntentClassifier._calculate_keyword_score (semua intent)
+    get_response       CircularEconomyBot.get_response (tanpa cache)
+
+Jalankan dari root repo:
+    python -m api.benchmarks.classifier_bench --output bench.json
+    python -m api.benchmarks.classifier_bench --compare bench.json --threshold 0.15
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List
+
+from api.chatbot_logic import CircularEconomyBot
+from api.normalization import normalize_message
+from api.benchmarks.corpus import MessageGenerator
+
+DEFAULT_COUNTS = {'short': 400, 'medium': 400, 'long': 100, 'adversarial': 20}
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, int(round(q * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+
+def time_calls(func: Callable[[str], object], messages: List[str], repeat: int) -> Dict[str, float]:
+    """Jalankan func untuk setiap pesan `repeat` kali, kembalikan throughput & persentil (mikrodetik)"""
+    samples = []
+    perf_counter_ns = time.perf_counter_ns
+    for _ in range(repeat):
+        for message in messages:
+            start = perf_counter_ns()
+            func(message)
+            samples.append(perf_counter_ns() - start)
+
+    samples.sort()
+    total_s = sum(samples) / 1e9
+    return {
+        'calls': len(samples),
+        'throughput_per_s': len(samples) / total_s if total_s else 0.0,
+        'mean_us': statistics.fmean(samples) / 1000,
+        'p50_us': _percentile(samples, 0.50) / 1000,
+        'p95_us': _percentile(samples, 0.95) / 1000,
+        'p99_us': _percentile(samples, 0.99) / 1000,
+    }
+
+
+def run_suite(counts: Dict[str, int], repeat: int, seed: int) -> dict:
+    bot = CircularEconomyBot(cache_size=0)
+    classifier = bot.classifier
+    configs = list(classifier.intent_patterns.values())
+    corpus = MessageGenerator(classifier, seed).generate(counts)
+
+    def match_pattern(message: str):
+        normalized = normalize_message(message)
+        for config in configs:
+            classifier._match_pattern(normalized.text, config['patterns'])
+
+    def keyword_score(message: str):
+        normalized = normalize_message(message)
+        for config in configs:
+            classifier._calculate_keyword_score(normalized.text, config['keywords'], normalized.token_set)
+
+    targets = {
+        'classify': classifier.classify,
+        'match_pattern': match_pattern,
+        'keyword_score': keyword_score,
+        'get_response': bot.get_response,
+    }
+
+    results = {}
+    kinds = ['all'] + list(counts)
+    for name, func in targets.items():
+        # Pemanasan agar cache regex/alokasi awal tidak ikut terukur
+        for message, _, _ in corpus[:50]:
+            func(message)
+        results[name] = {}
+        for kind in kinds:
+            messages = [m for m, _, k in corpus if kind == 'all' or k == kind]
+            if messages:
+                results[name][kind] = time_calls(func, messages, repeat)
+
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'counts': counts,
+            'repeat': repeat,
+            'seed': seed,
+        },
+        'results': results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> List[str]:
+    """Daftar regresi: p50/p95/p99 naik atau throughput turun lebih dari threshold"""
+    regressions = []
+    for name, kinds in current['results'].items():
+        for kind, stats in kinds.items():
+            base = baseline.get('results', {}).get(name, {}).get(kind)
+            if not base:
+                continue
+            for metric in ('p50_us', 'p95_us', 'p99_us'):
+                if base[metric] and stats[metric] > base[metric] * (1 + threshold):
+                    regressions.append(
+                        f"{name}/{kind} {metric}: {base[metric]:.1f} -> {stats[metric]:.1f} µs"
+                    )
+            if stats['throughput_per_s'] < base['throughput_per_s'] * (1 - threshold):
+                regressions.append(
+                    f"{name}/{kind} throughput: {base['throughput_per_s']:,.0f} -> {stats['throughput_per_s']:,.0f}/s"
+                )
+    return regressions
+
+
+def print_report(report: dict):
+    print(f"{'target':15s} {'kind':12s} {'calls':>8s} {'ops/s':>12s} {'p50 µs':>9s} {'p95 µs':>9s} {'p99 µs':>9s}")
+    for name, kinds in report['results'].items():
+        for kind, stats in kinds.items():
+            print(f"{name:15s} {kind:12s} {stats['calls']:8d} {stats['throughput_per_s']:12,.0f} "
+                  f"{stats['p50_us']:9.1f} {stats['p95_us']:9.1f} {stats['p99_us']:9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", help="Tulis hasil ke file JSON")
+    parser.add_argument("--compare", help="File JSON baseline untuk gerbang regresi")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Toleransi regresi relatif (default 0.15)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--scale", type=float, default=1.0, help="Pengali jumlah pesan per kategori")
+    args = parser.parse_args()
+
+    counts = {kind: max(1, int(n * args.scale)) for kind, n in DEFAULT_COUNTS.items()}
+    report = run_suite(counts, args.repeat, args.seed)
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✅ Hasil ditulis ke {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regresi melebihi {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  • {line}")
+            sys.exit(1)
+        print(f"\n✅ Tidak ada regresi melebihi {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Generator pesan sintetis (Indonesia & Inggris) untuk benchmark classifier.
+Pesan dibangun dari pola dan keyword IntentClassifier sendiri, sehingga ikut
+berubah ketika intent baru ditambahkan.
+"""
+
+import random
+import re
+from typing import Dict, List, Tuple
+
+from api.chatbot_logic import Intent, IntentClassifier
+
+FILLER_ID = ['saya', 'mau', 'tahu', 'dong', 'ya', 'tolong', 'sih', 'itu', 'dan', 'yang', 'untuk', 'di', 'sekolah']
+FILLER_EN = ['please', 'i', 'want', 'to', 'know', 'about', 'the', 'and', 'really', 'school', 'for']
+
+_GROUP = re.compile(r'\(([^()]*)\)')
+
+
+def instantiate_pattern(pattern: str, rng: random.Random) -> str:
+    """Ubah pola regex menjadi contoh kalimat yang cocok dengan pola tersebut"""
+    text = _GROUP.sub(lambda m: rng.choice(m.group(1).split('|')), pattern)
+    text = text.replace('.+', f" {rng.choice(FILLER_ID + FILLER_EN)} ")
+    text = text.replace('\\b', '').replace('\\s', ' ')
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+class MessageGenerator:
+    """Menghasilkan pesan berlabel intent dalam beberapa kategori panjang"""
+
+    def __init__(self, classifier: IntentClassifier, seed: int = 42):
+        self.rng = random.Random(seed)
+        self.intents: Dict[Intent, dict] = classifier.intent_patterns
+        self.fillers = FILLER_ID + FILLER_EN
+
+    def _phrase(self, intent: Intent) -> str:
+        config = self.intents[intent]
+        if self.rng.random() < 0.5:
+            return instantiate_pattern(self.rng.choice(config['patterns']), self.rng)
+        return self.rng.choice(config['keywords'])
+
+    def short(self) -> Tuple[str, Intent]:
+        """1-4 kata, seperti 'halo' atau 'tips dong'"""
+        intent = self.rng.choice(list(self.intents))
+        words = [self.rng.choice(self.intents[intent]['keywords'])]
+        if self.rng.random() < 0.5:
+            words.append(self.rng.choice(self.fillers))
+        return " ".join(words) + self.rng.choice(["", "?", "!"]), intent
+
+    def medium(self) -> Tuple[str, Intent]:
+        """Satu kalimat pertanyaan yang dibangun dari pola intent"""
+        intent = self.rng.choice(list(self.intents))
+        prefix = " ".join(self.rng.choice(self.fillers) for _ in range(self.rng.randint(0, 3)))
+        return f"{prefix} {self._phrase(intent)}?".strip(), intent
+
+    def long(self, sentences: int = 12) -> Tuple[str, Intent]:
+        """Paragraf panjang: satu kalimat intent di antara banyak kalimat filler"""
+        intent = self.rng.choice(list(self.intents))
+        parts = [
+            " ".join(self.rng.choice(self.fillers) for _ in range(self.rng.randint(5, 15)))
+            for _ in range(sentences)
+        ]
+        parts.insert(self.rng.randrange(len(parts) + 1), self._phrase(intent))
+        return ". ".join(parts), intent
+
+    def adversarial(self, repeat: int = 200) -> Tuple[str, Intent]:
+        """
+        Awal pola yang diulang tanpa penutup, mis. 'bagaimana hidup hidup ...' —
+        memaksa pola dengan beberapa `.+` melakukan backtracking maksimal.
+        """
+        intent = self.rng.choice(list(self.intents))
+        opener = instantiate_pattern(self.rng.choice(self.intents[intent]['patterns']), self.rng).split()
+        head = opener[:max(1, len(opener) - 1)]
+        return " ".join(head * repeat), intent
+
+    def generate(self, counts: Dict[str, int]) -> List[Tuple[str, Intent, str]]:
+        """Bangun korpus campuran: counts = {'short': n, 'medium': n, 'long': n, 'adversarial': n}"""
+        corpus = []
+        for kind, count in counts.items():
+            make = getattr(self, kind)
+            for _ in range(count):
+                message, intent = make()
+                corpus.append((message, intent, kind))
+        self.rng.shuffle(corpus)
+        return corpus
@@ -0,0 +1,135 @@
+"""
+Benchmark koreksi typo keyword: indeks deletion (SymSpell) vs brute force
+edit distance ke seluruh kosakata, dan classify exact vs fuzzy.
+Jalankan dari root repo:
+    python -m api.benchmarks.fuzzy_bench --tokens 1000 --vocab-scale 1 10
+"""
+
+import argparse
+import random
+import string
+import time
+from typing import List, Optional
+
+from api.chatbot_logic import IntentClassifier
+from api.fuzzy import FUZZY_IGNORE, SymSpellIndex, bounded_edit_distance
+
+
+def make_typo(word: str, rng: random.Random) -> str:
+    """Satu edit acak: hapus, sisip, ganti, atau tukar dua huruf bersebelahan"""
+    i = rng.randrange(len(word))
+    kind = rng.choice(('delete', 'insert', 'replace', 'transpose'))
+    if kind == 'delete':
+        return word[:i] + word[i + 1:]
+    if kind == 'insert':
+        return word[:i] + rng.choice(string.ascii_lowercase) + word[i:]
+    if kind == 'replace':
+        return word[:i] + rng.choice(string.ascii_lowercase) + word[i + 1:]
+    i = min(i, len(word) - 2)
+    return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+
+
+def brute_force_lookup(index: SymSpellIndex, vocabulary: List[str], token: str) -> Optional[str]:
+    """Referensi: bandingkan token dengan setiap kata kosakata (aturan sama dengan SymSpellIndex)"""
+    if token in index.vocabulary or token in FUZZY_IGNORE:
+        return None
+    max_distance = index.allowed_distance(token)
+    if max_distance == 0:
+        return None
+
+    best_word = None
+    best_distance = max_distance + 1
+    for word in vocabulary:
+        distance = bounded_edit_distance(token, word, max_distance)
+        if distance < best_distance:
+            best_word, best_distance = word, distance
+    return best_word
+
+
+def bench_lookup(vocabulary: List[str], tokens: List[str], max_distance: int) -> dict:
+    start = time.perf_counter()
+    index = SymSpellIndex(vocabulary, max_distance=max_distance, cache_size=len(tokens) + 1)
+    build_time = time.perf_counter() - start
+
+    # _lookup dipanggil langsung (tanpa cache) agar yang diukur adalah pencarian di indeks
+    start = time.perf_counter()
+    indexed = [index._lookup(token) for token in tokens]
+    indexed_time = time.perf_counter() - start
+
+    ordered = sorted(index.vocabulary)
+    start = time.perf_counter()
+    brute = [brute_force_lookup(index, ordered, token) for token in tokens]
+    brute_time = time.perf_counter() - start
+
+    return {
+        'vocabulary': len(index.vocabulary),
+        'build_s': build_time,
+        'indexed_us': indexed_time / len(tokens) * 1e6,
+        'brute_us': brute_time / len(tokens) * 1e6,
+        'mismatches': sum(1 for a, b in zip(indexed, brute) if a != b),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tokens", type=int, default=1000, help="Jumlah token uji per ukuran kosakata")
+    parser.add_argument("--messages", type=int, default=20000, help="Jumlah pesan untuk classify exact vs fuzzy")
+    parser.add_argument("--vocab-scale", type=int, nargs="+", default=[1, 10],
+                        help="Kelipatan ukuran kosakata (kata sintetis ditambahkan ke kosakata intent)")
+    parser.add_argument("--max-distance", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    fuzzy = IntentClassifier(fuzzy_max_distance=args.max_distance)
+    exact = IntentClassifier(fuzzy_max_distance=0)
+    base_vocabulary = sorted(fuzzy.typo_index.vocabulary)
+    long_words = [word for word in base_vocabulary if len(word) >= fuzzy.typo_index.min_length]
+
+    print(f"{'kosakata':>9} {'build':>9} {'indeks':>11} {'brute':>11} {'speedup':>8} {'mismatch':>8}")
+    failed = False
+    for scale in args.vocab_scale:
+        vocabulary = list(base_vocabulary)
+        while len(vocabulary) < len(base_vocabulary) * scale:
+            vocabulary.append("".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 12))))
+        tokens = [make_typo(rng.choice(long_words), rng) for _ in range(args.tokens)]
+
+        result = bench_lookup(vocabulary, tokens, args.max_distance)
+        failed |= result['mismatches'] > 0
+        print(f"{result['vocabulary']:>9,} {result['build_s']:>8.2f}s {result['indexed_us']:>9.1f}us "
+              f"{result['brute_us']:>9.1f}us {result['brute_us'] / result['indexed_us']:>7.1f}x "
+              f"{result['mismatches']:>8}")
+
+    # Pesan dengan typo pada kata keyword: berapa yang intent-nya kembali sama dengan versi bersih
+    templates = [
+        "apa itu ekonomi sirkular", "jelaskan prinsip ekonomi sirkular", "bahaya sampah plastik",
+        "apa itu sustainability", "manfaat ekonomi sirkular", "contoh penerapan ekonomi sirkular",
+        "energi terbarukan itu apa", "perubahan iklim dan pemanasan global", "tips memulai gaya hidup ramah lingkungan",
+    ]
+    clean, typos = [], []
+    for _ in range(args.messages):
+        words = rng.choice(templates).split()
+        targets = [i for i, word in enumerate(words) if len(word) >= fuzzy.typo_index.min_length]
+        i = rng.choice(targets)
+        clean.append(" ".join(words))
+        typos.append(" ".join(words[:i] + [make_typo(words[i], rng)] + words[i + 1:]))
+
+    timings = {}
+    for name, classifier in (('exact', exact), ('fuzzy', fuzzy)):
+        start = time.perf_counter()
+        results = [classifier.classify(message) for message in typos]
+        timings[name] = (time.perf_counter() - start, results)
+
+    expected = [exact.classify(message)[0] for message in clean]
+    print()
+    for name, (elapsed, results) in timings.items():
+        recovered = sum(1 for (intent, _), want in zip(results, expected) if intent == want)
+        print(f"classify {name:5s}: {len(typos) / elapsed:>10,.0f} pesan/s  "
+              f"intent sama dengan pesan bersih: {recovered / len(typos):6.1%}")
+
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
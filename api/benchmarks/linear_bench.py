@@ -0,0 +1,108 @@
+"""
+Benchmark backend linear (linear_model.py) dibandingkan IntentClassifier:
+akurasi terhadap label korpus sintetis dan throughput klasifikasi.
+Korpus training dan uji dibuat dengan seed berbeda; pesan berisi kata
+filler saja diberi label "unknown".
+Jalankan dari root repo:
+    python -m api.benchmarks.linear_bench --train 10000 --test 5000
+    python -m api.benchmarks.linear_bench --write-corpus korpus.jsonl   # untuk `linear_model train`
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from collections import defaultdict
+
+from api.benchmarks.corpus import MessageGenerator
+from api.chatbot_logic import Intent, IntentClassifier
+from api.linear_model import HashedFeatures, LinearIntentClassifier, LinearIntentModel
+from api.normalization import normalize_message
+
+
+def labeled_corpus(classifier: IntentClassifier, count: int, seed: int) -> list:
+    """(pesan, label, jenis): pesan generator + sekitar 5% pesan filler berlabel unknown"""
+    generator = MessageGenerator(classifier, seed)
+    per_kind = count // 3
+    corpus = [(message, intent.value, kind) for message, intent, kind in generator.generate({
+        'short': per_kind, 'medium': per_kind, 'long': count - 2 * per_kind - count // 20,
+    })]
+    rng = random.Random(seed)
+    for _ in range(count // 20):
+        words = rng.sample(generator.fillers, rng.randint(1, 5))
+        corpus.append((" ".join(words), Intent.UNKNOWN.value, 'filler'))
+    rng.shuffle(corpus)
+    return corpus
+
+
+def accuracy_by_kind(predictions: list, corpus: list) -> dict:
+    hits, totals = defaultdict(int), defaultdict(int)
+    for (intent, _), (_, label, kind) in zip(predictions, corpus):
+        for key in (kind, 'semua'):
+            totals[key] += 1
+            hits[key] += intent.value == label
+    return {kind: hits[kind] / totals[kind] for kind in totals}
+
+
+def throughput(classify, messages: list) -> float:
+    start = time.perf_counter()
+    for message in messages:
+        classify(message)
+    return len(messages) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--train", type=int, default=10000, help="Jumlah pesan training")
+    parser.add_argument("--test", type=int, default=5000, help="Jumlah pesan uji")
+    parser.add_argument("--epochs", type=int, default=60)
+    parser.add_argument("--write-corpus", help="Tulis korpus training JSONL ke path ini lalu keluar")
+    args = parser.parse_args()
+
+    rules = IntentClassifier()
+    train = labeled_corpus(rules, args.train, seed=1)
+    if args.write_corpus:
+        with open(args.write_corpus, 'w', encoding='utf-8') as f:
+            for message, label, _ in train:
+                f.write(json.dumps({"message": message, "intent": label}, ensure_ascii=False) + "\n")
+        print(f"✅ {len(train):,} pesan ditulis ke {args.write_corpus}")
+        return
+    test = labeled_corpus(rules, args.test, seed=2)
+
+    start = time.perf_counter()
+    model = LinearIntentModel.train([normalize_message(m).tokens for m, _, _ in train], [label for _, label, _ in train],
+                                    HashedFeatures(), epochs=args.epochs)
+    train_time = time.perf_counter() - start
+
+    # Lewat file .npz agar yang diukur adalah model hasil ekspor
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "linear_model.npz")
+        model.save(path)
+        size = os.path.getsize(path)
+        linear = LinearIntentClassifier.load(path)
+
+    messages = [message for message, _, _ in test]
+    rule_accuracy = accuracy_by_kind([rules.classify(m) for m in messages], test)
+    linear_accuracy = accuracy_by_kind([linear.classify(m) for m in messages], test)
+    batch_accuracy = accuracy_by_kind(linear.classify_batch(messages), test)
+    assert batch_accuracy == linear_accuracy, "classify_batch berbeda dengan classify"
+
+    start = time.perf_counter()
+    linear.classify_batch(messages)
+    batch_rate = len(messages) / (time.perf_counter() - start)
+
+    print(f"Training        : {len(train):,} pesan, {args.epochs} epoch, {train_time:.1f} s")
+    print(f"Model           : {len(model.labels)} intent, {len(model.rows):,} fitur, {size / 1024:.0f} KB (.npz)")
+    print(f"\n{'akurasi':<10} {'rules':>8} {'linear':>8}")
+    for kind in ('short', 'medium', 'long', 'filler', 'semua'):
+        print(f"{kind:<10} {rule_accuracy[kind]:>8.1%} {linear_accuracy[kind]:>8.1%}")
+    print(f"\n{'throughput':<22} {'pesan/s':>10}")
+    print(f"{'rules classify':<22} {throughput(rules.classify, messages):>10,.0f}")
+    print(f"{'linear classify':<22} {throughput(linear.classify, messages):>10,.0f}")
+    print(f"{'linear classify_batch':<22} {batch_rate:>10,.0f}")
+
+
+if __name__ == "__main__":
+    main()
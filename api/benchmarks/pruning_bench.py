@@ -0,0 +1,89 @@
+"""
+Benchmark pruning intent (CandidateIndex): latency klasifikasi dengan dan
+tanpa pruning saat jumlah intent bertambah. Intent sintetis (kata acak yang
+tidak muncul di korpus) ditambahkan ke rules bawaan, jadi pesan korpus tetap
+hanya relevan untuk segelintir intent. Kolom guarded memakai LinearPatternSet
+(semua pola dalam satu automaton; CandidateIndex tidak dipakai), diukur setelah satu pass
+pemanasan cache DFA-nya. Setiap pesan juga dicek dengan
+mode verify_pruning agar hasil kedua cara sama persis dengan skor semua intent.
+Jalankan dari root repo:
+    python -m api.benchmarks.pruning_bench --messages 5000 --intents 15 100 400
+"""
+
+import argparse
+import random
+import string
+import time
+
+from api.benchmarks.corpus import MessageGenerator
+from api.chatbot_logic import IntentClassifier
+
+
+def random_word(rng: random.Random) -> str:
+    return "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(6, 9)))
+
+
+def synthetic_rules(base: dict, total: int, rng: random.Random) -> dict:
+    """Rules bawaan ditambah intent sintetis sampai berjumlah total"""
+    rules = dict(base)
+    for index in range(len(base), total):
+        words = [random_word(rng) for _ in range(8)]
+        rules[f"synthetic_{index:04d}"] = {
+            'patterns': [
+                rf"\b({words[0]}|{words[1]}).+({words[2]}|{words[3]})\b",
+                rf"\b{words[4]}\b",
+            ],
+            'keywords': [words[5], f"{words[6]} {words[7]}"],
+            'weight': 1.0,
+        }
+    return rules
+
+
+def time_classify(classifier: IntentClassifier, messages: list) -> float:
+    start = time.perf_counter()
+    for message in messages:
+        classifier.classify(message)
+    return (time.perf_counter() - start) / len(messages)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=5000, help="Jumlah pesan di korpus")
+    parser.add_argument("--intents", type=int, nargs="+", default=[15, 100, 400])
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    base = IntentClassifier(fuzzy_max_distance=0)
+    corpus = MessageGenerator(base, args.seed).generate({
+        'short': args.messages // 2, 'medium': args.messages // 2,
+    })
+    # Normalisasi di luar pengukuran: yang dibandingkan hanya tahap skor
+    messages = [base.normalize(message) for message, _, _ in corpus]
+
+    rng = random.Random(args.seed)
+    print(f"{'intent':>7} {'tanpa pruning':>15} {'pruning':>12} {'speedup':>8} {'kandidat':>9} {'guarded':>12}")
+    for total in args.intents:
+        rules = synthetic_rules(base.intent_patterns, total, rng)
+        exhaustive = IntentClassifier(fuzzy_max_distance=0, intent_patterns=rules, pruning=False, guarded=False)
+        pruned = IntentClassifier(fuzzy_max_distance=0, intent_patterns=rules, guarded=False)
+        guarded = IntentClassifier(fuzzy_max_distance=0, intent_patterns=rules, time_budget=0)
+
+        for verify_guarded in (False, True):
+            verifier = IntentClassifier(fuzzy_max_distance=0, intent_patterns=rules, verify_pruning=True,
+                                        guarded=verify_guarded, time_budget=0)
+            for message in messages:
+                verifier.classify(message)
+
+        candidates = sum(len(pruned.candidate_index.candidates(message.text)) for message in messages)
+        exhaustive_time = time_classify(exhaustive, messages)
+        pruned_time = time_classify(pruned, messages)
+        time_classify(guarded, messages)
+        guarded_time = time_classify(guarded, messages)
+        print(f"{total:>7} {exhaustive_time * 1e6:>12.1f} us {pruned_time * 1e6:>9.1f} us "
+              f"{exhaustive_time / pruned_time:>7.1f}x {candidates / len(messages):>9.1f} {guarded_time * 1e6:>9.1f} us")
+
+    print("Verifikasi pruning & guarded: semua hasil sama dengan skor semua intent")
+
+
+if __name__ == "__main__":
+    main()
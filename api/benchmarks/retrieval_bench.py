@@ -0,0 +1,63 @@
+"""
+Benchmark retrieval BM25 untuk fallback: waktu build index dan latency query
+(p50/p99) pada pesan ber-confidence rendah dari korpus sintetis.
+Jalankan dari root repo:
+    python -m api.benchmarks.retrieval_bench --messages 20000
+"""
+
+import argparse
+import time
+
+from api.benchmarks.corpus import MessageGenerator
+from api.chatbot_logic import CircularEconomyBot, Intent
+from api.retrieval import KnowledgeRetriever
+
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=20000, help="Jumlah pesan di korpus")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    bot = CircularEconomyBot(cache_size=0)
+    classifier = bot.classifier
+
+    start = time.perf_counter()
+    retriever = KnowledgeRetriever(bot.kb, bot.retriever.min_score, exclude=bot.retriever.exclude)
+    build_time = time.perf_counter() - start
+    _, sections, index = retriever._ensure_current()
+
+    corpus = MessageGenerator(classifier, args.seed).generate({
+        'short': args.messages // 2, 'medium': args.messages // 2,
+    })
+    queries = []
+    for message, _, _ in corpus:
+        normalized = classifier.normalize(message)
+        intent, confidence = classifier.classify(normalized)
+        if confidence < bot.confidence_threshold or intent == Intent.UNKNOWN:
+            queries.append(normalized.tokens)
+
+    latencies = []
+    hits = 0
+    for tokens in queries:
+        start = time.perf_counter()
+        hit = retriever.search(tokens)
+        latencies.append(time.perf_counter() - start)
+        hits += hit is not None
+    latencies.sort()
+
+    print(f"Bagian diindeks : {len(sections)} ({len(index.postings)} token unik)")
+    print(f"Build index     : {build_time * 1000:8.2f} ms")
+    print(f"Query fallback  : {len(queries):,} dari {len(corpus):,} pesan")
+    print(f"Terjawab        : {hits / max(1, len(queries)):8.1%}")
+    print(f"Latency p50     : {percentile(latencies, 0.50) * 1e6:8.1f} us")
+    print(f"Latency p99     : {percentile(latencies, 0.99) * 1e6:8.1f} us")
+    print(f"Latency max     : {latencies[-1] * 1e6:8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
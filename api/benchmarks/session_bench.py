@@ -0,0 +1,71 @@
+"""
+Benchmark SessionStore: memori (tracemalloc) dan latency record/lookup saat
+jumlah session aktif jauh melebihi batas max_sessions. Memori harus datar
+setelah batas tercapai karena session lama dibuang (LRU). Kolom perkiraan adalah
+SessionStore.bytes (dasar SESSION_MAX_BYTES), dibandingkan dengan memori terukur.
+Jalankan dari root repo:
+    python -m api.benchmarks.session_bench --sessions 300000 --max-sessions 100000
+    python -m api.benchmarks.session_bench --max-sessions 1000000 --max-bytes 16000000
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+
+from api.chatbot_logic import CircularEconomyBot, Intent
+from api.sessions import SessionStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=300000, help="Jumlah session unik yang dibuat")
+    parser.add_argument("--max-sessions", type=int, default=100000)
+    parser.add_argument("--max-bytes", type=int, default=0, help="Batas byte store (0 = nonaktif)")
+    parser.add_argument("--history", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    intents = list(Intent)
+    store = SessionStore(args.max_sessions, ttl=1800, history_size=args.history, max_bytes=args.max_bytes)
+
+    # Id ikut terukur: store menyimpan string id milik request
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    checkpoints = {args.sessions * step // 6 for step in range(1, 7)}
+    start = time.perf_counter()
+    print(f"{'session':>10} {'disimpan':>10} {'memori':>10} {'perkiraan':>10}")
+    for i in range(1, args.sessions + 1):
+        session_id = f"session-{i:08d}"
+        # Beberapa pesan per session agar history terisi sampai batasnya
+        for _ in range(args.history):
+            store.record(session_id, rng.choice(intents))
+        if i in checkpoints:
+            used = tracemalloc.get_traced_memory()[0] - baseline
+            print(f"{i:>10,} {len(store):>10,} {used / 1e6:>8.1f} MB {store.bytes / 1e6:>7.1f} MB")
+    record_time = time.perf_counter() - start
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    lookups = min(args.sessions, len(store))
+    for i in range(args.sessions - lookups + 1, args.sessions + 1):
+        store.last_intent(f"session-{i:08d}")
+    lookup_time = time.perf_counter() - start
+
+    stats = store.stats()
+    print(f"Evictions       : {stats['evictions']:,}")
+    print(f"Record          : {record_time / (args.sessions * args.history) * 1e6:8.2f} us/pesan")
+    print(f"Lookup          : {lookup_time / max(1, lookups) * 1e6:8.2f} us/pesan")
+
+    # Contoh pertanyaan lanjutan dengan dan tanpa session
+    bot = CircularEconomyBot(cache_size=0)
+    bot.get_reply("Apa itu ekonomi sirkular?", session_id="demo")
+    for session_id in (None, "demo"):
+        reply = bot.get_reply("Manfaatnya apa?", session_id=session_id)
+        label = "dengan session" if session_id else "tanpa session "
+        print(f"'Manfaatnya apa?' {label}: {reply.intent.value} ({reply.confidence:.2f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark cold start: waktu import api.index dan latency request pertama,
+diukur di proses Python baru untuk setiap percobaan (dengan dan tanpa snapshot).
+Jalankan dari root repo:
+    python -m api.snapshot                      # buat snapshot dulu
+    python -m api.benchmarks.startup_bench --runs 15
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Skrip yang dijalankan di setiap proses baru
+_PROBE = r"""
+import json, time
+start = time.perf_counter()
+import api.index as index
+imported = time.perf_counter()
+client = index.app.test_client()
+request_start = time.perf_counter()
+client.post("/api/chat", json={"message": "Apa itu ekonomi sirkular?"})
+done = time.perf_counter()
+print(json.dumps({"import_ms": (imported - start) * 1000, "first_request_ms": (done - request_start) * 1000}))
+"""
+
+
+def measure(runs: int, use_snapshot: bool) -> dict:
+    env = dict(os.environ, USE_SNAPSHOT="1" if use_snapshot else "0")
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", _PROBE],
+            env=env, capture_output=True, text=True, check=True
+        ).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+
+    return {
+        key: {
+            'median': statistics.median(s[key] for s in samples),
+            'max': max(s[key] for s in samples),
+        }
+        for key in ('import_ms', 'first_request_ms')
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10, help="Jumlah proses baru per mode")
+    parser.add_argument("--json", dest="json_output", help="Simpan hasil ke file JSON")
+    args = parser.parse_args()
+
+    results = {
+        'without_snapshot': measure(args.runs, use_snapshot=False),
+        'with_snapshot': measure(args.runs, use_snapshot=True),
+    }
+
+    for mode, timings in results.items():
+        print(f"{mode:18s} | import {timings['import_ms']['median']:7.1f} ms (max {timings['import_ms']['max']:7.1f})"
+              f" | first request {timings['first_request_ms']['median']:6.2f} ms (max {timings['first_request_ms']['max']:6.2f})")
+
+    if args.json_output:
+        with open(args.json_output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark scoring skalar vs tervektorisasi (NumPy) pada korpus log sintetis.
+Jalankan dari root repo:
+    python -m api.benchmarks.vectorized_bench --messages 200000
+"""
+
+import argparse
+import random
+import time
+
+from api.chatbot_logic import IntentClassifier
+
+
+def build_log_corpus(classifier: IntentClassifier, n_messages: int, seed: int = 42) -> list:
+    """Korpus mirip log: sebagian besar pesan berulang (distribusi Zipf), sisanya variasi acak"""
+    rng = random.Random(seed)
+    vocabulary = sorted({
+        word
+        for config in classifier.intent_patterns.values()
+        for keyword in config['keywords']
+        for word in keyword.split()
+    })
+    fillers = ['apa', 'itu', 'dong', 'ya', 'saya', 'mau', 'tahu', 'bagaimana', 'kenapa', 'tolong']
+
+    templates = []
+    for _ in range(2000):
+        words = [rng.choice(vocabulary if rng.random() < 0.6 else fillers)
+                 for _ in range(rng.randint(1, 10))]
+        templates.append(" ".join(words) + rng.choice(["", "?", "!", " ?"]))
+
+    weights = [1.0 / (rank + 1) for rank in range(len(templates))]
+    corpus = rng.choices(templates, weights=weights, k=n_messages)
+
+    # Sisipkan pesan unik agar tidak semuanya duplikat
+    for i in range(0, n_messages, 10):
+        corpus[i] = f"{corpus[i]} {rng.choice(vocabulary)} {i}"
+    return corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=100000, help="Jumlah pesan di korpus")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    classifier = IntentClassifier()
+    corpus = build_log_corpus(classifier, args.messages, args.seed)
+
+    start = time.perf_counter()
+    scalar = [classifier.classify(message) for message in corpus]
+    scalar_time = time.perf_counter() - start
+
+    # Scorer dibuat di luar pengukuran (sekali per proses)
+    classifier._get_vectorized_scorer()
+    start = time.perf_counter()
+    vectorized = classifier.classify_batch(corpus, vectorized=True)
+    vectorized_time = time.perf_counter() - start
+
+    mismatches = sum(1 for a, b in zip(scalar, vectorized) if a != b)
+
+    print(f"Pesan       : {len(corpus):,}")
+    print(f"Skalar      : {scalar_time:8.3f} s  ({len(corpus) / scalar_time:,.0f} pesan/s)")
+    print(f"Vektorisasi : {vectorized_time:8.3f} s  ({len(corpus) / vectorized_time:,.0f} pesan/s)")
+    print(f"Speedup     : {scalar_time / vectorized_time:8.2f}x")
+    print(f"Mismatch    : {mismatches}")
+
+    if mismatches:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,38 @@
-import re
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, FrozenSet, List, NamedTuple, Set, Tuple, Optional, Union
+from array import array
 from enum import Enum
+from heapq import nlargest
+from time import perf_counter
+
+try:
+    from .config import (CLASSIFIER_BACKEND, CLASSIFY_TIME_BUDGET, FUZZY_MAX_DISTANCE, GUARDED_MATCHING,
+                         INTENT_PRUNING, INTENT_PRUNING_VERIFY, INTERACTION_LOG_BATCH_SIZE, INTERACTION_LOG_DIR,
+                         INTERACTION_LOG_FLUSH_INTERVAL, INTERACTION_LOG_MAX_BYTES, INTERACTION_LOG_QUEUE_SIZE,
+                         LINEAR_MODEL_PATH, RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL, RETRIEVAL_MIN_SCORE, RULE_PACK_PATH, SESSION_HISTORY_SIZE,
+                         SESSION_MAX_BYTES, SESSION_MAX_SESSIONS, SESSION_TTL, USE_SNAPSHOT)
+    from .fuzzy import SymSpellIndex, rule_vocabulary
+    from .interaction_log import InteractionLogger
+    from .linear_matcher import LinearPatternSet
+    from .matching import CandidateIndex, CompiledPatternSet, KeywordIndex
+    from .normalization import NormalizedMessage, normalize_message
+    from .response_cache import ResponseCache
+    from .retrieval import KnowledgeRetriever, VersionedDict
+    from .sessions import SessionStore
+except ImportError:
+    # Dijalankan langsung dari folder api/ (mis. intent_anlyzer.py)
+    from config import (CLASSIFIER_BACKEND, CLASSIFY_TIME_BUDGET, FUZZY_MAX_DISTANCE, GUARDED_MATCHING,
+                        INTENT_PRUNING, INTENT_PRUNING_VERIFY, INTERACTION_LOG_BATCH_SIZE, INTERACTION_LOG_DIR,
+                        INTERACTION_LOG_FLUSH_INTERVAL, INTERACTION_LOG_MAX_BYTES, INTERACTION_LOG_QUEUE_SIZE,
+                        LINEAR_MODEL_PATH, RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL, RETRIEVAL_MIN_SCORE, RULE_PACK_PATH, SESSION_HISTORY_SIZE,
+                        SESSION_MAX_BYTES, SESSION_MAX_SESSIONS, SESSION_TTL, USE_SNAPSHOT)
+    from fuzzy import SymSpellIndex, rule_vocabulary
+    from interaction_log import InteractionLogger
+    from linear_matcher import LinearPatternSet
+    from matching import CandidateIndex, CompiledPatternSet, KeywordIndex
+    from normalization import NormalizedMessage, normalize_message
+    from response_cache import ResponseCache
+    from retrieval import KnowledgeRetriever, VersionedDict
+    from sessions import SessionStore
 
 class Intent(Enum):
     """Kategori intent untuk klasifikasi pertanyaan"""
@@ -28,11 +60,170 @@ class Intent(Enum):
     UNKNOWN = "unknown"
 
 
+class BotReply(NamedTuple):
+    """Hasil lengkap satu respons chatbot"""
+    response: str
+    intent: Intent
+    confidence: float
+    fallback_used: bool
+    # False jika pencocokan pola terpotong time_budget (jangan di-cache/dijadikan konteks session)
+    complete: bool = True
+    
+    def to_dict(self) -> Dict:
+        """Representasi JSON untuk respons API"""
+        return {
+            "response": self.response,
+            "intent": self.intent.value,
+            "confidence": self.confidence
+        }
+
+
+# Topik yang ditambahkan ke pertanyaan lanjutan berdasarkan intent sebelumnya
+CONTEXT_TOPICS: Dict[Intent, str] = {
+    Intent.CE_DEFINITION: 'ekonomi sirkular',
+    Intent.CE_PRINCIPLES: 'ekonomi sirkular',
+    Intent.CE_EXAMPLES: 'ekonomi sirkular',
+    Intent.CE_BENEFITS: 'ekonomi sirkular',
+    Intent.CE_GENERAL: 'ekonomi sirkular',
+    Intent.SUSTAINABILITY_GENERAL: 'sustainability',
+    Intent.PLASTIC_WASTE: 'sampah plastik',
+    Intent.RENEWABLE_ENERGY: 'energi terbarukan',
+    Intent.CLIMATE_CHANGE: 'perubahan iklim',
+    Intent.TIPS: 'gaya hidup ramah lingkungan',
+}
+
+
+class RuleMatch(NamedTuple):
+    """Satu rule yang cocok dengan pesan dan poin (sudah dikali weight) yang disumbangkannya"""
+    kind: str       # 'pattern', 'keyword' (cocok utuh) atau 'keyword_partial'
+    rule: str
+    points: float
+
+
+class IntentScores:
+    """
+    Skor semua intent untuk satu pesan (hasil IntentClassifier.score).
+    Yang disimpan hanya skor intent yang dihitung (kandidat); intent lain bernilai 0.
+    Intent terbaik dihitung langsung, sedangkan array lengkap, top-k dan detail
+    per rule baru dihitung saat diminta. complete=False berarti time_budget habis
+    saat pencocokan pola sehingga skor hanya dari pola yang sempat dicocokkan.
+    """
+    __slots__ = ('message', 'intent', 'confidence', 'complete', '_scores', '_classifier')
+    
+    def __init__(self, message: NormalizedMessage, scores: Dict[Intent, float], classifier: 'IntentClassifier',
+                 complete: bool = True):
+        self.message = message
+        self.complete = complete
+        self._scores = scores
+        self._classifier = classifier
+        self.intent, self.confidence = classifier._best_intent(scores)
+    
+    def best(self) -> Tuple[Intent, float]:
+        """(intent, confidence) yang sama dengan IntentClassifier.classify tanpa konteks session"""
+        return self.intent, self.confidence
+    
+    def __len__(self) -> int:
+        return len(self._classifier.intent_patterns)
+    
+    def __getitem__(self, intent: Intent) -> float:
+        return self._scores.get(intent, 0.0)
+    
+    def array(self) -> array:
+        """Skor semua intent dalam urutan intent_patterns (array double)"""
+        scores = self._scores
+        return array('d', [scores.get(intent, 0.0) for intent in self._classifier.intent_patterns])
+    
+    def top_k(self, k: int) -> List[Tuple[Intent, float]]:
+        """k intent dengan skor tertinggi; skor sama diurutkan menurut intent_patterns"""
+        rank = self._classifier._intent_rank
+        top = nlargest(k, ((score, -rank[intent], intent) for intent, score in self._scores.items() if score > 0))
+        result = [(intent, score) for score, _, intent in top]
+        if len(result) < k:
+            # Sisanya intent berskor 0, sesuai urutan intent_patterns
+            for intent in self._classifier.intent_patterns:
+                if len(result) >= k:
+                    break
+                if not self._scores.get(intent, 0.0) > 0:
+                    result.append((intent, 0.0))
+        return result
+    
+    def details(self, intent: Intent) -> List[RuleMatch]:
+        """Rule milik intent yang cocok dengan pesan beserta poinnya"""
+        return self._classifier._rule_matches(self.message, intent)
+
+
 class IntentClassifier:
     """Classifier untuk mendeteksi intent dari pertanyaan pengguna"""
     
-    def __init__(self):
-        self.intent_patterns = self._init_intent_patterns()
+    def __init__(self, fuzzy_max_distance: int = FUZZY_MAX_DISTANCE,
+                 intent_patterns: Optional[Dict] = None, keyword_index: Optional[KeywordIndex] = None,
+                 pruning: bool = INTENT_PRUNING, verify_pruning: bool = INTENT_PRUNING_VERIFY,
+                 guarded: bool = GUARDED_MATCHING, time_budget: float = CLASSIFY_TIME_BUDGET):
+        """
+        fuzzy_max_distance : jarak edit maksimum koreksi typo keyword (0 = nonaktif)
+        intent_patterns    : rules pengganti _init_intent_patterns (mis. dari rule pack)
+        keyword_index      : KeywordIndex yang sudah jadi untuk intent_patterns tersebut
+        pruning            : hanya skor intent kandidat dari CandidateIndex (tanpa efek jika guarded)
+        verify_pruning     : cocokkan setiap hasil pruning/guarded dengan skor semua intent
+        guarded            : cocokkan pola dengan LinearPatternSet (waktu linear, bisa dihentikan)
+        time_budget        : batas waktu pencocokan pola per pesan di score() dalam detik
+                             (0 = tanpa batas, hanya guarded); normalisasi dan skor keyword tidak ikut dibatasi
+        """
+        self.intent_patterns = intent_patterns if intent_patterns is not None else self._init_intent_patterns()
+        # Semua pola dikompilasi sekali di sini, bukan di setiap request
+        self.pattern_matcher = CompiledPatternSet({
+            intent: config['patterns']
+            for intent, config in self.intent_patterns.items()
+        })
+        self.keyword_index = keyword_index or KeywordIndex({
+            intent: config['keywords']
+            for intent, config in self.intent_patterns.items()
+        })
+        # Literal wajib tiap pola -> intent, agar pola intent yang tidak relevan tidak dicoba.
+        # Tidak dibangun untuk guarded: scan literalnya sama mahalnya dengan scan DFA
+        self.candidate_index = None
+        if pruning and not guarded:
+            self.candidate_index = CandidateIndex({
+                intent: config['patterns']
+                for intent, config in self.intent_patterns.items()
+            })
+        self.verify_pruning = verify_pruning
+        # Satu automaton untuk semua pola: tidak ada backtracking eksponensial pada pesan jahat
+        self.linear_matcher = None
+        if guarded:
+            self.linear_matcher = LinearPatternSet({
+                intent: config['patterns']
+                for intent, config in self.intent_patterns.items()
+            })
+        self.time_budget = time_budget
+        # Jumlah pesan yang skornya dihitung dari hasil parsial karena time_budget habis
+        self.budget_exhausted = 0
+        # Urutan intent di intent_patterns menentukan pemenang jika skornya sama
+        self._intent_rank = {intent: rank for rank, intent in enumerate(self.intent_patterns)}
+        # Indeks deletion untuk koreksi typo, dibangun sekali dari kosakata intent
+        self.typo_index = None
+        if fuzzy_max_distance > 0:
+            self.typo_index = SymSpellIndex(
+                rule_vocabulary(
+                    [p for config in self.intent_patterns.values() for p in config['patterns']],
+                    [k for config in self.intent_patterns.values() for k in config['keywords']]
+                ),
+                max_distance=fuzzy_max_distance
+            )
+        self._vectorized_scorer = None
+        # Di bawah confidence ini, intent sebelumnya di sesi dipakai untuk pertanyaan lanjutan
+        self.context_threshold = 0.3
+    
+    @classmethod
+    def from_rule_pack(cls, pack, fuzzy_max_distance: int = FUZZY_MAX_DISTANCE) -> 'IntentClassifier':
+        """Buat classifier dari rule pack (RulePack atau path file .erp, lihat rulepack.py)"""
+        try:
+            from .rulepack import RulePack
+        except ImportError:
+            from rulepack import RulePack
+        if not isinstance(pack, RulePack):
+            pack = RulePack.load(pack)
+        return cls(fuzzy_max_distance, pack.intent_patterns(), pack.keyword_index())
         
     def _init_intent_patterns(self) -> Dict:
         """Inisialisasi pola-pola untuk setiap intent"""
@@ -73,9 +264,9 @@ class IntentClassifier:
             
             Intent.THANKS: {
                 'patterns': [
-                    r'\b(terima kasih|thank you|thanks|makasih|thx|tengkyu)\b'
+                    r'\b(terima kasih|thank you|thanks|thx|tengkyu)\b'
                 ],
-                'keywords': ['terima kasih', 'thank', 'thanks', 'makasih', 'thx'],
+                'keywords': ['terima kasih', 'thank', 'thanks', 'thx'],
                 'weight': 2.0
             },
             
@@ -189,14 +380,15 @@ class IntentClassifier:
     def _match_pattern(self, message: str, patterns: List[str]) -> bool:
         """Cek apakah pesan cocok dengan salah satu pattern regex"""
         for pattern in patterns:
-            if re.search(pattern, message, re.IGNORECASE):
+            if self.pattern_matcher.compile(pattern).search(message):
                 return True
         return False
     
-    def _calculate_keyword_score(self, message: str, keywords: List[str]) -> float:
-        """Hitung skor berdasarkan kecocokan keyword"""
+    def _calculate_keyword_score(self, message: str, keywords: List[str], words: Optional[Set[str]] = None) -> float:
+        """Hitung skor berdasarkan kecocokan keyword (words = token pesan jika sudah ada)"""
         score = 0.0
-        words = message.split()
+        if words is None:
+            words = message.split()
         
         for keyword in keywords:
             keyword_words = keyword.split()
@@ -212,30 +404,236 @@ class IntentClassifier:
         
         return score
     
-    def classify(self, message: str) -> Tuple[Intent, float]:
+    def normalize(self, message: Union[str, NormalizedMessage]) -> NormalizedMessage:
+        """Normalisasi pesan lalu koreksi token yang typo terhadap kosakata intent"""
+        message = normalize_message(message)
+        if self.typo_index is None:
+            return message
+        
+        tokens = self.typo_index.correct_tokens(message.tokens)
+        if tokens is None:
+            return message
+        return NormalizedMessage(message.raw, message.lower, " ".join(tokens), tokens)
+    
+    def score(self, message: Union[str, NormalizedMessage],
+              timings: Optional[Dict[str, float]] = None,
+              time_budget: Optional[float] = None) -> IntentScores:
+        """
+        Skor semua intent untuk pesan (teks mentah atau NormalizedMessage)
+        timings (opsional) diisi durasi tiap tahap dalam detik (lihat metrics.py)
+        time_budget (opsional) menggantikan self.time_budget untuk panggilan ini.
+        Jika budget habis saat pencocokan pola, skor dihitung dari pola yang sudah
+        cocok sejauh ini ditambah skor keyword dan hasilnya complete=False.
         """
-        Klasifikasi intent dari pesan pengguna
+        if time_budget is None:
+            time_budget = self.time_budget
+        deadline = None
+        if time_budget > 0 and self.linear_matcher is not None:
+            deadline = perf_counter() + time_budget
+        
+        if timings is not None and not isinstance(message, NormalizedMessage):
+            start = perf_counter()
+            message = self.normalize(message)
+            timings['normalize'] = perf_counter() - start
+        else:
+            message = self.normalize(message)
+        
+        if not message.text:
+            return IntentScores(message, {}, self)
+        scores, complete = self._score_normalized(message, timings, deadline)
+        return IntentScores(message, scores, self, complete)
+    
+    def classify(self, message: Union[str, NormalizedMessage],
+                 timings: Optional[Dict[str, float]] = None,
+                 previous_intent: Optional[Intent] = None) -> Tuple[Intent, float]:
+        """
+        Klasifikasi intent dari pesan pengguna (teks mentah atau NormalizedMessage)
+        timings (opsional) diisi durasi tiap tahap dalam detik (lihat metrics.py)
+        previous_intent (opsional) intent sebelumnya di sesi yang sama, dipakai
+        untuk pertanyaan lanjutan yang ambigu seperti "Manfaatnya apa?"
         Returns: (intent, confidence_score)
         """
-        message = message.lower().strip()
+        intent, confidence, _ = self.classify_with_status(message, timings, previous_intent)
+        return intent, confidence
+    
+    def classify_with_status(self, message: Union[str, NormalizedMessage],
+                             timings: Optional[Dict[str, float]] = None,
+                             previous_intent: Optional[Intent] = None) -> Tuple[Intent, float, bool]:
+        """Seperti classify, ditambah False jika time_budget habis (hasil parsial)"""
+        scores = self.score(message, timings)
+        if previous_intent is None or scores.confidence >= self.context_threshold or not scores.message.text:
+            return scores.intent, scores.confidence, scores.complete
+        return self._resolve_follow_up(scores, previous_intent) + (scores.complete,)
+    
+    def _resolve_follow_up(self, scores: IntentScores, previous_intent: Intent) -> Tuple[Intent, float]:
+        """
+        Skor ulang pesan ber-confidence rendah dengan topik intent sebelumnya
+        ditambahkan ("manfaatnya apa" -> "manfaatnya apa ekonomi sirkular").
+        Hasilnya hanya dipakai jika intent-nya memang sudah disinggung pesan itu
+        sendiri (skor > 0), agar pesan seperti "ok" tidak ikut ditarik ke topik.
+        """
+        message = scores.message
+        topic = CONTEXT_TOPICS.get(previous_intent)
+        if topic is None or topic in message.text:
+            return scores.best()
+        
+        topic_tokens = tuple(topic.split())
+        augmented = NormalizedMessage(message.raw, message.lower, f"{message.text} {topic}",
+                                      message.tokens + topic_tokens)
+        context_intent, context_confidence = self._classify_normalized(augmented)
+        if context_confidence > scores.confidence and scores[context_intent] > 0.0:
+            return context_intent, context_confidence
+        return scores.best()
+    
+    def classify_batch(self, messages: List[Union[str, NormalizedMessage]], vectorized: bool = False) -> List[Tuple[Intent, float]]:
+        """
+        Klasifikasi banyak pesan sekaligus (untuk job offline)
+        Pesan yang sama setelah normalisasi hanya diklasifikasi sekali.
+        vectorized=True memakai scoring NumPy (lihat vectorized.py) untuk korpus besar.
+        Returns: list (intent, confidence_score) dengan urutan yang sama
+        """
+        if vectorized:
+            return self._get_vectorized_scorer().classify_many(messages)
         
-        if not message:
-            return Intent.UNKNOWN, 0.0
+        results: Dict[str, Tuple[Intent, float]] = {'': (Intent.UNKNOWN, 0.0)}
+        normalized = [self.normalize(message) for message in messages]
         
-        best_intent = Intent.UNKNOWN
-        best_score = 0.0
+        for message in normalized:
+            if message.text not in results:
+                results[message.text] = self._classify_normalized(message)
+        
+        return [results[message.text] for message in normalized]
+    
+    def _get_vectorized_scorer(self):
+        """Buat VectorizedIntentScorer saat pertama kali dibutuhkan (numpy opsional)"""
+        if self._vectorized_scorer is None:
+            try:
+                from .vectorized import VectorizedIntentScorer
+            except ImportError:
+                from vectorized import VectorizedIntentScorer
+            self._vectorized_scorer = VectorizedIntentScorer(self)
+        return self._vectorized_scorer
+    
+    def _classify_normalized(self, message: NormalizedMessage,
+                             timings: Optional[Dict[str, float]] = None) -> Tuple[Intent, float]:
+        """Klasifikasi pesan yang sudah dinormalisasi (teks tidak kosong)"""
+        return self._best_intent(self._score_normalized(message, timings)[0])
+    
+    def _score_normalized(self, message: NormalizedMessage,
+                          timings: Optional[Dict[str, float]] = None,
+                          deadline: Optional[float] = None) -> Tuple[Dict[Intent, float], bool]:
+        """
+        (skor intent sesuai urutan intent_patterns, selesai) untuk pesan yang sudah dinormalisasi.
+        Dengan pruning atau guarded, intent yang tidak ada di hasil skornya 0.
+        deadline (perf_counter) hanya berlaku untuk LinearPatternSet; selesai=False jika terlewati.
+        """
+        if self.candidate_index is None and self.linear_matcher is None:
+            return self._score_exhaustive(message, timings), True
+        
+        # Hanya pola intent kandidat yang dicoba; skor keyword sudah per intent yang relevan
+        if timings is None:
+            matched_intents, complete = self._match_patterns(message.text, deadline)
+            keyword_scores = self.keyword_index.score(message.text, message.token_set)
+        else:
+            start = perf_counter()
+            matched_intents, complete = self._match_patterns(message.text, deadline)
+            matched_at = perf_counter()
+            keyword_scores = self.keyword_index.score(message.text, message.token_set)
+            timings['pattern_match'] = matched_at - start
+            timings['keyword_score'] = perf_counter() - matched_at
         
-        for intent, config in self.intent_patterns.items():
+        scores = self._score_intents(
+            sorted(matched_intents.union(keyword_scores), key=self._intent_rank.__getitem__),
+            matched_intents, keyword_scores
+        )
+        if not complete:
+            self.budget_exhausted += 1
+        elif self.verify_pruning:
+            self._verify_pruned(message, scores)
+        return scores, complete
+    
+    def _match_patterns(self, text: str, deadline: Optional[float] = None) -> Tuple[FrozenSet[Intent], bool]:
+        """(intent yang polanya cocok, selesai); selesai=False jika deadline terlewati"""
+        if self.linear_matcher is not None:
+            return self.linear_matcher.match(text, deadline)
+        candidates = self.candidate_index.candidates(text)
+        return self.pattern_matcher.match_keys(text, candidates), True
+    
+    def _score_exhaustive(self, message: NormalizedMessage,
+                          timings: Optional[Dict[str, float]] = None) -> Dict[Intent, float]:
+        """Skor semua intent tanpa pruning"""
+        # Satu pass regex dan satu scan keyword untuk semua intent
+        if timings is None:
+            matched_intents = self.pattern_matcher.match(message.text)
+            keyword_scores = self.keyword_index.score(message.text, message.token_set)
+        else:
+            start = perf_counter()
+            matched_intents = self.pattern_matcher.match(message.text)
+            matched_at = perf_counter()
+            keyword_scores = self.keyword_index.score(message.text, message.token_set)
+            timings['pattern_match'] = matched_at - start
+            timings['keyword_score'] = perf_counter() - matched_at
+        
+        return self._score_intents(self.intent_patterns, matched_intents, keyword_scores)
+    
+    def _score_intents(self, intents, matched_intents, keyword_scores) -> Dict[Intent, float]:
+        """Gabungkan hasil pola dan keyword menjadi skor per intent (dengan weight)"""
+        scores = {}
+        for intent in intents:
+            config = self.intent_patterns[intent]
             score = 0.0
             
             # Pattern matching (high priority)
-            if self._match_pattern(message, config['patterns']):
+            if intent in matched_intents:
                 score += 10.0 * config['weight']
             
             # Keyword matching
-            keyword_score = self._calculate_keyword_score(message, config['keywords'])
+            keyword_score = keyword_scores.get(intent, 0.0)
             score += keyword_score * config['weight']
             
+            scores[intent] = score
+        
+        return scores
+    
+    def _rule_matches(self, message: NormalizedMessage, intent: Intent) -> List[RuleMatch]:
+        """Detail per rule untuk satu intent (dipakai IntentScores.details, bukan hot path)"""
+        config = self.intent_patterns[intent]
+        weight = config['weight']
+        matches = []
+        
+        # Pola hanya dihitung sekali per intent, walaupun beberapa pola cocok
+        pattern_points = 10.0 * weight
+        for pattern in config['patterns']:
+            if self.pattern_matcher.compile(pattern).search(message.text):
+                matches.append(RuleMatch('pattern', pattern, pattern_points))
+                pattern_points = 0.0
+        
+        for keyword in config['keywords']:
+            keyword_words = keyword.split()
+            if keyword in message.text:
+                matches.append(RuleMatch('keyword', keyword, len(keyword_words) * 2.0 * weight))
+            else:
+                partial = sum(0.5 for word in keyword_words if word in message.token_set)
+                if partial:
+                    matches.append(RuleMatch('keyword_partial', keyword, partial * weight))
+        
+        return matches
+    
+    def _verify_pruned(self, message: NormalizedMessage, scores: Dict[Intent, float]):
+        """Mode pengecekan: skor hasil pruning harus sama persis dengan skor semua intent"""
+        expected = {intent: score for intent, score in self._score_exhaustive(message).items() if score > 0}
+        actual = {intent: score for intent, score in scores.items() if score > 0}
+        if actual != expected:
+            raise AssertionError(
+                f"Pruning intent tidak konsisten untuk {message.text!r}: {actual} != {expected}"
+            )
+    
+    @staticmethod
+    def _best_intent(scores: Dict[Intent, float]) -> Tuple[Intent, float]:
+        """Intent dengan skor tertinggi (yang pertama jika sama) dan confidence-nya"""
+        best_intent = Intent.UNKNOWN
+        best_score = 0.0
+        for intent, score in scores.items():
             if score > best_score:
                 best_score = score
                 best_intent = intent
@@ -249,8 +647,36 @@ class IntentClassifier:
 class EcoBuddyKnowledgeBase:
     """Knowledge base untuk chatbot edukatif EcoBuddy"""
     
-    def __init__(self):
-        self.responses = self._init_responses()
+    def __init__(self, responses: Optional[Dict[Intent, str]] = None):
+        """responses: pengganti _init_responses (mis. dari rule pack)"""
+        self._replaced = 0
+        self.responses = responses if responses is not None else self._init_responses()
+    
+    @classmethod
+    def from_rule_pack(cls, pack) -> 'EcoBuddyKnowledgeBase':
+        """Buat knowledge base dari rule pack (RulePack atau path file .erp, lihat rulepack.py)"""
+        try:
+            from .rulepack import RulePack
+        except ImportError:
+            from rulepack import RulePack
+        if not isinstance(pack, RulePack):
+            pack = RulePack.load(pack)
+        return cls(pack.responses())
+    
+    @property
+    def responses(self) -> Dict[Intent, str]:
+        return self._responses
+    
+    @responses.setter
+    def responses(self, responses: Dict[Intent, str]):
+        # Dibungkus VersionedDict agar perubahan isi terdeteksi oleh KnowledgeRetriever
+        self._responses = VersionedDict(responses)
+        self._replaced += 1
+    
+    @property
+    def version(self) -> Tuple[int, int]:
+        """Berubah setiap kali responses diganti atau isinya diubah"""
+        return self._replaced, self._responses.version
         
     def _init_responses(self) -> Dict[Intent, str]:
         """Inisialisasi respons untuk setiap intent"""
@@ -518,38 +944,9 @@ Atau ketik "bisa apa" untuk melihat kemampuan saya! 💡"""
         return self.responses[intent]
 
 
-class CircularEconomyBot:
-    """Chatbot edukatif untuk Ekonomi Sirkular dengan Intent Classification"""
-    
-    def __init__(self):
-        self.classifier = IntentClassifier()
-        self.kb = EcoBuddyKnowledgeBase()
-        self.confidence_threshold = 0.3  # Minimal confidence untuk tidak fallback
-        
-    def get_response(self, message: str) -> str:
-        """Generate respons chatbot dengan intent classification"""
-        
-        if not message or message.strip() == "":
-            return "Silakan ketik pertanyaan Anda tentang ekonomi sirkular atau sustainability. 😊"
-        
-        try:
-            # Klasifikasi intent
-            intent, confidence = self.classifier.classify(message)
-            
-            # Debug info (bisa diaktifkan untuk development)
-            # print(f"[DEBUG] Intent: {intent.value}, Confidence: {confidence:.2f}")
-            
-            # Jika confidence cukup tinggi, return respons sesuai intent
-            if confidence >= self.confidence_threshold and intent != Intent.UNKNOWN:
-                return self.kb.get_response(intent)
-            
-            # Fallback response dengan saran topik
-            return self._get_fallback_response(message)
-            
-        except Exception as e:
-            # Fallback jika terjadi error
-            print(f"[ERROR] Exception in get_response: {e}")
-            return """Maaf, terjadi kesalahan saat memproses pertanyaan Anda. 🙏
+EMPTY_MESSAGE_RESPONSE = "Silakan ketik pertanyaan Anda tentang ekonomi sirkular atau sustainability. 😊"
+
+ERROR_RESPONSE = """Maaf, terjadi kesalahan saat memproses pertanyaan Anda. 🙏
 
 Silakan coba lagi atau tanyakan:
 • "Apa itu ekonomi sirkular?"
@@ -557,15 +954,9 @@ Silakan coba lagi atau tanyakan:
 • "Bisa apa" untuk melihat kemampuan saya
 
 Jika masalah berlanjut, mohon laporkan ke tim kami."""
-    
-    def _get_fallback_response(self, message: str) -> str:
-        """Respons fallback yang lebih contextual"""
-        
-        # Cek apakah ada kata kunci tertentu untuk memberikan hint
-        message_lower = message.lower()
-        
-        if any(word in message_lower for word in ['ekonomi', 'economy', 'sirkular', 'circular']):
-            return """Sepertinya Anda ingin tahu tentang ekonomi sirkular! 🔄
+
+
+FALLBACK_CIRCULAR_RESPONSE = """Sepertinya Anda ingin tahu tentang ekonomi sirkular! 🔄
 
 Coba tanyakan:
 • "Apa itu ekonomi sirkular?"
@@ -574,9 +965,8 @@ Coba tanyakan:
 • "Manfaat ekonomi sirkular"
 
 Atau ketik "bisa apa" untuk melihat topik yang bisa saya jelaskan! 💡"""
-        
-        elif any(word in message_lower for word in ['lingkungan', 'environment', 'sustainability', 'hijau', 'green']):
-            return """Tertarik dengan topik lingkungan? 🌍
+
+FALLBACK_ENVIRONMENT_RESPONSE = """Tertarik dengan topik lingkungan? 🌍
 
 Saya bisa jelaskan tentang:
 • Sustainability dan keberlanjutan
@@ -586,9 +976,8 @@ Saya bisa jelaskan tentang:
 • Tips hidup ramah lingkungan
 
 Silakan tanyakan yang Anda ingin ketahui! 😊"""
-        
-        else:
-            return """Maaf, saya belum memahami pertanyaan Anda. 🤔
+
+FALLBACK_GENERAL_RESPONSE = """Maaf, saya belum memahami pertanyaan Anda. 🤔
 
 Saya adalah EcoBuddy, asisten edukatif tentang:
 ✓ Ekonomi Sirkular
@@ -603,14 +992,240 @@ Coba tanyakan:
 Atau ketik "bisa apa" untuk melihat kemampuan lengkap saya! 💡"""
 
 
+class CircularEconomyBot:
+    """Chatbot edukatif untuk Ekonomi Sirkular dengan Intent Classification"""
+    
+    def __init__(self, cache_size: int = RESPONSE_CACHE_SIZE, cache_ttl: Optional[float] = RESPONSE_CACHE_TTL,
+                 classifier: Optional[IntentClassifier] = None, kb: Optional[EcoBuddyKnowledgeBase] = None,
+                 interaction_log: Optional[InteractionLogger] = None):
+        # classifier/kb bisa diisi dari snapshot (lihat snapshot.py)
+        self.classifier = classifier or IntentClassifier()
+        self.kb = kb or EcoBuddyKnowledgeBase()
+        self.confidence_threshold = 0.3  # Minimal confidence untuk tidak fallback
+        # cache_size=0 mematikan cache (mis. untuk IntentAnalyzer)
+        self.response_cache = ResponseCache(cache_size, cache_ttl) if cache_size > 0 else None
+        # Index BM25 atas bagian-bagian knowledge base untuk pesan ber-confidence rendah
+        # (respons basa-basi tidak diindeks karena bukan jawaban atas pertanyaan)
+        self.retriever = KnowledgeRetriever(
+            self.kb, RETRIEVAL_MIN_SCORE, exclude=(Intent.GREETING, Intent.THANKS, Intent.UNKNOWN)
+        )
+        # Intent terakhir per session client untuk pertanyaan lanjutan (None = nonaktif)
+        self.sessions = (SessionStore(SESSION_MAX_SESSIONS, SESSION_TTL, SESSION_HISTORY_SIZE,
+                                      max_bytes=SESSION_MAX_BYTES)
+                         if SESSION_MAX_SESSIONS > 0 else None)
+        # Log interaksi get_reply untuk retraining (None = nonaktif), ditulis di thread latar
+        self.interaction_log = interaction_log
+        
+    def get_response(self, message: str) -> str:
+        """Generate respons chatbot dengan intent classification"""
+        return self.get_reply(message).response
+    
+    def get_reply(self, message: str, timings: Optional[Dict[str, float]] = None,
+                  session_id: Optional[str] = None) -> BotReply:
+        """
+        Generate respons chatbot beserta intent dan confidence-nya
+        timings (opsional) diisi durasi tiap tahap; cache hit tidak menambah tahap
+        session_id (opsional) mengaktifkan konteks intent sebelumnya untuk pertanyaan lanjutan
+        """
+        
+        if not message or message.strip() == "":
+            return BotReply(EMPTY_MESSAGE_RESPONSE, Intent.UNKNOWN, 0.0, False)
+        
+        received = perf_counter()
+        try:
+            # Normalisasi sekali; hasilnya dipakai cache, classifier dan fallback
+            if timings is None:
+                normalized = normalize_message(message)
+            else:
+                start = perf_counter()
+                normalized = normalize_message(message)
+                timings['normalize'] = perf_counter() - start
+            
+            sessions = self.sessions if session_id else None
+            previous_intent = sessions.last_intent(session_id) if sessions is not None else None
+            
+            if self.response_cache is None:
+                reply = self._compute_reply(normalized, timings, previous_intent)
+            else:
+                # Jawaban pertanyaan lanjutan tergantung intent sebelumnya, jadi ikut jadi key cache
+                key = normalized.text if previous_intent is None else (normalized.text, previous_intent)
+                # Hasil parsial (time_budget habis) tidak di-cache agar tidak menetap tanpa TTL
+                reply = self.response_cache.get_or_compute(
+                    key, lambda: self._compute_reply(normalized, timings, previous_intent),
+                    cacheable=lambda reply: reply.complete
+                )
+            
+            # Hanya jawaban yang yakin dan lengkap yang menjadi konteks pesan berikutnya
+            if sessions is not None and not reply.fallback_used and reply.complete:
+                sessions.record(session_id, reply.intent)
+            if self.interaction_log is not None:
+                self.interaction_log.log(message, reply.intent.value, reply.confidence,
+                                         perf_counter() - received, reply.fallback_used)
+            return reply
+            
+        except Exception as e:
+            # Fallback jika terjadi error
+            print(f"[ERROR] Exception in get_response: {e}")
+            return BotReply(ERROR_RESPONSE, Intent.UNKNOWN, 0.0, True)
+    
+    def cached_reply(self, message: str) -> Optional[BotReply]:
+        """Respons dari cache tanpa klasifikasi (dipakai saat server kelebihan beban), None jika belum ada"""
+        if self.response_cache is None or not message or not message.strip():
+            return None
+        return self.response_cache.peek(normalize_message(message).text)
+    
+    def _compute_reply(self, message: NormalizedMessage, timings: Optional[Dict[str, float]] = None,
+                       previous_intent: Optional[Intent] = None) -> BotReply:
+        """Klasifikasi pesan lalu susun respons (tanpa cache)"""
+        # Klasifikasi intent
+        intent, confidence, complete = self.classifier.classify_with_status(message, timings, previous_intent)
+        
+        # Debug info (bisa diaktifkan untuk development)
+        # print(f"[DEBUG] Intent: {intent.value}, Confidence: {confidence:.2f}")
+        
+        if timings is None:
+            reply = self._build_reply(message, intent, confidence)
+        else:
+            start = perf_counter()
+            reply = self._build_reply(message, intent, confidence)
+            timings['kb_lookup'] = perf_counter() - start
+        return reply if complete else reply._replace(complete=False)
+    
+    def get_responses(self, messages: List[str]) -> List[BotReply]:
+        """Generate respons untuk banyak pesan sekaligus, urutan dipertahankan"""
+        try:
+            normalized = [normalize_message(message) for message in messages]
+            classified = self.classifier.classify_batch(normalized)
+        except Exception as e:
+            # Ulangi per pesan agar error hanya memengaruhi pesan yang bermasalah
+            print(f"[ERROR] Exception in get_responses: {e}")
+            return [self.get_reply(message) for message in messages]
+        
+        replies = []
+        for message, (intent, confidence) in zip(normalized, classified):
+            if not message.lower:
+                replies.append(BotReply(EMPTY_MESSAGE_RESPONSE, Intent.UNKNOWN, 0.0, False))
+            else:
+                replies.append(self._build_reply(message, intent, confidence))
+        return replies
+    
+    def _build_reply(self, message: NormalizedMessage, intent: Intent, confidence: float) -> BotReply:
+        """Pilih respons knowledge base atau fallback berdasarkan hasil klasifikasi"""
+        # Jika confidence cukup tinggi, return respons sesuai intent
+        if confidence >= self.confidence_threshold and intent != Intent.UNKNOWN:
+            return BotReply(self.kb.get_response(intent), intent, confidence, False)
+        
+        # Cari bagian knowledge base yang paling relevan sebelum memakai fallback umum
+        hit = self.retriever.search(self.classifier.normalize(message).tokens)
+        if hit is not None:
+            return BotReply(hit.section, intent, confidence, True)
+        
+        # Fallback response dengan saran topik
+        return BotReply(self._get_fallback_response(message), intent, confidence, True)
+    
+    def _get_fallback_response(self, message: Union[str, NormalizedMessage]) -> str:
+        """Respons fallback yang lebih contextual"""
+        
+        # Cek apakah ada kata kunci tertentu untuk memberikan hint
+        message_lower = normalize_message(message).text
+        
+        if any(word in message_lower for word in ['ekonomi', 'economy', 'sirkular', 'circular']):
+            return FALLBACK_CIRCULAR_RESPONSE
+        
+        elif any(word in message_lower for word in ['lingkungan', 'environment', 'sustainability', 'hijau', 'green']):
+            return FALLBACK_ENVIRONMENT_RESPONSE
+        
+        else:
+            return FALLBACK_GENERAL_RESPONSE
+    
+    def known_responses(self) -> List[str]:
+        """Semua teks respons tetap: knowledge base, bagian retrieval, fallback dan pesan error"""
+        texts = list(self.kb.responses.values())
+        texts += [section for _, section in self.retriever.sections()]
+        texts += [FALLBACK_CIRCULAR_RESPONSE, FALLBACK_ENVIRONMENT_RESPONSE, FALLBACK_GENERAL_RESPONSE,
+                  EMPTY_MESSAGE_RESPONSE, ERROR_RESPONSE]
+        # Urutan dipertahankan, duplikat dibuang
+        return list(dict.fromkeys(texts))
+
+
 # Instance global chatbot
 _bot_instance = None
 
-def get_bot_response(message: str) -> str:
-    """Fungsi utama untuk mendapatkan respons bot (kompatibel dengan app.py)"""
+def get_bot() -> CircularEconomyBot:
+    """Buat instance chatbot global saat pertama kali dibutuhkan"""
     global _bot_instance
     
     if _bot_instance is None:
-        _bot_instance = CircularEconomyBot()
+        _bot_instance = _create_bot()
+    
+    return _bot_instance
+
+def is_bot_ready() -> bool:
+    """True jika instance chatbot global sudah dibuat (dipakai /readyz)"""
+    return _bot_instance is not None
+
+def _create_bot() -> CircularEconomyBot:
+    """Bot dengan rules/knowledge base yang tersedia dan backend classifier dari config"""
+    classifier, kb = _load_rules()
+    if CLASSIFIER_BACKEND == "linear":
+        classifier = _load_linear_classifier() or classifier
+    elif CLASSIFIER_BACKEND != "rules":
+        print(f"[WARN] CLASSIFIER_BACKEND tidak dikenal: {CLASSIFIER_BACKEND!r}, memakai 'rules'")
+    interaction_log = (InteractionLogger(INTERACTION_LOG_DIR, INTERACTION_LOG_QUEUE_SIZE, INTERACTION_LOG_BATCH_SIZE,
+                                         INTERACTION_LOG_FLUSH_INTERVAL, INTERACTION_LOG_MAX_BYTES)
+                       if INTERACTION_LOG_DIR else None)
+    return CircularEconomyBot(classifier=classifier, kb=kb, interaction_log=interaction_log)
+
+def _load_rules() -> Tuple[Optional[IntentClassifier], Optional[EcoBuddyKnowledgeBase]]:
+    """Pakai rule pack atau snapshot classifier jika tersedia, jika tidak (None, None) = bangun dari awal"""
+    if RULE_PACK_PATH:
+        try:
+            from .rulepack import RulePack
+        except ImportError:
+            from rulepack import RulePack
+        
+        try:
+            pack = RulePack.load(RULE_PACK_PATH)
+            return IntentClassifier.from_rule_pack(pack), EcoBuddyKnowledgeBase.from_rule_pack(pack)
+        except Exception as e:
+            print(f"[WARN] Gagal memuat rule pack {RULE_PACK_PATH}: {e}")
+    
+    if USE_SNAPSHOT:
+        try:
+            from .snapshot import load_snapshot
+        except ImportError:
+            from snapshot import load_snapshot
+        
+        snapshot = load_snapshot()
+        if snapshot is not None:
+            # Batas waktu adalah setelan runtime, bukan bagian dari snapshot
+            snapshot[0].time_budget = CLASSIFY_TIME_BUDGET
+            return snapshot
+    
+    return None, None
+
+def _load_linear_classifier():
+    """LinearIntentClassifier dari LINEAR_MODEL_PATH, None jika gagal dimuat"""
+    try:
+        from .linear_model import LinearIntentClassifier
+    except ImportError:
+        from linear_model import LinearIntentClassifier
     
-    return _bot_instance.get_response(message)
\ No newline at end of file
+    try:
+        return LinearIntentClassifier.load(LINEAR_MODEL_PATH)
+    except Exception as e:
+        print(f"[WARN] Gagal memuat model linear {LINEAR_MODEL_PATH}: {e}")
+        return None
+
+def get_bot_response(message: str) -> str:
+    """Fungsi utama untuk mendapatkan respons bot (kompatibel dengan app.py)"""
+    return get_bot().get_response(message)
+
+def get_bot_reply(message: str, timings: Optional[Dict[str, float]] = None,
+                  session_id: Optional[str] = None) -> BotReply:
+    """Respons bot beserta intent dan confidence (dipakai endpoint /api/chat dan streaming)"""
+    return get_bot().get_reply(message, timings, session_id)
+
+def get_bot_responses(messages: List[str]) -> List[BotReply]:
+    """Respons untuk banyak pesan sekaligus (dipakai endpoint /api/chat/batch)"""
+    return get_bot().get_responses(messages)
@@ -1,3 +1,118 @@
 # Konfigurasi aplikasi (bisa dikembangkan sesuai kebutuhan)
-PORT = 5000
-DEBUG = True
+import os
+
+PORT = int(os.environ.get("PORT", "5000"))
+DEBUG = os.environ.get("DEBUG", "1") == "1"
+
+# Jumlah maksimal pesan dalam satu request /api/chat/batch
+MAX_BATCH_SIZE = 1000
+
+# Panjang maksimal satu pesan (karakter, 0 = tanpa batas); pesan lebih panjang ditolak 413.
+# MAX_REQUEST_BYTES membatasi ukuran body request sebelum JSON di-parse
+MAX_MESSAGE_LENGTH = int(os.environ.get("MAX_MESSAGE_LENGTH", "2000"))
+MAX_REQUEST_BYTES = int(os.environ.get("MAX_REQUEST_BYTES", str(4 * 1024 * 1024)))
+
+# Pola intent dicocokkan dengan LinearPatternSet (linear_matcher.py, tanpa backtracking),
+# jadi pesan sepanjang MAX_MESSAGE_LENGTH tetap cepat tanpa batas waktu.
+# CLASSIFY_TIME_BUDGET (opsional, detik, 0 = nonaktif) hanya membatasi pencocokan pola per
+# pesan, bukan seluruh request: jika habis dipakai hasil parsial, yang tidak di-cache dan
+# tidak dijadikan konteks session. Cache DFA yang masih dingin (proses baru/snapshot baru
+# dimuat) bisa menghabiskan budget kecil pada pesan panjang yang wajar
+GUARDED_MATCHING = os.environ.get("GUARDED_MATCHING", "1") == "1"
+CLASSIFY_TIME_BUDGET = float(os.environ.get("CLASSIFY_TIME_BUDGET", "0"))
+
+# Cache LRU respons chatbot (0 = nonaktif), TTL dalam detik (None = tanpa kedaluwarsa)
+RESPONSE_CACHE_SIZE = 1024
+RESPONSE_CACHE_TTL = None
+
+# Jarak edit maksimum koreksi typo keyword, mis. "sirkuler" -> "sirkular" (0 = nonaktif)
+FUZZY_MAX_DISTANCE = int(os.environ.get("FUZZY_MAX_DISTANCE", "2"))
+
+# Hanya skor intent yang literal polanya/keyword-nya muncul di pesan (CandidateIndex di matching.py).
+# Hanya berlaku jika GUARDED_MATCHING=0: LinearPatternSet mencocokkan semua intent dalam satu scan
+# yang biayanya tidak bergantung jumlah intent, dan scan literal CandidateIndex sebelumnya justru
+# menambah latency (pruning_bench: guarded ~24 us vs ~30 us per pesan dengan kandidat).
+# INTENT_PRUNING_VERIFY=1 membandingkan setiap hasil dengan skor semua intent (untuk pengujian)
+INTENT_PRUNING = os.environ.get("INTENT_PRUNING", "1") == "1"
+INTENT_PRUNING_VERIFY = os.environ.get("INTENT_PRUNING_VERIFY", "0") == "1"
+
+# Skor BM25 minimum agar bagian knowledge base dipakai sebagai jawaban fallback
+RETRIEVAL_MIN_SCORE = 4.0
+
+# Admission control /api/chat, /api/chat/batch dan /api/chat/stream: slot yang diproses
+# bersamaan (0 = tanpa batas; batch memakai slot sejumlah pesannya, maksimal semua slot),
+# request yang boleh menunggu slot, dan batas waktu tunggu (detik) sebelum 503
+ADMISSION_MAX_CONCURRENT = int(os.environ.get("ADMISSION_MAX_CONCURRENT", "16"))
+ADMISSION_MAX_QUEUE = int(os.environ.get("ADMISSION_MAX_QUEUE", "64"))
+ADMISSION_QUEUE_TIMEOUT = float(os.environ.get("ADMISSION_QUEUE_TIMEOUT", "2.0"))
+
+# Rate limit per client (token per detik, 0 = nonaktif) dan ukuran burst;
+# satu pesan = satu token, jadi batch memakai token sejumlah pesannya. Client yang melewati
+# batas selalu mendapat 429; jawaban dari cache hanya dipakai saat admission menolak (503)
+RATE_LIMIT_PER_SECOND = float(os.environ.get("RATE_LIMIT_PER_SECOND", "0"))
+RATE_LIMIT_BURST = int(os.environ.get("RATE_LIMIT_BURST", "10"))
+
+# Jumlah proxy tepercaya di depan server (mis. 1 di belakang Vercel/nginx). Hanya jika > 0
+# identitas client rate limit diambil dari X-Forwarded-For; 0 = alamat koneksi langsung
+TRUSTED_PROXY_HOPS = int(os.environ.get("TRUSTED_PROXY_HOPS", "0"))
+
+# Session percakapan untuk pertanyaan lanjutan (0 = nonaktif), TTL dalam detik
+# dan jumlah intent terakhir yang disimpan per session. SESSION_MAX_BYTES membatasi
+# perkiraan memori semua session (0 = hanya jumlah): ~325 byte per session dengan id UUID,
+# terburuk ~830 byte (id 128 karakter non-ASCII, lihat sessions.py), jadi 64 MiB cukup
+# untuk 100000 session biasa dan tetap membatasi id panjang ke ~80000 session
+SESSION_MAX_SESSIONS = int(os.environ.get("SESSION_MAX_SESSIONS", "100000"))
+SESSION_MAX_BYTES = int(os.environ.get("SESSION_MAX_BYTES", str(64 * 1024 * 1024)))
+SESSION_TTL = float(os.environ.get("SESSION_TTL", "1800"))
+SESSION_HISTORY_SIZE = int(os.environ.get("SESSION_HISTORY_SIZE", "5"))
+
+# Log interaksi (pesan, intent, confidence, latency, fallback) untuk retraining, ditulis
+# thread latar ke INTERACTION_LOG_DIR sebagai .jsonl.gz (kosong = nonaktif; di Vercel pakai /tmp).
+# Record dibuang (dan dihitung) jika antrean penuh; file dirotasi setelah MAX_BYTES terkompresi
+INTERACTION_LOG_DIR = os.environ.get("INTERACTION_LOG_DIR", "")
+INTERACTION_LOG_QUEUE_SIZE = int(os.environ.get("INTERACTION_LOG_QUEUE_SIZE", "10000"))
+INTERACTION_LOG_BATCH_SIZE = 500
+INTERACTION_LOG_FLUSH_INTERVAL = 1.0
+INTERACTION_LOG_MAX_BYTES = int(os.environ.get("INTERACTION_LOG_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# Jumlah karakter per event "chunk" di /api/chat/stream
+STREAM_CHUNK_SIZE = 48
+
+# Mode server saat self-hosting (python -m api.serve): "wsgi" (Flask dev server),
+# "prefork" (gunicorn multi-worker) atau "asgi" (uvicorn)
+SERVER_MODE = os.environ.get("SERVER_MODE", "wsgi")
+
+# Server pre-fork (gunicorn, lihat gunicorn_conf.py): jumlah worker (default semua core),
+# thread per worker, daur ulang worker setelah N request (+ jitter acak agar tidak
+# bersamaan) dan batas waktu menyelesaikan request yang berjalan saat shutdown
+PREFORK_WORKERS = int(os.environ.get("WEB_CONCURRENCY", "0")) or (os.cpu_count() or 1)
+PREFORK_THREADS = int(os.environ.get("PREFORK_THREADS", "4"))
+PREFORK_MAX_REQUESTS = int(os.environ.get("PREFORK_MAX_REQUESTS", "10000"))
+PREFORK_MAX_REQUESTS_JITTER = int(os.environ.get("PREFORK_MAX_REQUESTS_JITTER", "1000"))
+PREFORK_TIMEOUT = int(os.environ.get("PREFORK_TIMEOUT", "30"))
+PREFORK_GRACEFUL_TIMEOUT = int(os.environ.get("PREFORK_GRACEFUL_TIMEOUT", "30"))
+
+# Thread pool untuk klasifikasi di mode ASGI dan batas tugas yang boleh antre
+ASGI_EXECUTOR_WORKERS = 4
+ASGI_MAX_PENDING = 64
+
+# Snapshot classifier siap pakai (dibuat dengan `python -m api.snapshot`)
+SNAPSHOT_PATH = os.environ.get(
+    "SNAPSHOT_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "classifier_snapshot.pkl")
+)
+USE_SNAPSHOT = os.environ.get("USE_SNAPSHOT", "1") == "1"
+
+# Backend klasifikasi intent: "rules" (IntentClassifier) atau "linear" (model hasil
+# `python -m api.linear_model train`, butuh numpy); jika model gagal dimuat, kembali ke rules
+CLASSIFIER_BACKEND = os.environ.get("CLASSIFIER_BACKEND", "rules")
+LINEAR_MODEL_PATH = os.environ.get(
+    "LINEAR_MODEL_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "rules", "linear_model.npz")
+)
+
+# Rule pack hasil compile (python -m api.rulepack compile ...); kosong = rules bawaan di chatbot_logic.py
+RULE_PACK_PATH = os.environ.get("RULE_PACK_PATH", "")
+
+# Instrumentasi latency per tahap (header Server-Timing & /api/metrics)
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "1") == "1"
@@ -0,0 +1,110 @@
+"""
+Body JSON /api/chat yang sudah diserialisasi dan dikompresi sebelumnya.
+Teks respons chatbot berasal dari himpunan kecil teks tetap (knowledge base,
+bagian retrieval, fallback), jadi JSON, varian gzip/brotli dan ETag-nya
+dihitung sekali saat startup; request cukup memilih varian yang sesuai
+Accept-Encoding.
+
+Brotli opsional (tidak termasuk dependency Vercel):
+    pip install brotli
+"""
+
+import gzip
+import hashlib
+import json
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - tergantung environment
+    brotli = None
+
+# Urutan preferensi encoding jika client menerima beberapa sekaligus
+_PREFERRED_ENCODINGS = ('br', 'gzip')
+
+
+class EncodedBody:
+    """Body JSON satu teks respons beserta varian terkompresi dan ETag-nya"""
+    __slots__ = ('identity', 'variants', 'etag')
+
+    def __init__(self, text: str):
+        self.identity = json.dumps({"response": text}, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        # ETag lemah: isi sama untuk semua Content-Encoding (header Vary membedakan cache-nya)
+        self.etag = 'W/"' + hashlib.sha256(self.identity).hexdigest()[:32] + '"'
+        self.variants: Dict[str, bytes] = {}
+
+        compressed = gzip.compress(self.identity, compresslevel=9, mtime=0)
+        if len(compressed) < len(self.identity):
+            self.variants['gzip'] = compressed
+        if brotli is not None:
+            compressed = brotli.compress(self.identity, quality=11)
+            if len(compressed) < len(self.identity):
+                self.variants['br'] = compressed
+
+    def select(self, encodings: Tuple[str, ...]) -> Tuple[bytes, Optional[str]]:
+        """(body, Content-Encoding) untuk encoding yang diterima client (urut preferensi)"""
+        for encoding in encodings:
+            body = self.variants.get(encoding)
+            if body is not None:
+                return body, encoding
+        return self.identity, None
+
+
+def parse_accept_encoding(header: str) -> Tuple[str, ...]:
+    """Encoding dari header Accept-Encoding yang bisa dipakai, urut preferensi server"""
+    accepted: Dict[str, float] = {}
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name] = quality
+
+    wildcard = accepted.get("*", 0.0)
+    return tuple(
+        encoding for encoding in _PREFERRED_ENCODINGS
+        if accepted.get(encoding, wildcard) > 0.0
+    )
+
+
+class EncodedResponses:
+    """
+    Tabel teks respons -> EncodedBody.
+    Teks yang belum ada (mis. knowledge base diubah saat runtime) di-encode
+    saat pertama dipakai lalu disimpan, sampai max_size entry.
+    """
+
+    def __init__(self, texts: Iterable[str] = (), max_size: int = 512):
+        self.max_size = max_size
+        self._bodies: Dict[str, EncodedBody] = {text: EncodedBody(text) for text in texts}
+        self._encodings: Dict[str, Tuple[str, ...]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._bodies)
+
+    def body(self, text: str) -> EncodedBody:
+        body = self._bodies.get(text)
+        if body is None:
+            body = EncodedBody(text)
+            with self._lock:
+                if len(self._bodies) < self.max_size:
+                    self._bodies.setdefault(text, body)
+        return body
+
+    def encodings(self, accept_encoding: str) -> Tuple[str, ...]:
+        """parse_accept_encoding dengan cache (nilai header dari browser nyaris selalu sama)"""
+        encodings = self._encodings.get(accept_encoding)
+        if encodings is None:
+            encodings = parse_accept_encoding(accept_encoding)
+            if len(self._encodings) < 64:
+                self._encodings[accept_encoding] = encodings
+        return encodings
@@ -0,0 +1,153 @@
+"""
+Pencocokan keyword toleran typo ("sirkuler", "sustainibility", "plastk").
+Memakai kamus deletion ala SymSpell yang dibangun sekali dari kosakata
+keyword & pola intent: lookup hanya membangkitkan deletion dari token pesan
+(jumlahnya tidak bergantung pada ukuran kosakata) lalu memverifikasi
+kandidat dengan edit distance terbatas.
+"""
+
+import re
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+# Escape regex (\b, \s, ...) dibuang sebelum mengambil kata literal dari pola
+_REGEX_ESCAPE = re.compile(r'\\[a-zA-Z]')
+_LITERAL_WORD = re.compile(r'[a-z0-9]+')
+
+# Kata umum berjarak 1 dari kosakata intent tetapi bukan typo (mis. "sampai" ~ "sampah")
+FUZZY_IGNORE: FrozenSet[str] = frozenset({
+    'sampai', 'bahasa', 'majalah', 'pemasaran',
+})
+
+
+def rule_vocabulary(patterns: Iterable[str], keywords: Iterable[str]) -> Set[str]:
+    """Kata-kata dari keyword dan literal pola intent (kosakata koreksi typo)"""
+    vocabulary: Set[str] = set()
+    for keyword in keywords:
+        vocabulary.update(keyword.lower().split())
+    for pattern in patterns:
+        vocabulary.update(_LITERAL_WORD.findall(_REGEX_ESCAPE.sub(' ', pattern.lower())))
+    return vocabulary
+
+
+def _deletes(word: str, max_distance: int) -> Set[str]:
+    """Semua string hasil menghapus hingga max_distance karakter dari word"""
+    results = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        next_frontier = set()
+        for item in frontier:
+            for i in range(len(item)):
+                next_frontier.add(item[:i] + item[i + 1:])
+        results |= next_frontier
+        frontier = next_frontier
+    return results
+
+
+def bounded_edit_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    Jarak Damerau-Levenshtein (optimal string alignment) antara a dan b,
+    atau max_distance + 1 jika jaraknya melebihi batas (berhenti lebih awal).
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+
+    previous_previous = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        row_min = current[0]
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (previous_previous is not None and i > 1 and j > 1
+                    and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                value = min(value, previous_previous[j - 2] + 1)
+            current[j] = value
+            row_min = min(row_min, value)
+        if row_min > max_distance:
+            return max_distance + 1
+        previous_previous, previous = previous, current
+
+    distance = previous[len(b)]
+    return distance if distance <= max_distance else max_distance + 1
+
+
+class SymSpellIndex:
+    """Indeks deletion untuk koreksi typo satu kata terhadap kosakata tetap"""
+
+    def __init__(self, vocabulary: Iterable[str], max_distance: int = 2,
+                 min_length: int = 6, long_word_length: int = 9, cache_size: int = 4096):
+        """
+        max_distance     : jarak edit maksimum (dipakai untuk kata >= long_word_length)
+        min_length       : token lebih pendek dari ini tidak dikoreksi
+        long_word_length : token lebih pendek dari ini maksimal berjarak 1
+        """
+        self.max_distance = max_distance
+        self.min_length = min_length
+        self.long_word_length = long_word_length
+        self.vocabulary: FrozenSet[str] = frozenset(vocabulary)
+        # Token yang lebih panjang dari ini pasti berjarak > max_distance dari semua kata
+        self.max_token_length = max(map(len, self.vocabulary), default=0) + max_distance
+        self._deletes: Dict[str, Set[str]] = {}
+
+        for word in self.vocabulary:
+            for deleted in _deletes(word, max_distance):
+                self._deletes.setdefault(deleted, set()).add(word)
+
+        # Cache hasil lookup per token (dict biasa agar classifier tetap bisa di-pickle)
+        self.cache_size = cache_size
+        self._cache: Dict[str, Optional[str]] = {}
+
+    def allowed_distance(self, token: str) -> int:
+        """Jarak edit yang diizinkan untuk panjang token ini"""
+        if len(token) < self.min_length:
+            return 0
+        if len(token) < self.long_word_length:
+            return min(1, self.max_distance)
+        return self.max_distance
+
+    def lookup(self, token: str) -> Optional[str]:
+        """Koreksi untuk token (memakai cache), atau None jika token tidak perlu dikoreksi"""
+        try:
+            return self._cache[token]
+        except KeyError:
+            pass
+        if len(self._cache) >= self.cache_size:
+            self._cache.clear()
+        result = self._cache[token] = self._lookup(token)
+        return result
+
+    def _lookup(self, token: str) -> Optional[str]:
+        """Kata kosakata terdekat untuk token, atau None jika tidak ada yang cukup dekat"""
+        if token in self.vocabulary or token in FUZZY_IGNORE:
+            return None
+
+        max_distance = self.allowed_distance(token)
+        if max_distance == 0 or len(token) > self.max_token_length:
+            # Juga mencegah ledakan deletion O(panjang^2) untuk token sangat panjang
+            return None
+
+        candidates = set()
+        for deleted in _deletes(token, max_distance):
+            candidates |= self._deletes.get(deleted, set())
+
+        best_word = None
+        best_distance = max_distance + 1
+        for candidate in sorted(candidates):
+            distance = bounded_edit_distance(token, candidate, max_distance)
+            if distance < best_distance:
+                best_word, best_distance = candidate, distance
+        return best_word
+
+    def correct_tokens(self, tokens: Iterable[str]) -> Optional[Tuple[str, ...]]:
+        """Token dengan typo yang sudah dikoreksi, atau None jika tidak ada yang berubah"""
+        corrected: List[str] = []
+        changed = False
+        for token in tokens:
+            replacement = self.lookup(token)
+            if replacement is None:
+                corrected.append(token)
+            else:
+                corrected.append(replacement)
+                changed = True
+        return tuple(corrected) if changed else None
@@ -0,0 +1,46 @@
+"""
+Konfigurasi gunicorn untuk self-hosting multi-core (pre-fork).
+Jalankan dari root repo (butuh: pip install gunicorn):
+    gunicorn -c api/gunicorn_conf.py api.index:app
+    SERVER_MODE=prefork python -m api.serve
+
+Chatbot (classifier, index, body JSON terkompresi) dibangun sekali di proses
+master karena preload_app, lalu dibekukan dari GC sebelum fork agar worker
+berbagi halaman memori yang sama lewat copy-on-write. Cache respons, session
+dan admission control tetap per worker.
+Semua nilai diambil dari config.py (bisa di-override lewat environment).
+"""
+
+import gc
+
+from api.config import (PORT, PREFORK_GRACEFUL_TIMEOUT, PREFORK_MAX_REQUESTS, PREFORK_MAX_REQUESTS_JITTER,
+                        PREFORK_THREADS, PREFORK_TIMEOUT, PREFORK_WORKERS)
+
+bind = f"0.0.0.0:{PORT}"
+workers = PREFORK_WORKERS
+worker_class = "gthread"
+threads = PREFORK_THREADS
+
+# Import api.index (yang membangun chatbot) di master, bukan di tiap worker
+preload_app = True
+
+# Daur ulang worker setelah sekian request; jitter mencegah semua worker restart bersamaan
+max_requests = PREFORK_MAX_REQUESTS
+max_requests_jitter = PREFORK_MAX_REQUESTS_JITTER
+
+# SIGTERM: berhenti menerima koneksi, selesaikan request berjalan dalam graceful_timeout
+timeout = PREFORK_TIMEOUT
+graceful_timeout = PREFORK_GRACEFUL_TIMEOUT
+keepalive = 5
+
+accesslog = "-"
+
+
+def when_ready(server):
+    """Dipanggil di master setelah app dimuat, sebelum worker pertama di-fork"""
+    # Objek yang sudah ada dipindah ke generasi permanen: GC worker tidak menyentuh
+    # (dan menyalin) halaman memori milik chatbot yang dibagi dari master
+    gc.collect()
+    gc.freeze()
+    server.log.info("Chatbot dimuat di master, %d objek dibekukan untuk dibagi ke %d worker",
+                    gc.get_freeze_count(), server.num_workers)
@@ -1,28 +1,267 @@
-from flask import Flask, request, jsonify
+import json
+from time import perf_counter
+from typing import Optional
+
+from flask import Blueprint, Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
+from werkzeug.exceptions import RequestEntityTooLarge
 # PENTING: Tambahkan titik (.) di depan chatbot_logic agar Vercel bisa menemukannya
-from .chatbot_logic import get_bot_response 
+from .chatbot_logic import get_bot, get_bot_reply, get_bot_responses, is_bot_ready
+from .admission import AdmissionController, AdmissionRejected, TokenBucketLimiter, client_address
+from .config import (ADMISSION_MAX_CONCURRENT, ADMISSION_MAX_QUEUE, ADMISSION_QUEUE_TIMEOUT, DEBUG,
+                     MAX_BATCH_SIZE, MAX_MESSAGE_LENGTH, MAX_REQUEST_BYTES, PORT, RATE_LIMIT_BURST,
+                     RATE_LIMIT_PER_SECOND, STREAM_CHUNK_SIZE, TRUSTED_PROXY_HOPS)
+from .encoded_responses import EncodedResponses
+from .metrics import metrics, server_timing_header
+from .sessions import MAX_SESSION_ID_LENGTH
+from .streaming import iter_reply_events, sse_event
+
+# Semua route; dipasang ke aplikasi oleh create_app()
+routes = Blueprint("chatbot", __name__)
+
+# Bangun/muat chatbot saat import (cold start), bukan di request pertama
+# JSON + gzip/brotli + ETag semua teks respons tetap juga disiapkan sekarang
+response_bodies = EncodedResponses(get_bot().known_responses())
+
+# Batas beban semua route chat: lebih baik menolak cepat daripada semua user kena timeout
+admission = AdmissionController(ADMISSION_MAX_CONCURRENT, ADMISSION_MAX_QUEUE, ADMISSION_QUEUE_TIMEOUT)
+rate_limiter = TokenBucketLimiter(RATE_LIMIT_PER_SECOND, RATE_LIMIT_BURST)
 
-app = Flask(__name__)
+BUSY_BODY = json.dumps({
+    "error": "Server sedang sibuk",
+    "response": "Maaf, EcoBuddy sedang melayani banyak pertanyaan. 🙏 Silakan coba lagi sebentar lagi."
+}, ensure_ascii=False).encode("utf-8")
 
-# Izinkan semua request (Penting karena domain Vercel berbeda dengan localhost)
-CORS(app)
+TOO_LONG_RESPONSE = (f"Pesannya terlalu panjang untuk EcoBuddy. 🙏 "
+                     f"Coba ringkas pertanyaanmu (maksimal {MAX_MESSAGE_LENGTH} karakter).")
 
-@app.route("/")
+@routes.route("/")
 def home():
     return "Chatbot API Flask aktif"
 
+# Liveness: proses hidup dan bisa melayani request
+@routes.route("/healthz")
+def healthz():
+    return jsonify({"status": "ok"})
+
+# Readiness: chatbot sudah dimuat dan antrean /api/chat belum penuh
+@routes.route("/readyz")
+def readyz():
+    if not is_bot_ready():
+        return jsonify({"status": "loading"}), 503
+    if admission.saturated():
+        return jsonify({"status": "busy"}), 503
+    return jsonify({"status": "ready"})
+
 # PENTING: Gunakan /api/chat agar sesuai dengan vercel.json Anda
-@app.route("/api/chat", methods=["POST"])
+@routes.route("/api/chat", methods=["POST"])
 def chat():
+    # Client yang melewati rate limit selalu mendapat 429, juga untuk pesan yang ada di cache
+    if not rate_limiter.allow(_client_id()):
+        return _busy_response("/api/chat", 429, rate_limiter.retry_after())
+    try:
+        with admission.admit():
+            return _chat()
+    except AdmissionRejected as e:
+        return _shed_response(e.retry_after)
+
+def _chat():
+    timings = metrics.new_timings()
     try:
+        if timings is None:
+            data = request.get_json() or {}
+            user_message = data.get("message", "")
+            if _message_too_long(user_message):
+                return _too_long_response()
+            reply = get_bot_reply(user_message, session_id=_session_id(data))
+            return _encoded_chat_response(reply.response)
+        
+        start = perf_counter()
         data = request.get_json() or {}
         user_message = data.get("message", "")
-        bot_response = get_bot_response(user_message)
-        return jsonify({"response": bot_response})
+        timings['parse'] = perf_counter() - start
+        
+        if _message_too_long(user_message):
+            metrics.record_request("/api/chat", 413, timings)
+            return _too_long_response()
+        
+        reply = get_bot_reply(user_message, timings, _session_id(data))
+        
+        start = perf_counter()
+        response = _encoded_chat_response(reply.response)
+        timings['serialize'] = perf_counter() - start
+        
+        response.headers["Server-Timing"] = server_timing_header(timings)
+        metrics.record_request("/api/chat", response.status_code, timings, reply.intent.value, reply.fallback_used)
+        return response
+    except RequestEntityTooLarge:
+        if timings is not None:
+            metrics.record_request("/api/chat", 413, timings)
+        return _too_long_response()
     except Exception as e:
+        if timings is not None:
+            metrics.record_request("/api/chat", 500, timings)
         return jsonify({"error": str(e)}), 500
 
+def _message_too_long(message) -> bool:
+    """Pesan melebihi MAX_MESSAGE_LENGTH (dicek sebelum normalisasi dan klasifikasi)"""
+    return MAX_MESSAGE_LENGTH > 0 and isinstance(message, str) and len(message) > MAX_MESSAGE_LENGTH
+
+def _too_long_response() -> Response:
+    """413 untuk pesan/body yang terlalu besar, dengan teks yang tetap bisa ditampilkan frontend"""
+    return jsonify({
+        "error": f"Pesan melebihi {MAX_MESSAGE_LENGTH} karakter",
+        "response": TOO_LONG_RESPONSE
+    }), 413
+
+def _client_id() -> str:
+    """Identitas client untuk rate limit (X-Forwarded-For hanya di belakang TRUSTED_PROXY_HOPS proxy)"""
+    return client_address(request.remote_addr, request.headers.get("X-Forwarded-For"), TRUSTED_PROXY_HOPS)
+
+def _session_id(data: dict) -> Optional[str]:
+    """Session id client dari field JSON "session_id" atau header X-Session-Id (opsional)"""
+    session_id = data.get("session_id") or request.headers.get("X-Session-Id")
+    if isinstance(session_id, str) and 0 < len(session_id) <= MAX_SESSION_ID_LENGTH:
+        return session_id
+    return None
+
+def _shed_response(retry_after: float) -> Response:
+    """Respons murah saat admission control menolak: jawaban dari cache jika ada, jika tidak 503"""
+    data = request.get_json(silent=True) or {}
+    message = data.get("message", "")
+    reply = get_bot().cached_reply(message) if isinstance(message, str) else None
+    
+    if reply is None:
+        return _busy_response("/api/chat", 503, retry_after)
+    
+    admission.record_cached_reply()
+    response = _encoded_chat_response(reply.response)
+    response.headers["X-Load-Shed"] = "cached"
+    if metrics.enabled:
+        metrics.record_request("/api/chat", response.status_code, {})
+    return response
+
+def _busy_response(route: str, status: int, retry_after: float) -> Response:
+    """429/503 dengan Retry-After untuk request yang ditolak rate limit/admission control"""
+    response = Response(BUSY_BODY, status=status, mimetype="application/json")
+    response.headers["Retry-After"] = str(max(1, round(retry_after)))
+    if metrics.enabled:
+        metrics.record_request(route, status, {})
+    return response
+
+def _encoded_chat_response(text: str) -> Response:
+    """Body {"response": text} yang sudah di-encode, sesuai Accept-Encoding"""
+    body = response_bodies.body(text)
+    # ETag di sini sidik jari isi jawaban (client bisa tahu jawabannya sama tanpa membandingkan
+    # body), bukan validator cache: /api/chat hanya POST, jadi If-None-Match tidak pernah dijawab 304
+    headers = {"ETag": body.etag, "Vary": "Accept-Encoding"}
+    data, encoding = body.select(response_bodies.encodings(request.headers.get("Accept-Encoding", "")))
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    return Response(data, mimetype="application/json", headers=headers)
+
+# Endpoint batch untuk job offline (replay korpus moderasi/QA)
+@routes.route("/api/chat/batch", methods=["POST"])
+def chat_batch():
+    try:
+        data = request.get_json() or {}
+        messages = data.get("messages")
+        
+        if not isinstance(messages, list) or not all(isinstance(m, str) for m in messages):
+            return jsonify({"error": "Field 'messages' harus berupa list string"}), 400
+        if len(messages) > MAX_BATCH_SIZE:
+            return jsonify({"error": f"Maksimal {MAX_BATCH_SIZE} pesan per batch"}), 400
+        too_long = [index for index, message in enumerate(messages) if _message_too_long(message)]
+        if too_long:
+            return jsonify({"error": f"Pesan melebihi {MAX_MESSAGE_LENGTH} karakter", "indices": too_long}), 413
+        
+        # Satu batch = sejumlah pesannya, baik untuk rate limit maupun slot admission
+        if not rate_limiter.allow(_client_id(), max(1, len(messages))):
+            return _busy_response("/api/chat/batch", 429, rate_limiter.retry_after())
+        with admission.admit(len(messages)):
+            replies = get_bot_responses(messages)
+        return jsonify({"results": [reply.to_dict() for reply in replies]})
+    except AdmissionRejected as e:
+        return _busy_response("/api/chat/batch", 503, e.retry_after)
+    except RequestEntityTooLarge:
+        return _too_long_response()
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+# Endpoint streaming (SSE): intent dikirim dulu, lalu teks respons per potongan
+@routes.route("/api/chat/stream", methods=["POST"])
+def chat_stream():
+    data = request.get_json(silent=True) or {}
+    user_message = data.get("message", "")
+    session_id = _session_id(data)
+    if _message_too_long(user_message):
+        return _too_long_response()
+    if not rate_limiter.allow(_client_id()):
+        return _busy_response("/api/chat/stream", 429, rate_limiter.retry_after())
+    
+    # Klasifikasi di dalam slot admission sebelum stream dimulai (generator yang tidak
+    # pernah dijalankan client tidak akan melepas slot)
+    reply, error = None, None
+    try:
+        with admission.admit():
+            reply = get_bot_reply(user_message, session_id=session_id)
+    except AdmissionRejected as e:
+        return _busy_response("/api/chat/stream", 503, e.retry_after)
+    except Exception as e:
+        error = e
+    
+    def generate():
+        if error is not None:
+            yield sse_event("error", {"error": str(error)})
+        else:
+            yield from iter_reply_events(reply, STREAM_CHUNK_SIZE)
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # Matikan buffering proxy (nginx) agar event langsung terkirim
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+@routes.app_errorhandler(RequestEntityTooLarge)
+def request_too_large(_error):
+    return _too_long_response()
+
+# Metrik format Prometheus (counter & histogram latency per tahap dan per intent)
+@routes.route("/api/metrics")
+def metrics_endpoint():
+    if not metrics.enabled:
+        return jsonify({"error": "Metrik nonaktif (METRICS_ENABLED=0)"}), 404
+    
+    bot = get_bot()
+    cache = bot.response_cache
+    admission_stats = admission.stats()
+    admission_stats['rejected_rate_limited'] = rate_limiter.limited
+    # Backend linear (linear_model.py) tidak memakai batas waktu klasifikasi
+    budget_exhausted = getattr(bot.classifier, 'budget_exhausted', None)
+    body = metrics.render(cache.stats() if cache is not None else None, admission_stats,
+                          bot.sessions.stats() if bot.sessions is not None else None,
+                          {'budget_exhausted': budget_exhausted} if budget_exhausted is not None else None,
+                          bot.interaction_log.stats() if bot.interaction_log is not None else None)
+    return Response(body, mimetype="text/plain; version=0.0.4")
+
+def create_app() -> Flask:
+    """Aplikasi Flask dengan semua route (Vercel, gunicorn lewat `app`, atau embed di tempat lain)"""
+    flask_app = Flask(__name__)
+    # Body lebih besar dari ini ditolak 413 sebelum JSON di-parse
+    flask_app.config["MAX_CONTENT_LENGTH"] = MAX_REQUEST_BYTES or None
+    # Izinkan semua request (Penting karena domain Vercel berbeda dengan localhost)
+    CORS(flask_app, expose_headers=["ETag"])
+    flask_app.register_blueprint(routes)
+    return flask_app
+
+# Vercel dan gunicorn (api.index:app) mencari variabel `app`
+app = create_app()
+
 # JANGAN gunakan app.run() di Vercel karena akan menyebabkan timeout
+# Untuk production self-hosted pakai gunicorn (lihat gunicorn_conf.py)
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=5000, debug=True)
\ No newline at end of file
+    app.run(host="0.0.0.0", port=PORT, debug=DEBUG)
\ No newline at end of file
@@ -1,21 +1,101 @@
 """
 Intent Analyzer Tool - Untuk menganalisis dan debug intent classification
 Jalankan: python intent_analyzer.py
+
+Mode non-interaktif untuk file log besar (JSONL/teks, boleh .gz):
+    python intent_anlyzer.py batch messages.jsonl -o results.jsonl --workers 8
+    python -m api.intent_anlyzer batch messages.jsonl    # dari root repo
 """
 
-from chatbot_logic import CircularEconomyBot, Intent
-from collections import defaultdict
+try:
+    from .chatbot_logic import CircularEconomyBot, Intent, IntentClassifier
+    from .linear_matcher import LinearPatternSet
+except ImportError:
+    # Dijalankan langsung dari folder api/
+    from chatbot_logic import CircularEconomyBot, Intent, IntentClassifier
+    from linear_matcher import LinearPatternSet
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import gzip
 import json
+import math
+import os
+import re
+import sys
+import time
+from typing import Optional
+
+SAMPLE_MESSAGES = [
+    "Halo",
+    "Apa itu ekonomi sirkular?",
+    "Jelaskan prinsip 5R",
+    "Contoh penerapan",
+    "Manfaatnya apa?",
+    "Tips dong",
+    "Bahaya plastik",
+    "Terima kasih",
+    "Siapa kamu?",
+    "ekonomi",
+    "sustainability itu apa?",
+    "gimana caranya?"
+]
+
+class BatchSummary:
+    """Statistik ringkasan yang diagregasi per hasil, tanpa menyimpan semua hasil"""
+    
+    def __init__(self):
+        self.total = 0
+        # Baris input yang dilewati (JSON rusak, bukan object, atau tanpa pesan)
+        self.skipped = 0
+        self.intent_distribution = defaultdict(int)
+        self.confidence_ranges = {'high': 0, 'medium': 0, 'low': 0}
+        self.confidence_sum = 0.0
+        self.passed = 0
+    
+    def add(self, result: dict):
+        self.total += 1
+        self.intent_distribution[result['intent']] += 1
+        self.confidence_sum += result['confidence']
+        
+        if result['confidence'] >= 0.7:
+            self.confidence_ranges['high'] += 1
+        elif result['confidence'] >= 0.3:
+            self.confidence_ranges['medium'] += 1
+        else:
+            self.confidence_ranges['low'] += 1
+        
+        if result['threshold_passed']:
+            self.passed += 1
+
 
 class IntentAnalyzer:
     """Tool untuk menganalisis performa intent classification"""
     
+    # Jumlah maksimal hasil IntentScores yang diingat (LRU)
+    SCORE_MEMO_SIZE = 10000
+    
     def __init__(self):
-        self.bot = CircularEconomyBot()
+        # Cache dimatikan agar setiap analisis benar-benar menjalankan classifier;
+        # tanpa batas waktu agar hasil analisis tidak tergantung beban mesin
+        self.bot = CircularEconomyBot(cache_size=0, classifier=IntentClassifier(time_budget=0))
+        # Pesan -> IntentScores, agar pesan yang dianalisis berkali-kali hanya diskor sekali
+        self._score_memo = OrderedDict()
+    
+    def score(self, message: str):
+        """IntentScores untuk pesan (API scoring yang sama dengan produksi, diingat per pesan)"""
+        scores = self._score_memo.get(message)
+        if scores is None:
+            scores = self._score_memo[message] = self.bot.classifier.score(message)
+            if len(self._score_memo) > self.SCORE_MEMO_SIZE:
+                self._score_memo.popitem(last=False)
+        else:
+            self._score_memo.move_to_end(message)
+        return scores
         
     def analyze_single(self, message: str, verbose: bool = True):
         """Analisis detail untuk satu pertanyaan"""
-        intent, confidence = self.bot.classifier.classify(message)
+        intent, confidence = self.score(message).best()
         
         if verbose:
             print("\n" + "="*70)
@@ -52,34 +132,34 @@ class IntentAnalyzer:
     def analyze_batch(self, messages: list, show_summary: bool = True):
         """Analisis batch pertanyaan"""
         results = []
-        intent_distribution = defaultdict(int)
-        confidence_ranges = {'high': 0, 'medium': 0, 'low': 0}
+        summary = BatchSummary()
         
         for message in messages:
             result = self.analyze_single(message, verbose=False)
             results.append(result)
-            
-            intent_distribution[result['intent']] += 1
-            
-            if result['confidence'] >= 0.7:
-                confidence_ranges['high'] += 1
-            elif result['confidence'] >= 0.3:
-                confidence_ranges['medium'] += 1
-            else:
-                confidence_ranges['low'] += 1
+            summary.add(result)
         
         if show_summary:
-            self._print_summary(results, intent_distribution, confidence_ranges)
+            self._print_summary(summary)
         
         return results
     
-    def _print_summary(self, results, intent_distribution, confidence_ranges):
+    @staticmethod
+    def _print_summary(summary: BatchSummary):
         """Print summary statistik"""
         print("\n" + "="*70)
         print("📊 ANALYSIS SUMMARY")
         print("="*70)
         
-        total = len(results)
+        total = summary.total
+        if summary.skipped:
+            print(f"\n⚠️  Skipped Lines: {summary.skipped:,} (JSON rusak, bukan object, atau tanpa pesan)")
+        if not total:
+            print("\n📈 Total Messages: 0")
+            print("="*70)
+            return
+        intent_distribution = summary.intent_distribution
+        confidence_ranges = summary.confidence_ranges
         
         print(f"\n📈 Total Messages: {total}")
         print(f"\n🎯 Intent Distribution:")
@@ -92,10 +172,10 @@ class IntentAnalyzer:
         print(f"  • MEDIUM (≥0.3) : {confidence_ranges['medium']:3d} ({confidence_ranges['medium']/total*100:5.1f}%)")
         print(f"  • LOW    (<0.3) : {confidence_ranges['low']:3d} ({confidence_ranges['low']/total*100:5.1f}%)")
         
-        avg_confidence = sum(r['confidence'] for r in results) / total
+        avg_confidence = summary.confidence_sum / total
         print(f"\n📉 Average Confidence: {avg_confidence:.4f}")
         
-        passed = sum(1 for r in results if r['threshold_passed'])
+        passed = summary.passed
         print(f"\n✅ Passed Threshold: {passed}/{total} ({passed/total*100:.1f}%)")
         print("="*70)
     
@@ -108,7 +188,7 @@ class IntentAnalyzer:
         low_confidence = []
         
         for message in messages:
-            intent, confidence = self.bot.classifier.classify(message)
+            intent, confidence = self.score(message).best()
             if confidence < threshold:
                 low_confidence.append({
                     'message': message,
@@ -132,37 +212,204 @@ class IntentAnalyzer:
         print(f"📝 COMPARING ALL INTENTS FOR: {message}")
         print("="*70)
         
-        message_norm = message.lower().strip()
-        scores = []
-        
-        for intent, config in self.bot.classifier.intent_patterns.items():
-            score = 0.0
-            
-            # Pattern matching
-            if self.bot.classifier._match_pattern(message_norm, config['patterns']):
-                score += 10.0 * config['weight']
-            
-            # Keyword matching
-            keyword_score = self.bot.classifier._calculate_keyword_score(message_norm, config['keywords'])
-            score += keyword_score * config['weight']
-            
-            scores.append({
+        intent_scores = self.score(message)
+        # Urutan lengkap (skor sama -> urutan intent_patterns), sama dengan classify
+        scores = [
+            {
                 'intent': intent.value,
                 'score': score,
-                'normalized': min(score / 20.0, 1.0)
-            })
-        
-        # Sort by score
-        scores.sort(key=lambda x: x['score'], reverse=True)
+                'normalized': min(score / 20.0, 1.0),
+                'rules': [rule._asdict() for rule in intent_scores.details(intent)] if score > 0 else []
+            }
+            for intent, score in intent_scores.top_k(len(intent_scores))
+        ]
         
         print(f"\n🏆 Top {top_n} Intent Candidates:\n")
         for i, item in enumerate(scores[:top_n], 1):
             bar = "█" * int(item['normalized'] * 30)
             print(f"  {i}. {item['intent']:25s} | {item['score']:6.2f} | {bar}")
+            for rule in item['rules']:
+                print(f"       {rule['points']:6.2f} ← {rule['kind']:15s} {rule['rule'][:60]}")
         
         print("="*70)
         return scores
     
+    def profile_rules(self, messages: list, repeat: int = 3, top_n: int = 10):
+        """
+        Ukur biaya tiap pola dan tiap daftar keyword pada korpus, urutkan dari yang termahal.
+        Pola diukur dengan modul re dan dengan LinearPatternSet (matcher yang dipakai jika
+        guarded, setelah satu pass pemanasan DFA); urutan memakai matcher yang aktif.
+        """
+        classifier = self.bot.classifier
+        guarded = classifier.linear_matcher is not None
+        normalized = [classifier.normalize(m) for m in messages]
+        texts = [m.text for m in normalized if m.text]
+        runs = max(1, repeat * len(texts))
+        costs = []
+        
+        for intent, config in classifier.intent_patterns.items():
+            for pattern in config['patterns']:
+                compiled = classifier.pattern_matcher.compile(pattern)
+                re_elapsed = self._time_matcher(compiled.search, texts, repeat)
+                linear = LinearPatternSet({intent: [pattern]})
+                self._time_matcher(linear.match, texts, 1)
+                linear_elapsed = self._time_matcher(linear.match, texts, repeat)
+                elapsed = linear_elapsed if guarded else re_elapsed
+                costs.append({
+                    'intent': intent.value,
+                    'rule': 'pattern',
+                    'source': pattern,
+                    'total_ms': elapsed * 1000,
+                    'mean_us': elapsed / runs * 1e6,
+                    're_us': re_elapsed / runs * 1e6,
+                    'linear_us': linear_elapsed / runs * 1e6,
+                    'dfa_states': linear.cached_states
+                })
+            
+            start = time.perf_counter()
+            for _ in range(repeat):
+                for message in normalized:
+                    if message.text:
+                        classifier._calculate_keyword_score(message.text, config['keywords'], message.token_set)
+            elapsed = time.perf_counter() - start
+            costs.append({
+                'intent': intent.value,
+                'rule': 'keywords',
+                'source': ", ".join(config['keywords']),
+                'total_ms': elapsed * 1000,
+                'mean_us': elapsed / runs * 1e6
+            })
+        
+        costs.sort(key=lambda x: x['total_ms'], reverse=True)
+        
+        # Semua pola dalam satu automaton, seperti yang dijalankan classifier: pass pertama
+        # membangun DFA dari nol (cold start), pass berikutnya memakai cache
+        combined = self._linear_matcher(classifier)
+        cold = self._time_matcher(combined.match, texts, 1)
+        warm = self._time_matcher(combined.match, texts, repeat)
+        
+        print("\n" + "="*70)
+        print(f"⏱️  RULE COST PROFILE ({len(texts)} messages x {repeat}, "
+              f"sorted by {'LinearPatternSet' if guarded else 're'})")
+        print("="*70)
+        print(f"\n🏆 Top {top_n} most expensive rules:\n")
+        print(f"       {'re':>8s}   {'linear':>8s}   {'states':>6s}")
+        for i, item in enumerate(costs[:top_n], 1):
+            if item['rule'] == 'pattern':
+                columns = f"{item['re_us']:8.2f} µs {item['linear_us']:8.2f} µs {item['dfa_states']:6d}"
+            else:
+                columns = f"{item['mean_us']:8.2f} µs {'':>8s}    {'':>6s}"
+            print(f"  {i:2d}. {columns} | {item['intent']:22s} | {item['rule']:8s} | {item['source'][:40]}")
+        print(f"\n🤖 LinearPatternSet (all patterns): cold {cold / max(1, len(texts)) * 1e6:.2f} µs, "
+              f"warm {warm / runs * 1e6:.2f} µs per message, {combined.cached_states} DFA states")
+        print("="*70)
+        return costs
+    
+    @staticmethod
+    def _time_matcher(match, texts: list, repeat: int) -> float:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for text in texts:
+                match(text)
+        return time.perf_counter() - start
+    
+    @staticmethod
+    def _linear_matcher(classifier: IntentClassifier) -> LinearPatternSet:
+        """LinearPatternSet baru (cache DFA kosong) untuk semua pola classifier"""
+        return LinearPatternSet({intent: config['patterns'] for intent, config in classifier.intent_patterns.items()})
+    
+    @staticmethod
+    def _adversarial_seed(pattern: str) -> str:
+        """
+        Teks pembuka yang cocok dengan awal pola tetapi tidak dengan penutupnya,
+        mis. '\\b(bagaimana|how).+(hidup).+(eco)\\b' -> 'bagaimana x hidup x '
+        """
+        text = re.sub(r'\(([^()|]*)[^()]*\)', r'\1', pattern)
+        text = text.replace('.+', ' x ').replace('\\b', '').replace('\\s', ' ')
+        words = text.split()
+        if len(words) > 1:
+            words = words[:-1]
+        return " ".join(words) + " "
+    
+    def stress_test_patterns(self, sizes: tuple = (250, 500, 1000, 2000, 4000),
+                             max_seconds: float = 0.5, exponent_threshold: float = 1.5):
+        """
+        Uji setiap pola dengan input adversarial yang makin panjang, dengan modul re dan
+        LinearPatternSet, lalu tandai pola yang waktunya tumbuh super-linear (eksponen
+        log-log > exponent_threshold) pada matcher yang aktif. Pertumbuhan state DFA
+        dicatat per pola dan untuk semua pola sekaligus.
+        """
+        classifier = self.bot.classifier
+        guarded = classifier.linear_matcher is not None
+        combined = self._linear_matcher(classifier)
+        report = []
+        
+        for intent, config in classifier.intent_patterns.items():
+            for pattern in config['patterns']:
+                compiled = classifier.pattern_matcher.compile(pattern)
+                linear = LinearPatternSet({intent: [pattern]})
+                seed = self._adversarial_seed(pattern)
+                points = {'re': [], 'linear': []}
+                
+                for size in sizes:
+                    message = (seed * (size // len(seed) + 1))[:size]
+                    for name, match in (('re', compiled.search), ('linear', linear.match)):
+                        if points[name] and points[name][-1][1] > max_seconds:
+                            # Berhenti menaikkan ukuran jika sudah terlalu lambat
+                            continue
+                        start = time.perf_counter()
+                        match(message)
+                        points[name].append((size, time.perf_counter() - start))
+                    combined.match(message)
+                
+                exponents = {name: self._growth_exponent(p) for name, p in points.items()}
+                active = points['linear' if guarded else 're']
+                exponent = exponents['linear' if guarded else 're']
+                report.append({
+                    'intent': intent.value,
+                    'pattern': pattern,
+                    'exponent': exponent,
+                    're_exponent': exponents['re'],
+                    'linear_exponent': exponents['linear'],
+                    'worst_ms': max(t for _, t in active) * 1000,
+                    'worst_size': active[-1][0],
+                    'dfa_states': linear.cached_states,
+                    'super_linear': exponent > exponent_threshold
+                })
+        
+        report.sort(key=lambda x: (x['super_linear'], x['exponent']), reverse=True)
+        
+        print("\n" + "="*70)
+        print(f"💣 BACKTRACKING STRESS TEST (sizes: {', '.join(map(str, sizes))}, "
+              f"active: {'LinearPatternSet' if guarded else 're'})")
+        print("="*70 + "\n")
+        for item in report:
+            flag = "❌ SUPER-LINEAR" if item['super_linear'] else "✅"
+            print(f"  re n^{item['re_exponent']:5.2f} | linear n^{item['linear_exponent']:5.2f} "
+                  f"({item['dfa_states']:3d} states) | {item['worst_ms']:9.2f} ms @ {item['worst_size']:5d} | "
+                  f"{flag:15s} | {item['pattern']}")
+        
+        flagged = sum(1 for item in report if item['super_linear'])
+        print(f"\n⚠️  {flagged}/{len(report)} patterns grow super-linearly")
+        print(f"🤖 LinearPatternSet (all patterns) after all inputs: {combined.cached_states} DFA states")
+        print("="*70)
+        return report
+    
+    @staticmethod
+    def _growth_exponent(points: list) -> float:
+        """Kemiringan regresi log(waktu) terhadap log(ukuran)"""
+        points = [(size, elapsed) for size, elapsed in points if elapsed > 0]
+        if len(points) < 2:
+            return 0.0
+        xs = [math.log(size) for size, _ in points]
+        ys = [math.log(elapsed) for _, elapsed in points]
+        mean_x = sum(xs) / len(xs)
+        mean_y = sum(ys) / len(ys)
+        denominator = sum((x - mean_x) ** 2 for x in xs)
+        if denominator == 0:
+            return 0.0
+        return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / denominator
+    
     def export_results(self, results: list, filename: str = "intent_analysis.json"):
         """Export hasil analisis ke JSON"""
         with open(filename, 'w', encoding='utf-8') as f:
@@ -170,6 +417,141 @@ class IntentAnalyzer:
         print(f"\n✅ Results exported to {filename}")
 
 
+# ---- Mode batch non-interaktif (file besar, multi-proses) ----
+
+_worker_classifier = None
+
+def _init_worker():
+    """Bangun classifier sekali per proses worker"""
+    global _worker_classifier
+    _worker_classifier = IntentClassifier(time_budget=0)
+
+def _classify_chunk(chunk: list, threshold: float) -> list:
+    """Klasifikasi satu potongan pesan di proses worker"""
+    results = []
+    for message in chunk:
+        intent, confidence = _worker_classifier.classify(message)
+        results.append({
+            'message': message,
+            'intent': intent.value,
+            'confidence': confidence,
+            'threshold_passed': confidence >= threshold
+        })
+    return results
+
+def iter_messages(path: str, field: str = 'message', summary: Optional[BatchSummary] = None):
+    """
+    Baca pesan satu per satu dari file tanpa memuat semuanya ke memori.
+    .jsonl/.jsonl.gz -> ambil `field` dari tiap baris; selain itu satu pesan per baris.
+    Folder -> semua file .jsonl/.jsonl.gz di dalamnya berurutan nama (mis. log interaksi).
+    Baris JSONL yang rusak, bukan object, atau tanpa pesan dilewati dan dihitung
+    di summary.skipped (jika summary diberikan), agar satu baris buruk tidak
+    menghentikan job besar.
+    """
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            if name.endswith('.jsonl') or name.endswith('.jsonl.gz'):
+                yield from iter_messages(os.path.join(path, name), field, summary)
+        return
+    
+    opener = gzip.open if path.endswith('.gz') else open
+    is_jsonl = path.endswith('.jsonl') or path.endswith('.jsonl.gz')
+    
+    with opener(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if is_jsonl:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    record = None
+                message = record.get(field) if isinstance(record, dict) else None
+                if isinstance(message, str) and message.strip():
+                    yield message
+                elif summary is not None:
+                    summary.skipped += 1
+            else:
+                yield line
+
+def _iter_chunks(messages, chunk_size: int):
+    chunk = []
+    for message in messages:
+        chunk.append(message)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def run_batch_file(input_path: str, output_path: str, workers: int = None,
+                   chunk_size: int = 1000, threshold: float = 0.3, field: str = 'message') -> BatchSummary:
+    """
+    Klasifikasi file pesan secara paralel di process pool.
+    Jumlah potongan yang sedang diproses dibatasi (workers x 2) sehingga memori tetap
+    konstan; hasil ditulis ke JSONL sesuai urutan input begitu potongannya selesai.
+    """
+    workers = workers or os.cpu_count() or 1
+    summary = BatchSummary()
+    chunks = _iter_chunks(iter_messages(input_path, field, summary), chunk_size)
+    started = last_report = time.perf_counter()
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool, \
+            open(output_path, 'w', encoding='utf-8') as out:
+        pending = deque()
+        
+        def submit_next() -> bool:
+            chunk = next(chunks, None)
+            if chunk is None:
+                return False
+            pending.append(pool.submit(_classify_chunk, chunk, threshold))
+            return True
+        
+        for _ in range(workers * 2):
+            if not submit_next():
+                break
+        
+        while pending:
+            results = pending.popleft().result()
+            submit_next()
+            
+            for result in results:
+                out.write(json.dumps(result, ensure_ascii=False) + "\n")
+                summary.add(result)
+            
+            now = time.perf_counter()
+            if now - last_report >= 1.0 or not pending:
+                last_report = now
+                rate = summary.total / (now - started)
+                print(f"\r⏳ {summary.total:,} messages ({rate:,.0f}/s)", end="", file=sys.stderr)
+    
+    print(file=sys.stderr)
+    return summary
+
+def run_cli(argv: list):
+    """Entry point non-interaktif"""
+    parser = argparse.ArgumentParser(description="EcoBuddy Intent Analyzer")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    
+    batch = subcommands.add_parser("batch", help="Klasifikasi file JSONL/teks (boleh .gz) ke JSONL")
+    batch.add_argument("input", help="File input: .jsonl (field 'message') atau teks satu pesan per baris, "
+                                      "atau folder log interaksi (.jsonl.gz)")
+    batch.add_argument("-o", "--output", default="intent_analysis.jsonl", help="File output JSONL")
+    batch.add_argument("--workers", type=int, default=None, help="Jumlah proses (default: jumlah CPU)")
+    batch.add_argument("--chunk-size", type=int, default=1000, help="Pesan per potongan kerja")
+    batch.add_argument("--threshold", type=float, default=0.3, help="Threshold confidence")
+    batch.add_argument("--field", default="message", help="Nama field pesan di JSONL")
+    
+    args = parser.parse_args(argv)
+    
+    if args.command == "batch":
+        summary = run_batch_file(args.input, args.output, args.workers,
+                                 args.chunk_size, args.threshold, args.field)
+        IntentAnalyzer._print_summary(summary)
+        print(f"\n✅ Results exported to {args.output}")
+
+
 def main():
     """Main function dengan menu interaktif"""
     
@@ -184,11 +566,12 @@ def main():
     print("  3. Find Low Confidence Messages")
     print("  4. Compare All Intents for a Message")
     print("  5. Run Sample Analysis")
-    print("  6. Exit")
+    print("  6. Profile Rule Cost & Backtracking")
+    print("  7. Exit")
     print("="*70)
     
     while True:
-        choice = input("\nPilihan (1-6): ").strip()
+        choice = input("\nPilihan (1-7): ").strip()
         
         if choice == "1":
             message = input("Masukkan pertanyaan: ").strip()
@@ -232,28 +615,24 @@ def main():
         
         elif choice == "5":
             print("\n🧪 Running sample analysis...")
-            sample_messages = [
-                "Halo",
-                "Apa itu ekonomi sirkular?",
-                "Jelaskan prinsip 5R",
-                "Contoh penerapan",
-                "Manfaatnya apa?",
-                "Tips dong",
-                "Bahaya plastik",
-                "Terima kasih",
-                "Siapa kamu?",
-                "ekonomi",
-                "sustainability itu apa?",
-                "gimana caranya?"
-            ]
-            
-            results = analyzer.analyze_batch(sample_messages)
+            results = analyzer.analyze_batch(SAMPLE_MESSAGES)
             
             export = input("\nExport to JSON? (y/n): ").strip().lower()
             if export == 'y':
                 analyzer.export_results(results)
         
         elif choice == "6":
+            path = input("File korpus (satu pesan per baris, kosong = sampel): ").strip()
+            if path:
+                with open(path, encoding='utf-8') as f:
+                    messages = [line.strip() for line in f if line.strip()]
+            else:
+                messages = SAMPLE_MESSAGES
+            
+            analyzer.profile_rules(messages)
+            analyzer.stress_test_patterns()
+        
+        elif choice == "7":
             print("\n👋 Terima kasih!")
             break
         
@@ -262,4 +641,7 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if len(sys.argv) > 1:
+        run_cli(sys.argv[1:])
+    else:
+        main()
\ No newline at end of file
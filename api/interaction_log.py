@@ -0,0 +1,173 @@
+"""
+Log interaksi chatbot (pesan, intent, confidence, latency, fallback) untuk retraining.
+Request hanya memasukkan tuple kecil ke antrean terbatas di memori; serialisasi JSON,
+kompresi gzip dan I/O disk dikerjakan satu thread latar per proses secara batch.
+Jika antrean penuh (disk lambat/beban puncak), record dibuang dan dihitung agar
+request tidak pernah menunggu disk.
+
+File: <directory>/interactions-<waktu>-<pid>-<nomor>.jsonl.gz, dirotasi setelah
+max_bytes (terkompresi). File yang masih ditulis berakhiran .part dan baru di-rename
+saat ditutup, sehingga setiap .jsonl.gz selalu utuh dan bisa langsung dibaca:
+    python api/intent_anlyzer.py batch <directory>
+    python -m api.linear_model train <file>.jsonl.gz model.npz
+"""
+
+import atexit
+import gzip
+import json
+import os
+import queue
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+# Penanda berhenti untuk thread penulis
+_STOP = object()
+
+# (waktu, pesan, intent, confidence, latency detik, fallback_used)
+Record = Tuple[float, str, str, float, float, bool]
+
+
+class InteractionLogger:
+    """
+    Antrean terbatas + thread penulis batch ke file JSONL gzip yang dirotasi per ukuran.
+    Thread dimulai saat record pertama di proses ini, jadi aman dibuat sebelum fork
+    (gunicorn preload_app): setiap worker mendapat antrean, thread dan file sendiri.
+    """
+
+    def __init__(self, directory: str, queue_size: int = 10000, batch_size: int = 500,
+                 flush_interval: float = 1.0, max_bytes: int = 64 * 1024 * 1024):
+        self.directory = directory
+        self.queue_size = queue_size
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._pid: Optional[int] = None
+        self._queue: Optional[queue.Queue] = None
+        self._thread: Optional[threading.Thread] = None
+        self._file: Optional[gzip.GzipFile] = None
+        self._raw = None
+        self._path: Optional[str] = None
+        self._sequence = 0
+        self.written = 0
+        self.dropped = 0
+        self.files = 0
+
+    def log(self, message: str, intent: str, confidence: float, latency: float, fallback_used: bool) -> bool:
+        """Antrekan satu interaksi tanpa menunggu; False jika record dibuang karena antrean penuh"""
+        if self._pid != os.getpid():
+            self._start()
+        try:
+            self._queue.put_nowait((time.time(), message, intent, confidence, latency, fallback_used))
+            return True
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+
+    def close(self, timeout: float = 5.0):
+        """Tulis semua record yang masih antre lalu tutup file (dipanggil juga saat proses keluar)"""
+        with self._lock:
+            if self._pid != os.getpid() or self._thread is None:
+                return
+            thread, self._thread = self._thread, None
+        # put (bukan put_nowait): penanda berhenti harus masuk walaupun antrean penuh
+        self._queue.put(_STOP)
+        thread.join(timeout)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'written': self.written,
+            'dropped': self.dropped,
+            'queued': self._queue.qsize() if self._queue is not None and self._pid == os.getpid() else 0,
+            'files': self.files,
+        }
+
+    def _start(self):
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            # Setelah fork antrean/thread milik proses induk tidak berlaku lagi
+            self._queue = queue.Queue(self.queue_size)
+            self._file = self._raw = self._path = None
+            self._thread = threading.Thread(target=self._run, name="interaction-log", daemon=True)
+            self._pid = os.getpid()
+            self._thread.start()
+        atexit.register(self.close)
+
+    def _run(self):
+        """Kumpulkan record sampai batch_size atau flush_interval sejak record pertama batch"""
+        batch: List[Record] = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                record = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                record = None
+
+            if record is _STOP:
+                self._write(batch)
+                self._close_file()
+                return
+            if record is not None:
+                if not batch:
+                    deadline = time.monotonic() + self.flush_interval
+                batch.append(record)
+
+            if batch and (len(batch) >= self.batch_size or time.monotonic() >= deadline):
+                self._write(batch)
+                batch = []
+                deadline = None
+
+    def _write(self, batch: List[Record]):
+        if not batch:
+            return
+        lines = "".join(
+            json.dumps({
+                "ts": round(ts, 3),
+                "message": message,
+                "intent": intent,
+                "confidence": round(confidence, 4),
+                "latency_ms": round(latency * 1000, 3),
+                "fallback_used": fallback_used,
+            }, ensure_ascii=False) + "\n"
+            for ts, message, intent, confidence, latency, fallback_used in batch
+        )
+        try:
+            if self._file is None:
+                self._open_file()
+            self._file.write(lines.encode("utf-8"))
+            # Sync flush per batch: data sampai ke disk walaupun file belum dirotasi
+            self._file.flush()
+            self.written += len(batch)
+            if self._raw.tell() >= self.max_bytes:
+                self._close_file()
+        except OSError as e:
+            print(f"[ERROR] Gagal menulis log interaksi: {e}")
+            with self._lock:
+                self.dropped += len(batch)
+            self._close_file()
+
+    def _open_file(self):
+        os.makedirs(self.directory, exist_ok=True)
+        self._sequence += 1
+        name = f"interactions-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{self._sequence}.jsonl.gz"
+        self._path = os.path.join(self.directory, name)
+        self._raw = open(self._path + ".part", "wb")
+        self._file = gzip.GzipFile(fileobj=self._raw, mode="wb")
+
+    def _close_file(self):
+        """Tutup file aktif (trailer gzip) lalu rename .part -> .jsonl.gz"""
+        if self._file is None:
+            return
+        try:
+            self._file.close()
+            self._raw.close()
+            os.replace(self._path + ".part", self._path)
+            self.files += 1
+        except OSError as e:
+            print(f"[ERROR] Gagal menutup log interaksi {self._path}: {e}")
+        finally:
+            self._file = self._raw = self._path = None
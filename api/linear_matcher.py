@@ -0,0 +1,423 @@
+"""
+Pencocokan pola intent dalam waktu linear (tanpa backtracking).
+Pola regex diurai dengan sre_parse lalu dikompilasi menjadi satu NFA Thompson
+untuk semua intent. NFA disimulasikan sebagai DFA lazy: himpunan state NFA
+yang aktif di tiap posisi di-cache beserta transisinya per karakter, jadi
+biaya per karakter konstan setelah pemanasan dan tidak bergantung pada bentuk
+pola (`.+` berlapis tidak bisa meledak seperti di modul re).
+
+Subset regex yang didukung: literal, kelas karakter, `.`, alternation, grup,
+kuantifier (termasuk {m,n} kecil), `\\b`, `\\B`, `^`, `\\A`, `\\Z`. Pola dengan
+fitur lain (backreference, lookaround, `$`, grup atomic/possessive) tetap
+dicocokkan dengan modul re dan dicatat di `fallback_patterns`.
+"""
+
+import _sre
+import re
+import threading
+from time import perf_counter
+from typing import Dict, FrozenSet, Hashable, List, NamedTuple, Optional, Set, Tuple
+
+try:
+    import re._parser as sre_parse  # Python 3.11+
+    from re._casefix import _EXTRA_CASES
+except ImportError:  # pragma: no cover - Python lama
+    import sre_parse
+    from sre_compile import _ignorecase_fixes as _EXTRA_CASES
+
+# Batas ekspansi kuantifier {m,n} dan jumlah state DFA yang di-cache
+MAX_REPEAT_EXPANSION = 64
+MAX_DFA_STATES = 10000
+MAX_NODE_STEPS = 100000
+# Rentang kelas karakter IGNORECASE terbesar yang dijabarkan per karakter
+MAX_FOLDED_RANGE = 0xFFFF
+
+# Jenis node NFA
+_CHAR, _SPLIT, _ASSERT, _MATCH = range(4)
+
+_REPEATS = {sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT}
+_ASSERTIONS = {
+    sre_parse.AT_BEGINNING: 'start',
+    sre_parse.AT_BEGINNING_STRING: 'start',
+    sre_parse.AT_END_STRING: 'end',
+    sre_parse.AT_BOUNDARY: 'boundary',
+    sre_parse.AT_NON_BOUNDARY: 'non_boundary',
+}
+
+
+class UnsupportedPattern(ValueError):
+    """Pola memakai fitur regex di luar subset yang bisa dijamin linear"""
+
+
+def is_word_char(char: str) -> bool:
+    """Definisi karakter kata \\b/\\w untuk pola str (Unicode) di modul re"""
+    return char.isalnum() or char == '_'
+
+
+def _category(char: str, category) -> bool:
+    if category is sre_parse.CATEGORY_DIGIT:
+        return char.isdecimal()
+    if category is sre_parse.CATEGORY_NOT_DIGIT:
+        return not char.isdecimal()
+    if category is sre_parse.CATEGORY_SPACE:
+        return char.isspace()
+    if category is sre_parse.CATEGORY_NOT_SPACE:
+        return not char.isspace()
+    if category is sre_parse.CATEGORY_WORD:
+        return is_word_char(char)
+    return not is_word_char(char)  # CATEGORY_NOT_WORD
+
+
+def _folded(code: int) -> Tuple[int, ...]:
+    """Kode huruf kecil + padanannya (mis. 's' dan 'ſ'), seperti re untuk IGNORECASE"""
+    lower = _sre.unicode_tolower(code)
+    return (lower,) + _EXTRA_CASES.get(lower, ())
+
+
+class _NFABuilder:
+    """Kompilasi pohon sre_parse menjadi node NFA (dibangun dari belakang, dengan continuation)"""
+
+    def __init__(self):
+        self.kinds: List[int] = []
+        # _CHAR: (_CharPredicate, next) | _SPLIT: list next | _ASSERT: (jenis, next) | _MATCH: indeks key
+        self.args: List[object] = []
+
+    def node(self, kind: int, arg) -> int:
+        self.kinds.append(kind)
+        self.args.append(arg)
+        return len(self.kinds) - 1
+
+    def pattern(self, pattern: str, flags: int, key_index: int) -> int:
+        """State awal satu pola yang berakhir di node _MATCH(key_index)"""
+        try:
+            parsed = sre_parse.parse(pattern, flags)
+        except re.error as e:
+            raise UnsupportedPattern(str(e))
+        flags = parsed.state.flags
+        if flags & (re.MULTILINE | re.LOCALE | re.ASCII):
+            raise UnsupportedPattern("flag MULTILINE/LOCALE/ASCII tidak didukung")
+        self.ignore_case = bool(flags & re.IGNORECASE)
+        self.dot_all = bool(flags & re.DOTALL)
+        size = len(self.kinds)
+        try:
+            return self.sequence(parsed, self.node(_MATCH, key_index))
+        except UnsupportedPattern:
+            # Buang node setengah jadi milik pola ini
+            del self.kinds[size:], self.args[size:]
+            raise
+
+    def sequence(self, items, next_state: int) -> int:
+        for op, value in reversed(list(items)):
+            next_state = self.item(op, value, next_state)
+        return next_state
+
+    def item(self, op, value, next_state: int) -> int:
+        if op is sre_parse.LITERAL or op is sre_parse.NOT_LITERAL:
+            negate = op is sre_parse.NOT_LITERAL
+            if self.ignore_case and _sre.unicode_iscased(value):
+                predicate = _CharPredicate(True, negate, frozenset(_folded(value)))
+            else:
+                predicate = _CharPredicate(False, negate, frozenset([value]))
+            return self.node(_CHAR, (predicate, next_state))
+        if op is sre_parse.ANY:
+            return self.node(_CHAR, (_CharPredicate(False, True, frozenset() if self.dot_all else frozenset([10])),
+                                     next_state))
+        if op is sre_parse.IN:
+            return self.node(_CHAR, (self.char_set(value), next_state))
+        if op is sre_parse.SUBPATTERN:
+            _, add_flags, del_flags, items = value
+            if add_flags or del_flags:
+                raise UnsupportedPattern("flag inline di dalam grup tidak didukung")
+            return self.sequence(items, next_state)
+        if op is sre_parse.BRANCH:
+            return self.node(_SPLIT, [self.sequence(branch, next_state) for branch in value[1]])
+        if op in _REPEATS:
+            return self.repeat(value, next_state)
+        if op is sre_parse.AT:
+            kind = _ASSERTIONS.get(value)
+            if kind is None:
+                raise UnsupportedPattern(f"anchor {value} tidak didukung")
+            return self.node(_ASSERT, (kind, next_state))
+        raise UnsupportedPattern(f"operator {op} tidak didukung")
+
+    def repeat(self, value, next_state: int) -> int:
+        minimum, maximum, items = value
+        unbounded = maximum is sre_parse.MAXREPEAT
+        if minimum + (0 if unbounded else maximum - minimum) > MAX_REPEAT_EXPANSION:
+            raise UnsupportedPattern("kuantifier terlalu besar")
+
+        chain = next_state
+        if unbounded:
+            loop = self.node(_SPLIT, [])
+            self.args[loop] = [self.sequence(items, loop), next_state]
+            chain = loop
+        else:
+            for _ in range(maximum - minimum):
+                chain = self.node(_SPLIT, [self.sequence(items, chain), next_state])
+        for _ in range(minimum):
+            chain = self.sequence(items, chain)
+        return chain
+
+    def char_set(self, items) -> '_CharPredicate':
+        """Predikat node IN; dengan IGNORECASE anggota disimpan dalam bentuk huruf kecil seperti re"""
+        negate = False
+        codes: Set[int] = set()
+        ranges = []
+        categories = []
+        for op, value in items:
+            if op is sre_parse.NEGATE:
+                negate = True
+            elif op is sre_parse.LITERAL:
+                codes.add(value)
+            elif op is sre_parse.RANGE:
+                ranges.append(value)
+            elif op is sre_parse.CATEGORY and value in (
+                    sre_parse.CATEGORY_DIGIT, sre_parse.CATEGORY_NOT_DIGIT,
+                    sre_parse.CATEGORY_SPACE, sre_parse.CATEGORY_NOT_SPACE,
+                    sre_parse.CATEGORY_WORD, sre_parse.CATEGORY_NOT_WORD):
+                categories.append(value)
+            else:
+                raise UnsupportedPattern(f"anggota kelas karakter {op} tidak didukung")
+
+        # re hanya menurunkan huruf input jika ada anggota yang punya huruf besar/kecil
+        fold = self.ignore_case and (
+            any(map(_sre.unicode_iscased, codes))
+            or any(_sre.unicode_iscased(code) for low, high in ranges for code in range(low, high + 1))
+        )
+        if fold:
+            if any(high - low > MAX_FOLDED_RANGE for low, high in ranges):
+                raise UnsupportedPattern("rentang karakter terlalu besar untuk IGNORECASE")
+            folded: Set[int] = set()
+            for code in codes:
+                folded.update(_folded(code))
+            for low, high in ranges:
+                for code in range(low, high + 1):
+                    folded.update(_folded(code))
+            return _CharPredicate(True, negate, frozenset(folded), (), tuple(categories))
+        return _CharPredicate(False, negate, frozenset(codes), tuple(ranges), tuple(categories))
+
+
+class _CharPredicate(NamedTuple):
+    """Himpunan karakter yang diterima satu node _CHAR (semantik sama dengan re)"""
+    fold: bool                          # bandingkan huruf kecil karakter input
+    negate: bool
+    codes: FrozenSet[int]
+    ranges: Tuple[Tuple[int, int], ...] = ()
+    categories: Tuple = ()
+
+    def accepts(self, code: int, lower: int) -> bool:
+        if self.fold:
+            code = lower
+        found = code in self.codes
+        if not found and self.ranges:
+            found = any(low <= code <= high for low, high in self.ranges)
+        if not found and self.categories:
+            char = chr(code)
+            found = any(_category(char, category) for category in self.categories)
+        return found != self.negate
+
+
+class _DFATables:
+    """
+    Cache DFA lazy satu generasi. State berupa indeks list, himpunan node NFA dan key
+    berupa tuple int terurut: isinya tidak dilacak GC, jadi cache besar tidak membuat
+    pengumpulan generasi 2 (yang berjalan di tengah request) makin lama.
+    """
+    __slots__ = ('index', 'nodes', 'prev_word', 'at_start', 'transitions', 'end_keys', 'node_steps')
+
+    def __init__(self):
+        self.index: Dict[Tuple[Tuple[int, ...], bool, bool], int] = {}
+        self.nodes: List[Tuple[int, ...]] = []
+        self.prev_word: List[bool] = []
+        self.at_start: List[bool] = []
+        # Per state: karakter -> (state berikutnya, key yang cocok tepat sebelum karakter ini)
+        self.transitions: List[Dict[str, Tuple[int, Tuple[int, ...]]]] = []
+        self.end_keys: List[Optional[Tuple[int, ...]]] = []
+        # (node, konteks, karakter) -> (node NFA berikutnya, key yang cocok): state DFA baru
+        # cukup menggabungkan langkah per node yang sebagian besar sudah pernah dihitung
+        self.node_steps: Dict[Tuple[int, Tuple[bool, bool, bool, bool], str],
+                              Tuple[Tuple[int, ...], Tuple[int, ...]]] = {}
+        self.add((), False, True)  # state 0: awal pesan
+
+    def add(self, nodes: Tuple[int, ...], prev_word: bool, at_start: bool) -> int:
+        key = (nodes, prev_word, at_start)
+        state = self.index.get(key)
+        if state is None:
+            state = self.index[key] = len(self.nodes)
+            self.nodes.append(nodes)
+            self.prev_word.append(prev_word)
+            self.at_start.append(at_start)
+            self.transitions.append({})
+            self.end_keys.append(None)
+        return state
+
+
+class LinearPatternSet:
+    """
+    Pengganti CompiledPatternSet.match dengan jaminan waktu linear terhadap panjang pesan.
+    Hasil match() sama dengan "key yang minimal satu polanya cocok lewat re.search".
+    """
+
+    def __init__(self, patterns_by_key: Dict[Hashable, List[str]], flags: int = re.IGNORECASE):
+        self.flags = flags
+        builder = _NFABuilder()
+        starts = []
+        # Node _MATCH menyimpan indeks key di list ini
+        self._keys: List[Hashable] = list(patterns_by_key)
+        # key -> regex untuk pola di luar subset (dicocokkan dengan modul re)
+        self.fallback_patterns: Dict[Hashable, List[re.Pattern]] = {}
+        for key_index, (key, patterns) in enumerate(patterns_by_key.items()):
+            for pattern in patterns:
+                try:
+                    starts.append(builder.pattern(pattern, flags, key_index))
+                except UnsupportedPattern:
+                    self.fallback_patterns.setdefault(key, []).append(re.compile(pattern, flags))
+
+        self._kinds = builder.kinds
+        self._args = builder.args
+        self._start = builder.node(_SPLIT, starts)
+        self._reset_cache()
+
+    def __getstate__(self):
+        # Cache DFA dan lock tidak ikut di-pickle (snapshot), dibangun ulang saat dipakai
+        state = self.__dict__.copy()
+        for name in ('_lock', '_tables', '_closures'):
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._reset_cache()
+
+    def _reset_cache(self):
+        self._lock = threading.Lock()
+        # (node, konteks) -> closure node itu; konteks = (prev_word, next_word, at_start, at_end).
+        # Ukurannya dibatasi jumlah node NFA x 16 konteks
+        self._closures: Dict[Tuple[int, Tuple[bool, bool, bool, bool]], Tuple[Tuple[int, ...], Tuple[int, ...]]] = {}
+        self._tables = _DFATables()
+
+    @property
+    def cached_states(self) -> int:
+        return len(self._tables.nodes)
+
+    def _closure(self, node: int, context: Tuple[bool, bool, bool, bool]) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+        """Node _CHAR yang terjangkau dari node lewat epsilon dan key yang cocok di posisi ini"""
+        closure = self._closures.get((node, context))
+        if closure is not None:
+            return closure
+
+        kinds, args = self._kinds, self._args
+        prev_word, next_word, at_start, at_end = context
+        char_nodes: List[int] = []
+        keys: Set[int] = set()
+        seen: Set[int] = set()
+        stack = [node]
+        while stack:
+            node_id = stack.pop()
+            if node_id in seen:
+                continue
+            seen.add(node_id)
+            kind = kinds[node_id]
+            if kind == _CHAR:
+                char_nodes.append(node_id)
+            elif kind == _SPLIT:
+                stack.extend(args[node_id])
+            elif kind == _MATCH:
+                keys.add(args[node_id])
+            else:
+                assertion, next_node = args[node_id]
+                if assertion == 'boundary':
+                    holds = prev_word != next_word
+                elif assertion == 'non_boundary':
+                    holds = prev_word == next_word
+                elif assertion == 'start':
+                    holds = at_start
+                else:  # 'end'
+                    holds = at_end
+                if holds:
+                    stack.append(next_node)
+
+        closure = self._closures[(node, context)] = (tuple(char_nodes), tuple(sorted(keys)))
+        return closure
+
+    def _node_step(self, tables: _DFATables, node: int, context: Tuple[bool, bool, bool, bool],
+                   char: str) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+        step = tables.node_steps.get((node, context, char))
+        if step is None:
+            args = self._args
+            code = ord(char)
+            lower = _sre.unicode_tolower(code)
+            char_nodes, keys = self._closure(node, context)
+            following = tuple(args[n][1] for n in char_nodes if args[n][0].accepts(code, lower))
+            step = tables.node_steps[(node, context, char)] = (following, keys)
+        return step
+
+    def _step(self, tables: _DFATables, state: int, char: str) -> Tuple[int, Tuple[int, ...]]:
+        with self._lock:
+            cached = tables.transitions[state].get(char)
+            if cached is not None:
+                return cached
+            next_word = is_word_char(char)
+            context = (tables.prev_word[state], next_word, tables.at_start[state], False)
+            following: Set[int] = set()
+            keys: Set[int] = set()
+            # Awal pola baru dicoba di setiap posisi
+            for node in (self._start,) + tables.nodes[state]:
+                node_following, node_keys = self._node_step(tables, node, context, char)
+                following.update(node_following)
+                keys.update(node_keys)
+
+            if len(tables.nodes) >= MAX_DFA_STATES or len(tables.node_steps) >= MAX_NODE_STEPS:
+                # Pencocokan berikutnya memakai cache baru; yang sedang berjalan tetap memakai
+                # tabel lama sampai selesai, lalu tabel itu dibuang
+                self._tables = _DFATables()
+            result = (tables.add(tuple(sorted(following)), next_word, False), tuple(sorted(keys)))
+            tables.transitions[state][char] = result
+            return result
+
+    def _end_keys(self, tables: _DFATables, state: int) -> Tuple[int, ...]:
+        keys = tables.end_keys[state]
+        if keys is None:
+            with self._lock:
+                context = (tables.prev_word[state], False, tables.at_start[state], True)
+                end_keys: Set[int] = set()
+                for node in (self._start,) + tables.nodes[state]:
+                    end_keys.update(self._closure(node, context)[1])
+                keys = tables.end_keys[state] = tuple(sorted(end_keys))
+        return keys
+
+    def match(self, message: str, deadline: Optional[float] = None) -> Tuple[FrozenSet[Hashable], bool]:
+        """
+        (key yang cocok, selesai). Jika deadline (perf_counter) terlewati, pencocokan
+        berhenti dan mengembalikan key yang sudah ditemukan dengan selesai=False.
+        """
+        tables = self._tables
+        transitions = tables.transitions
+        found: Set[int] = set()
+        state = 0
+        complete = True
+        for position, char in enumerate(message):
+            step = transitions[state].get(char)
+            if step is None:
+                step = self._step(tables, state, char)
+            state, keys = step
+            if keys:
+                found.update(keys)
+            if deadline is not None and not position & 63 and perf_counter() > deadline:
+                complete = False
+                break
+        else:
+            found.update(self._end_keys(tables, state))
+
+        matched = {self._keys[key_index] for key_index in found}
+        if not complete:
+            return frozenset(matched), False
+
+        for key, patterns in self.fallback_patterns.items():
+            if key in matched:
+                continue
+            if deadline is not None and perf_counter() > deadline:
+                return frozenset(matched), False
+            if any(pattern.search(message) for pattern in patterns):
+                matched.add(key)
+        return frozenset(matched), True
@@ -0,0 +1,359 @@
+"""
+Backend klasifikasi alternatif: model linear multinomial (softmax) di atas
+fitur n-gram yang di-hash, dilatih dengan NumPy dari korpus JSONL berlabel.
+Bobotnya dipelajari dari data, bukan diatur manual seperti 'weight' dan
+pembagi /20.0 di IntentClassifier.
+
+Format korpus (satu objek per baris, boleh .jsonl.gz):
+    {"message": "apa itu ekonomi sirkular?", "intent": "ce_definition"}
+
+Latih dan ekspor bobot (butuh: pip install numpy):
+    python -m api.linear_model train korpus.jsonl api/rules/linear_model.npz
+Pakai di API: CLASSIFIER_BACKEND=linear (lihat config.py).
+
+Hanya baris bobot untuk fitur yang muncul saat training yang disimpan, dan
+inferensi adalah dot product sparse: jumlah baris bobot milik fitur pesan.
+"""
+
+import argparse
+import gzip
+import json
+import os
+import sys
+from time import perf_counter
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+from zlib import crc32
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - tergantung environment
+    np = None
+
+try:
+    from .chatbot_logic import Intent
+    from .normalization import NormalizedMessage, normalize_message
+except ImportError:
+    # Dijalankan langsung dari folder api/
+    from chatbot_logic import Intent
+    from normalization import NormalizedMessage, normalize_message
+
+FORMAT_VERSION = 1
+
+
+class HashedFeatures:
+    """
+    Fitur n-gram yang di-hash (crc32, stabil antar proses) ke n_features kolom:
+    kata, pasangan kata berurutan dan n-gram karakter per kata (tahan typo).
+    Nilai fitur biner (ada/tidak) dikali 1/akar pangkat 4 jumlah fitur pesan,
+    agar pesan panjang penuh kata filler tidak menenggelamkan fitur penting.
+    """
+
+    def __init__(self, n_features: int = 1 << 18, char_ngrams: Tuple[int, ...] = (3, 4),
+                 cache_size: int = 50000):
+        self.n_features = n_features
+        self.char_ngrams = tuple(char_ngrams)
+        self.cache_size = cache_size
+        # token -> kolom fitur kata + n-gram karakternya (kosakata pesan relatif kecil)
+        self._token_columns: Dict[str, Tuple[int, ...]] = {}
+
+    def _column(self, key: str) -> int:
+        return crc32(key.encode('utf-8')) % self.n_features
+
+    def _columns_for_token(self, token: str) -> Tuple[int, ...]:
+        columns = self._token_columns.get(token)
+        if columns is None:
+            padded = f"<{token}>"
+            keys = ["w:" + token]
+            for n in self.char_ngrams:
+                keys.extend("c:" + padded[start:start + n] for start in range(len(padded) - n + 1))
+            columns = tuple(self._column(key) for key in keys)
+            if len(self._token_columns) < self.cache_size:
+                self._token_columns[token] = columns
+        return columns
+
+    def counts(self, tokens: Sequence[str]) -> Dict[int, float]:
+        """Kolom fitur -> jumlah kemunculan"""
+        counts: Dict[int, float] = {}
+        previous = None
+        for token in tokens:
+            for column in self._columns_for_token(token):
+                counts[column] = counts.get(column, 0.0) + 1.0
+            if previous is not None:
+                column = self._column(f"b:{previous} {token}")
+                counts[column] = counts.get(column, 0.0) + 1.0
+            previous = token
+        return counts
+
+    def transform(self, tokens: Sequence[str]) -> Tuple[List[int], List[float]]:
+        """(kolom, nilai) fitur satu pesan"""
+        columns = list(self.counts(tokens))
+        if not columns:
+            return [], []
+        return columns, [len(columns) ** -0.25] * len(columns)
+
+    def transform_many(self, token_lists: Iterable[Sequence[str]]):
+        """Matriks fitur CSR (indptr, indices, data) untuk banyak pesan"""
+        indptr = [0]
+        indices: List[int] = []
+        data: List[float] = []
+        for tokens in token_lists:
+            columns, values = self.transform(tokens)
+            indices.extend(columns)
+            data.extend(values)
+            indptr.append(len(indices))
+        return (np.asarray(indptr, dtype=np.int64), np.asarray(indices, dtype=np.int64),
+                np.asarray(data, dtype=np.float64))
+
+
+def _softmax(logits: "np.ndarray") -> "np.ndarray":
+    logits = logits - logits.max(axis=-1, keepdims=True)
+    exp = np.exp(logits)
+    return exp / exp.sum(axis=-1, keepdims=True)
+
+
+class LinearIntentModel:
+    """
+    Model softmax: skor kelas = sum(nilai_fitur * bobot[baris_fitur]) + bias.
+    rows menyimpan kolom fitur (terurut) yang punya baris di weights.
+    """
+
+    def __init__(self, labels: List[str], rows: "np.ndarray", weights: "np.ndarray", bias: "np.ndarray",
+                 features: HashedFeatures):
+        if np is None:
+            raise ImportError("LinearIntentModel membutuhkan numpy (pip install numpy)")
+        self.labels = list(labels)
+        self.rows = rows
+        self.weights = weights
+        self.bias = bias
+        self.features = features
+
+    @classmethod
+    def train(cls, token_lists: List[Sequence[str]], labels: List[str],
+              features: Optional[HashedFeatures] = None, epochs: int = 60,
+              learning_rate: float = 0.2, l2: float = 1e-5, verbose: bool = False) -> "LinearIntentModel":
+        """Latih regresi logistik multinomial (full-batch Adam) pada pesan yang sudah ditokenisasi"""
+        if np is None:
+            raise ImportError("LinearIntentModel membutuhkan numpy (pip install numpy)")
+        features = features or HashedFeatures()
+        classes = sorted(set(labels))
+        class_index = {label: i for i, label in enumerate(classes)}
+        y = np.asarray([class_index[label] for label in labels], dtype=np.int64)
+        n_samples, n_classes = len(y), len(classes)
+
+        indptr, indices, data = features.transform_many(token_lists)
+        # Kolom hash -> baris padat, hanya untuk fitur yang muncul di korpus
+        rows, columns = np.unique(indices, return_inverse=True)
+        sample_of_entry = np.repeat(np.arange(n_samples), np.diff(indptr))
+
+        weights = np.zeros((len(rows), n_classes), dtype=np.float64)
+        bias = np.zeros(n_classes, dtype=np.float64)
+        one_hot = np.zeros((n_samples, n_classes), dtype=np.float64)
+        one_hot[np.arange(n_samples), y] = 1.0
+
+        # State Adam
+        m_w, v_w = np.zeros_like(weights), np.zeros_like(weights)
+        m_b, v_b = np.zeros_like(bias), np.zeros_like(bias)
+        beta1, beta2, eps = 0.9, 0.999, 1e-8
+
+        for epoch in range(1, epochs + 1):
+            contributions = data[:, None] * weights[columns]
+            logits = np.empty((n_samples, n_classes), dtype=np.float64)
+            for c in range(n_classes):
+                logits[:, c] = np.bincount(sample_of_entry, weights=contributions[:, c], minlength=n_samples)
+            logits += bias
+            probabilities = _softmax(logits)
+
+            error = (probabilities - one_hot) / n_samples
+            grad_w = np.empty_like(weights)
+            entry_error = error[sample_of_entry] * data[:, None]
+            for c in range(n_classes):
+                grad_w[:, c] = np.bincount(columns, weights=entry_error[:, c], minlength=len(rows))
+            grad_w += l2 * weights
+            grad_b = error.sum(axis=0)
+
+            m_w = beta1 * m_w + (1 - beta1) * grad_w
+            v_w = beta2 * v_w + (1 - beta2) * grad_w * grad_w
+            m_b = beta1 * m_b + (1 - beta1) * grad_b
+            v_b = beta2 * v_b + (1 - beta2) * grad_b * grad_b
+            correction1, correction2 = 1 - beta1 ** epoch, 1 - beta2 ** epoch
+            weights -= learning_rate * (m_w / correction1) / (np.sqrt(v_w / correction2) + eps)
+            bias -= learning_rate * (m_b / correction1) / (np.sqrt(v_b / correction2) + eps)
+
+            if verbose and (epoch % 10 == 0 or epoch == epochs):
+                loss = -np.log(probabilities[np.arange(n_samples), y] + 1e-12).mean()
+                accuracy = (probabilities.argmax(axis=1) == y).mean()
+                print(f"  epoch {epoch:3d} | loss {loss:.4f} | akurasi train {accuracy:.2%}")
+
+        return cls(classes, rows.astype(np.int64), weights.astype(np.float32), bias.astype(np.float32), features)
+
+    def _lookup(self, columns: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
+        """(posisi baris bobot, mask fitur yang dikenal) untuk kolom-kolom hash"""
+        positions = np.searchsorted(self.rows, columns)
+        positions = np.minimum(positions, len(self.rows) - 1)
+        return positions, self.rows[positions] == columns
+
+    def predict_proba(self, tokens: Sequence[str]) -> Optional["np.ndarray"]:
+        """Probabilitas tiap label, None jika pesan tidak punya satu pun fitur yang dikenal"""
+        columns, values = self.features.transform(tokens)
+        if not columns:
+            return None
+        positions, known = self._lookup(np.asarray(columns, dtype=np.int64))
+        if not known.any():
+            return None
+        values = np.asarray(values, dtype=np.float32)[known]
+        logits = values @ self.weights[positions[known]] + self.bias
+        return _softmax(logits)
+
+    def predict_proba_many(self, token_lists: List[Sequence[str]]) -> Tuple["np.ndarray", "np.ndarray"]:
+        """(probabilitas [n, label], mask pesan yang punya fitur dikenal) untuk banyak pesan"""
+        indptr, indices, data = self.features.transform_many(token_lists)
+        n_samples = len(indptr) - 1
+        logits = np.zeros((n_samples, len(self.labels)), dtype=np.float32)
+        has_feature = np.zeros(n_samples, dtype=bool)
+        if len(indices):
+            positions, known = self._lookup(indices)
+            samples = np.repeat(np.arange(n_samples), np.diff(indptr))[known]
+            contributions = data[known, None] * self.weights[positions[known]]
+            for c in range(len(self.labels)):
+                logits[:, c] = np.bincount(samples, weights=contributions[:, c], minlength=n_samples)
+            has_feature[samples] = True
+        return _softmax(logits + self.bias), has_feature
+
+    def save(self, path: str):
+        """Ekspor bobot ke file .npz terkompresi"""
+        np.savez_compressed(
+            path,
+            format_version=np.int32(FORMAT_VERSION),
+            labels=np.asarray(self.labels),
+            rows=self.rows.astype(np.uint32),
+            weights=self.weights.astype(np.float32),
+            bias=self.bias.astype(np.float32),
+            n_features=np.int64(self.features.n_features),
+            char_ngrams=np.asarray(self.features.char_ngrams, dtype=np.int32),
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "LinearIntentModel":
+        if np is None:
+            raise ImportError("LinearIntentModel membutuhkan numpy (pip install numpy)")
+        with np.load(path, allow_pickle=False) as archive:
+            version = int(archive['format_version'])
+            if version != FORMAT_VERSION:
+                raise ValueError(f"Versi model {version} tidak didukung (harus {FORMAT_VERSION})")
+            features = HashedFeatures(int(archive['n_features']), tuple(int(n) for n in archive['char_ngrams']))
+            return cls([str(label) for label in archive['labels']], archive['rows'].astype(np.int64),
+                       archive['weights'], archive['bias'], features)
+
+
+class LinearIntentClassifier:
+    """
+    Pengganti IntentClassifier untuk CircularEconomyBot (CLASSIFIER_BACKEND=linear).
+    Confidence = probabilitas softmax intent terbaik. Pesan tanpa fitur yang
+    dikenal model menjadi UNKNOWN. Konteks session (previous_intent) diabaikan.
+    """
+
+    def __init__(self, model: LinearIntentModel):
+        self.model = model
+        self._intents = [Intent(label) for label in model.labels]
+
+    @classmethod
+    def load(cls, path: str) -> "LinearIntentClassifier":
+        return cls(LinearIntentModel.load(path))
+
+    def normalize(self, message: Union[str, NormalizedMessage]) -> NormalizedMessage:
+        return normalize_message(message)
+
+    def classify(self, message: Union[str, NormalizedMessage],
+                 timings: Optional[Dict[str, float]] = None,
+                 previous_intent: Optional[Intent] = None) -> Tuple[Intent, float]:
+        """Returns: (intent, confidence_score), sama seperti IntentClassifier.classify"""
+        if timings is None:
+            message = normalize_message(message)
+            probabilities = self.model.predict_proba(message.tokens) if message.text else None
+        else:
+            start = perf_counter()
+            message = normalize_message(message)
+            normalized_at = perf_counter()
+            probabilities = self.model.predict_proba(message.tokens) if message.text else None
+            timings['normalize'] = normalized_at - start
+            timings['linear_score'] = perf_counter() - normalized_at
+
+        if probabilities is None:
+            return Intent.UNKNOWN, 0.0
+        best = int(probabilities.argmax())
+        return self._intents[best], float(probabilities[best])
+
+    def classify_with_status(self, message: Union[str, NormalizedMessage],
+                             timings: Optional[Dict[str, float]] = None,
+                             previous_intent: Optional[Intent] = None) -> Tuple[Intent, float, bool]:
+        """Sama seperti IntentClassifier.classify_with_status; model linear selalu selesai"""
+        return self.classify(message, timings, previous_intent) + (True,)
+
+    def classify_batch(self, messages: List[Union[str, NormalizedMessage]],
+                       vectorized: bool = False) -> List[Tuple[Intent, float]]:
+        """Klasifikasi banyak pesan dalam satu operasi matriks (vectorized selalu aktif)"""
+        normalized = [normalize_message(message) for message in messages]
+        probabilities, has_feature = self.model.predict_proba_many([message.tokens for message in normalized])
+        best = probabilities.argmax(axis=1)
+        return [
+            (self._intents[b], float(probabilities[i, b])) if has_feature[i] and message.text
+            else (Intent.UNKNOWN, 0.0)
+            for i, (message, b) in enumerate(zip(normalized, best))
+        ]
+
+
+def iter_labeled(path: str, message_field: str = 'message', label_field: str = 'intent') -> Iterator[Tuple[str, str]]:
+    """(pesan, label) dari korpus JSONL berlabel (boleh .gz); baris tanpa label dilewati"""
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            message, label = record.get(message_field), record.get(label_field)
+            if isinstance(message, str) and isinstance(label, str):
+                yield message, label
+
+
+def train_file(corpus_path: str, output_path: str, epochs: int = 60, n_features: int = 1 << 18,
+               verbose: bool = True) -> LinearIntentModel:
+    """Latih model dari file korpus lalu simpan ke output_path"""
+    valid_labels = {intent.value for intent in Intent}
+    token_lists, labels = [], []
+    for message, label in iter_labeled(corpus_path):
+        if label not in valid_labels:
+            raise ValueError(f"Intent tidak dikenal di korpus: {label!r}")
+        token_lists.append(normalize_message(message).tokens)
+        labels.append(label)
+    if not labels:
+        raise ValueError(f"Korpus kosong: {corpus_path}")
+
+    start = perf_counter()
+    model = LinearIntentModel.train(token_lists, labels, HashedFeatures(n_features), epochs=epochs, verbose=verbose)
+    model.save(output_path)
+    if verbose:
+        print(f"✅ {len(labels):,} pesan, {len(model.labels)} intent, {len(model.rows):,} fitur "
+              f"dalam {perf_counter() - start:.1f} s -> {output_path} ({os.path.getsize(output_path) / 1024:.0f} KB)")
+    return model
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Latih backend classifier linear EcoBuddy")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    train = subparsers.add_parser("train", help="Latih dari korpus JSONL berlabel dan ekspor .npz")
+    train.add_argument("corpus")
+    train.add_argument("output")
+    train.add_argument("--epochs", type=int, default=60)
+    train.add_argument("--features", type=int, default=1 << 18, help="Jumlah kolom hash")
+    args = parser.parse_args(argv)
+
+    try:
+        train_file(args.corpus, args.output, args.epochs, args.features)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+"""
+Mesin pencocokan untuk IntentClassifier.
+Semua pola regex dan keyword diindeks sekali saat classifier dibuat, lalu
+dicocokkan ke pesan dalam satu pass per request.
+"""
+
+import re
+from collections import defaultdict, deque
+from typing import Dict, FrozenSet, Hashable, Iterable, List, Optional, Set, Tuple
+
+try:
+    import re._parser as sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover - Python lama
+    import sre_parse
+
+_REPEATS = tuple(
+    getattr(sre_parse, name) for name in ('MAX_REPEAT', 'MIN_REPEAT', 'POSSESSIVE_REPEAT')
+    if hasattr(sre_parse, name)
+)
+
+
+class CompiledPatternSet:
+    """
+    Gabungan semua pola intent dalam satu regex yang sudah dikompilasi.
+
+    Setiap grup intent dibungkus lookahead opsional yang di-anchor di awal pesan:
+        ^(?=(?:[\\s\\S]*?(?P<g0>pola_a|pola_b))?)(?=(?:[\\s\\S]*?(?P<g1>...))?)...
+    Satu kali `match()` mencoba setiap grup di semua posisi (sama seperti
+    `re.search`) dan grup bernama yang terisi menunjukkan intent yang cocok.
+    """
+
+    def __init__(self, patterns_by_key: Dict[Hashable, List[str]], flags: int = re.IGNORECASE):
+        self.flags = flags
+        self._group_keys: Dict[str, Hashable] = {}
+        self._compiled: Dict[str, re.Pattern] = {}
+        # key -> alternation semua polanya (dikompilasi setelah regex gabungan valid)
+        self._by_key: Dict[Hashable, re.Pattern] = {}
+
+        lookaheads = []
+        for index, (key, patterns) in enumerate(patterns_by_key.items()):
+            if not patterns:
+                continue
+            group = f"g{index}"
+            self._group_keys[group] = key
+            alternation = "|".join(f"(?:{pattern})" for pattern in patterns)
+            lookaheads.append(f"(?=(?:[\\s\\S]*?(?P<{group}>{alternation}))?)")
+            self._by_key[key] = alternation
+
+        try:
+            self._combined = re.compile("^" + "".join(lookaheads), flags)
+        except re.error:
+            # Kompilasi tiap pola terpisah agar error menunjuk pola yang salah
+            for patterns in patterns_by_key.values():
+                for pattern in patterns:
+                    self.compile(pattern)
+            raise
+        self._by_key = {key: re.compile(alternation, flags) for key, alternation in self._by_key.items()}
+
+    def compile(self, pattern: str) -> re.Pattern:
+        """Ambil regex terkompilasi untuk satu pola (dikompilasi saat pertama dipakai)"""
+        compiled = self._compiled.get(pattern)
+        if compiled is None:
+            compiled = re.compile(pattern, self.flags)
+            self._compiled[pattern] = compiled
+        return compiled
+
+    def match(self, message: str) -> FrozenSet[Hashable]:
+        """Kembalikan semua key (intent) yang minimal satu polanya cocok dengan pesan"""
+        groups = self._combined.match(message).groupdict()
+        return frozenset(
+            self._group_keys[group]
+            for group, value in groups.items()
+            if value is not None
+        )
+
+    def match_keys(self, message: str, keys: Iterable[Hashable]) -> FrozenSet[Hashable]:
+        """Seperti match(), tetapi hanya mencoba pola milik keys (kandidat dari CandidateIndex)"""
+        by_key = self._by_key
+        return frozenset(
+            key for key in keys
+            if key in by_key and by_key[key].search(message) is not None
+        )
+
+
+def required_literals(pattern: str, flags: int = re.IGNORECASE) -> Optional[FrozenSet[str]]:
+    """
+    Literal yang minimal satu di antaranya pasti muncul di setiap teks yang
+    cocok dengan pola, mis. r"\\b(sampah|limbah).+(plastik)\\b" -> {"plastik"}.
+    None jika tidak ada jaminan seperti itu (mis. pola hanya berisi kelas karakter).
+    """
+    return _required_literals(sre_parse.parse(pattern, flags), bool(flags & re.IGNORECASE))
+
+
+def _required_literals(items, ignore_case: bool) -> Optional[FrozenSet[str]]:
+    """Pilih himpunan literal wajib paling selektif dari satu urutan node sre_parse"""
+    best: Optional[FrozenSet[str]] = None
+    run: List[str] = []
+
+    def consider(candidate: Optional[FrozenSet[str]]):
+        nonlocal best
+        if candidate is None:
+            return
+        # Lebih selektif = literal terpendeknya lebih panjang, lalu alternatifnya lebih sedikit
+        rank = (min(map(len, candidate)), -len(candidate))
+        if best is None or rank > (min(map(len, best)), -len(best)):
+            best = candidate
+
+    def flush():
+        if run:
+            literal = "".join(run)
+            consider(frozenset([literal.lower() if ignore_case else literal]))
+            run.clear()
+
+    for op, value in items:
+        if op is sre_parse.LITERAL:
+            run.append(chr(value))
+            continue
+        flush()
+        if op is sre_parse.SUBPATTERN:
+            consider(_required_literals(value[-1], ignore_case))
+        elif op is sre_parse.BRANCH:
+            branches = [_required_literals(branch, ignore_case) for branch in value[1]]
+            if all(branch is not None for branch in branches):
+                consider(frozenset().union(*branches))
+        elif op in _REPEATS:
+            minimum, _, item = value
+            if minimum >= 1:
+                consider(_required_literals(item, ignore_case))
+    flush()
+    return best
+
+
+class KeywordAutomaton:
+    """Automaton Aho-Corasick: satu kali scan untuk menemukan semua term sebagai substring"""
+
+    def __init__(self, terms: List[str]):
+        self.terms = list(terms)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Tuple[int, ...]] = [()]
+
+        for term_id, term in enumerate(self.terms):
+            if term:
+                self._insert(term, term_id)
+        self._build_failure_links()
+
+    @classmethod
+    def from_tables(cls, terms: List[str], goto: List[Dict[str, int]],
+                    fail: List[int], output: List[Tuple[int, ...]]) -> "KeywordAutomaton":
+        """Pulihkan automaton dari tabel yang sudah dibangun (lihat tables() dan rulepack.py)"""
+        automaton = cls.__new__(cls)
+        automaton.terms = list(terms)
+        automaton._goto, automaton._fail, automaton._output = goto, fail, output
+        return automaton
+
+    def tables(self) -> Tuple[List[Dict[str, int]], List[int], List[Tuple[int, ...]]]:
+        """Tabel transisi (goto), failure link dan output per node"""
+        return self._goto, self._fail, self._output
+
+    def _insert(self, term: str, term_id: int):
+        node = 0
+        for char in term:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            node = next_node
+        self._output[node] += (term_id,)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                # Term yang berakhir di suffix node ini juga ikut ditemukan
+                self._output[child] += self._output[self._fail[child]]
+
+    def find(self, text: str) -> Set[int]:
+        """Kembalikan id semua term yang muncul di dalam teks"""
+        goto, fail, output = self._goto, self._fail, self._output
+        found: Set[int] = set()
+        node = 0
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if output[node]:
+                found.update(output[node])
+        return found
+
+
+class KeywordIndex:
+    """
+    Indeks keyword untuk semua intent sekaligus.
+
+    Menghasilkan skor yang sama persis dengan IntentClassifier._calculate_keyword_score:
+    - keyword ditemukan utuh di pesan  -> jumlah_kata * 2.0
+    - selain itu, tiap kata keyword yang ada di token pesan -> 0.5
+
+    Skor partial semua keyword dihitung dari token pesan lewat indeks kata -> intent,
+    lalu dikoreksi hanya untuk keyword yang ditemukan utuh oleh automaton.
+    Biaya per pesan tidak bergantung pada jumlah keyword.
+    """
+
+    def __init__(self, keywords_by_key: Dict[Hashable, List[str]]):
+        term_ids: Dict[str, int] = {}
+        # term_id -> [(key, skor_utuh, kata-kata keyword)]
+        self.term_entries: List[List[Tuple[Hashable, float, List[str]]]] = []
+        # kata -> {key: jumlah kemunculan kata di keyword-keyword milik key}
+        self.word_index: Dict[str, Dict[Hashable, int]] = defaultdict(dict)
+
+        for key, keywords in keywords_by_key.items():
+            for keyword in keywords:
+                keyword_words = keyword.split()
+                if not keyword_words:
+                    continue
+
+                term_id = term_ids.get(keyword)
+                if term_id is None:
+                    term_id = term_ids[keyword] = len(self.term_entries)
+                    self.term_entries.append([])
+                self.term_entries[term_id].append((key, len(keyword_words) * 2.0, keyword_words))
+
+                for word in keyword_words:
+                    counts = self.word_index[word]
+                    counts[key] = counts.get(key, 0) + 1
+
+        self.word_index = dict(self.word_index)
+        self.automaton = KeywordAutomaton(list(term_ids))
+
+    @classmethod
+    def from_tables(cls, term_entries: List[List[Tuple[Hashable, float, List[str]]]],
+                    word_index: Dict[str, Dict[Hashable, int]], automaton: KeywordAutomaton) -> "KeywordIndex":
+        """Pulihkan indeks dari tabel yang sudah dibangun tanpa mengindeks ulang keyword"""
+        index = cls.__new__(cls)
+        index.term_entries, index.word_index, index.automaton = term_entries, word_index, automaton
+        return index
+
+    def score(self, message: str, tokens: Optional[Set[str]] = None) -> Dict[Hashable, float]:
+        """Hitung skor keyword (belum dikali weight) untuk semua key yang skornya > 0"""
+        if tokens is None:
+            tokens = set(message.split())
+
+        scores: Dict[Hashable, float] = defaultdict(float)
+
+        # Skor partial untuk semua keyword seolah-olah tidak ada yang cocok utuh
+        word_index = self.word_index
+        for token in tokens:
+            counts = word_index.get(token)
+            if counts:
+                for key, count in counts.items():
+                    scores[key] += count * 0.5
+
+        # Keyword yang cocok utuh: ganti skor partial-nya dengan skor utuh
+        for term_id in self.automaton.find(message):
+            for key, full_score, keyword_words in self.term_entries[term_id]:
+                partial = sum(0.5 for word in keyword_words if word in tokens)
+                scores[key] += full_score - partial
+
+        return scores
+
+
+class CandidateIndex:
+    """
+    Indeks literal wajib -> key untuk memangkas intent yang polanya pasti tidak cocok.
+
+    Setiap pola menyumbang literal wajibnya (required_literals); semua literal
+    dicari dalam satu scan Aho-Corasick, jadi biaya per pesan bergantung pada
+    jumlah intent yang literalnya muncul, bukan jumlah seluruh intent.
+    Key dengan pola tanpa literal wajib selalu menjadi kandidat.
+    """
+
+    def __init__(self, patterns_by_key: Dict[Hashable, List[str]], flags: int = re.IGNORECASE):
+        literal_ids: Dict[str, int] = {}
+        # literal_id -> key yang memiliki literal tersebut
+        self.literal_keys: List[Set[Hashable]] = []
+        always: Set[Hashable] = set()
+
+        for key, patterns in patterns_by_key.items():
+            for pattern in patterns:
+                literals = required_literals(pattern, flags)
+                if literals is None:
+                    always.add(key)
+                    continue
+                for literal in literals:
+                    literal_id = literal_ids.get(literal)
+                    if literal_id is None:
+                        literal_id = literal_ids[literal] = len(self.literal_keys)
+                        self.literal_keys.append(set())
+                    self.literal_keys[literal_id].add(key)
+
+        self.always: FrozenSet[Hashable] = frozenset(always)
+        self.automaton = KeywordAutomaton(list(literal_ids))
+
+    def candidates(self, message: str) -> Set[Hashable]:
+        """Key yang minimal satu polanya mungkin cocok dengan pesan"""
+        found = set(self.always)
+        literal_keys = self.literal_keys
+        for literal_id in self.automaton.find(message):
+            found.update(literal_keys[literal_id])
+        return found
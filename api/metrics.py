@@ -0,0 +1,185 @@
+"""
+Instrumentasi latency per tahap untuk /api/chat.
+Timing tiap tahap dikumpulkan ke dict per request, dikirim sebagai header
+`Server-Timing`, dan diagregasi ke counter & histogram format Prometheus
+yang dibaca lewat /api/metrics.
+
+Jika METRICS_ENABLED=0, handler tidak membuat dict timing sama sekali sehingga
+biaya di hot path hanya pengecekan `timings is not None`.
+"""
+
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from .config import METRICS_ENABLED
+except ImportError:
+    # Dijalankan langsung dari folder api/
+    from config import METRICS_ENABLED
+
+# Batas bucket histogram (detik)
+LATENCY_BUCKETS = (
+    0.000005, 0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0,
+)
+
+# Urutan tahap di header Server-Timing
+STAGES = ('parse', 'normalize', 'pattern_match', 'keyword_score', 'kb_lookup', 'serialize')
+
+
+class Histogram:
+    """Histogram kumulatif ala Prometheus (tidak thread-safe, dikunci oleh registry)"""
+    __slots__ = ('counts', 'total', 'count')
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def render(self, name: str, labels: str) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS + (float('inf'),), self.counts):
+            cumulative += count
+            le = "+Inf" if bound == float('inf') else repr(bound)
+            lines.append(f'{name}_bucket{{{labels},le="{le}"}} {cumulative}')
+        lines.append(f'{name}_sum{{{labels}}} {self.total}')
+        lines.append(f'{name}_count{{{labels}}} {self.count}')
+        return lines
+
+
+class MetricsRegistry:
+    """Counter dan histogram latency per tahap dan per intent"""
+
+    def __init__(self, enabled: bool = METRICS_ENABLED):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._stages: Dict[str, Histogram] = {}
+        self._intents: Dict[str, Histogram] = {}
+        self._requests: Dict[Tuple[str, int], int] = {}
+        self._fallbacks = 0
+
+    def new_timings(self) -> Optional[Dict[str, float]]:
+        """Dict timing untuk satu request, atau None jika instrumentasi mati"""
+        return {} if self.enabled else None
+
+    def record_request(self, route: str, status: int, timings: Dict[str, float],
+                       intent: Optional[str] = None, fallback_used: bool = False):
+        """Simpan timing satu request ke histogram"""
+        total = sum(timings.values())
+        with self._lock:
+            for stage, seconds in timings.items():
+                histogram = self._stages.get(stage)
+                if histogram is None:
+                    histogram = self._stages[stage] = Histogram()
+                histogram.observe(seconds)
+
+            if intent is not None:
+                histogram = self._intents.get(intent)
+                if histogram is None:
+                    histogram = self._intents[intent] = Histogram()
+                histogram.observe(total)
+
+            key = (route, status)
+            self._requests[key] = self._requests.get(key, 0) + 1
+            if fallback_used:
+                self._fallbacks += 1
+
+    def render(self, cache_stats: Optional[Dict[str, int]] = None,
+               admission_stats: Optional[Dict[str, int]] = None,
+               session_stats: Optional[Dict[str, int]] = None,
+               classifier_stats: Optional[Dict[str, int]] = None,
+               interaction_log_stats: Optional[Dict[str, int]] = None) -> str:
+        """Semua metrik dalam format teks Prometheus (exposition format 0.0.4)"""
+        lines = []
+        with self._lock:
+            lines.append("# HELP ecobuddy_requests_total Jumlah request per route dan status")
+            lines.append("# TYPE ecobuddy_requests_total counter")
+            for (route, status), count in sorted(self._requests.items()):
+                lines.append(f'ecobuddy_requests_total{{route="{route}",status="{status}"}} {count}')
+
+            lines.append("# HELP ecobuddy_fallback_total Jumlah respons dari _get_fallback_response")
+            lines.append("# TYPE ecobuddy_fallback_total counter")
+            lines.append(f"ecobuddy_fallback_total {self._fallbacks}")
+
+            lines.append("# HELP ecobuddy_stage_duration_seconds Latency per tahap pemrosesan")
+            lines.append("# TYPE ecobuddy_stage_duration_seconds histogram")
+            for stage, histogram in sorted(self._stages.items()):
+                lines.extend(histogram.render("ecobuddy_stage_duration_seconds", f'stage="{stage}"'))
+
+            lines.append("# HELP ecobuddy_intent_duration_seconds Latency total request per intent")
+            lines.append("# TYPE ecobuddy_intent_duration_seconds histogram")
+            for intent, histogram in sorted(self._intents.items()):
+                lines.extend(histogram.render("ecobuddy_intent_duration_seconds", f'intent="{intent}"'))
+
+        if cache_stats:
+            for name in ('hits', 'misses', 'evictions', 'expirations', 'coalesced'):
+                lines.append(f"# TYPE ecobuddy_response_cache_{name}_total counter")
+                lines.append(f"ecobuddy_response_cache_{name}_total {cache_stats[name]}")
+            lines.append("# TYPE ecobuddy_response_cache_size gauge")
+            lines.append(f"ecobuddy_response_cache_size {cache_stats['size']}")
+
+        if admission_stats:
+            lines.append("# HELP ecobuddy_admission_in_flight Request /api/chat yang sedang diproses")
+            lines.append("# TYPE ecobuddy_admission_in_flight gauge")
+            lines.append(f"ecobuddy_admission_in_flight {admission_stats['in_flight']}")
+            lines.append("# HELP ecobuddy_admission_queue_depth Request yang menunggu slot")
+            lines.append("# TYPE ecobuddy_admission_queue_depth gauge")
+            lines.append(f"ecobuddy_admission_queue_depth {admission_stats['queue_depth']}")
+            lines.append("# TYPE ecobuddy_admission_admitted_total counter")
+            lines.append(f"ecobuddy_admission_admitted_total {admission_stats['admitted']}")
+            lines.append("# HELP ecobuddy_admission_rejected_total Request yang ditolak per alasan")
+            lines.append("# TYPE ecobuddy_admission_rejected_total counter")
+            for reason in ('queue_full', 'timeout', 'rate_limited'):
+                lines.append(f'ecobuddy_admission_rejected_total{{reason="{reason}"}} '
+                             f"{admission_stats.get(f'rejected_{reason}', 0)}")
+            lines.append("# HELP ecobuddy_admission_shed_cached_total Request ditolak yang tetap dijawab dari cache")
+            lines.append("# TYPE ecobuddy_admission_shed_cached_total counter")
+            lines.append(f"ecobuddy_admission_shed_cached_total {admission_stats.get('shed_cached', 0)}")
+
+        if session_stats:
+            lines.append("# HELP ecobuddy_sessions Session percakapan yang sedang disimpan")
+            lines.append("# TYPE ecobuddy_sessions gauge")
+            lines.append(f"ecobuddy_sessions {session_stats['sessions']}")
+            lines.append("# HELP ecobuddy_session_bytes Perkiraan memori semua session (byte)")
+            lines.append("# TYPE ecobuddy_session_bytes gauge")
+            lines.append(f"ecobuddy_session_bytes {session_stats['bytes']}")
+            for name in ('evictions', 'expirations'):
+                lines.append(f"# TYPE ecobuddy_session_{name}_total counter")
+                lines.append(f"ecobuddy_session_{name}_total {session_stats[name]}")
+
+        if classifier_stats:
+            lines.append("# HELP ecobuddy_classify_budget_exhausted_total Pesan yang diklasifikasi dari hasil "
+                         "parsial karena batas waktu habis")
+            lines.append("# TYPE ecobuddy_classify_budget_exhausted_total counter")
+            lines.append(f"ecobuddy_classify_budget_exhausted_total {classifier_stats['budget_exhausted']}")
+
+        if interaction_log_stats:
+            lines.append("# HELP ecobuddy_interaction_log_records_total Record log interaksi yang ditulis/dibuang")
+            lines.append("# TYPE ecobuddy_interaction_log_records_total counter")
+            for result in ('written', 'dropped'):
+                lines.append(f'ecobuddy_interaction_log_records_total{{result="{result}"}} '
+                             f"{interaction_log_stats[result]}")
+            lines.append("# TYPE ecobuddy_interaction_log_queue_depth gauge")
+            lines.append(f"ecobuddy_interaction_log_queue_depth {interaction_log_stats['queued']}")
+            lines.append("# TYPE ecobuddy_interaction_log_files_total counter")
+            lines.append(f"ecobuddy_interaction_log_files_total {interaction_log_stats['files']}")
+
+        return "\n".join(lines) + "\n"
+
+
+def server_timing_header(timings: Dict[str, float]) -> str:
+    """Format header Server-Timing (durasi dalam milidetik)"""
+    ordered = [stage for stage in STAGES if stage in timings]
+    ordered += [stage for stage in timings if stage not in STAGES]
+    return ", ".join(f"{stage};dur={timings[stage] * 1000:.3f}" for stage in ordered)
+
+
+# Registry global untuk proses ini
+metrics = MetricsRegistry()
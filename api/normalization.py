@@ -0,0 +1,96 @@
+"""
+Normalisasi pesan yang dilakukan sekali per request.
+Hasilnya (NormalizedMessage) dipakai bersama oleh classifier, fallback
+CircularEconomyBot dan IntentAnalyzer, sehingga lowercase, split dan
+pembersihan tanda baca tidak diulang di setiap tahap.
+"""
+
+import re
+from typing import Dict, FrozenSet, Tuple, Union
+
+# Tanda baca & simbol (termasuk emoji) diganti spasi; huruf/angka Unicode dipertahankan
+_PUNCTUATION = re.compile(r'[^\w\s]+')
+
+# Varian informal/singkatan -> bentuk baku yang dipakai pola & keyword intent.
+# Diganti satu kali (tidak berantai), jadi bentuk baku tidak boleh menjadi key lain
+INFORMAL_VARIANTS: Dict[str, str] = {
+    # bagaimana
+    'gimana': 'bagaimana',
+    'gmn': 'bagaimana',
+    'gmana': 'bagaimana',
+    'bgmn': 'bagaimana',
+    'bagaimanakah': 'bagaimana',
+    # terima kasih
+    'makasih': 'terima kasih',
+    'makasi': 'terima kasih',
+    'mksh': 'terima kasih',
+    'trims': 'terima kasih',
+    'trimakasih': 'terima kasih',
+    'terimakasih': 'terima kasih',
+    'tq': 'terima kasih',
+    'ty': 'thank you',
+    'thanx': 'thanks',
+    # kata tanya & kata umum
+    'apaan': 'apa',
+    'apakah': 'apa',
+    'knp': 'mengapa',
+    'kenapa': 'mengapa',
+    'napa': 'mengapa',
+    'yg': 'yang',
+    'dgn': 'dengan',
+    'utk': 'untuk',
+    'dr': 'dari',
+    'krn': 'karena',
+    'tdk': 'tidak',
+    'gak': 'tidak',
+    'ga': 'tidak',
+    'nggak': 'tidak',
+    'engga': 'tidak',
+    'enggak': 'tidak',
+    'bs': 'bisa',
+    'bsa': 'bisa',
+    'dpt': 'dapat',
+    'sy': 'saya',
+    'jelasin': 'jelaskan',
+    'jelasain': 'jelaskan',
+    'hallo': 'halo',
+    'hay': 'hai',
+}
+
+
+class NormalizedMessage:
+    """
+    Pesan yang sudah dinormalisasi:
+    - lower : lowercase + strip (bentuk lama yang dipakai sebelum normalisasi)
+    - text  : tanpa tanda baca, varian informal diganti bentuk baku, spasi tunggal
+    - tokens / token_set : kata-kata dari `text`
+    """
+    __slots__ = ('raw', 'lower', 'text', 'tokens', 'token_set')
+
+    def __init__(self, raw: str, lower: str, text: str, tokens: Tuple[str, ...]):
+        self.raw = raw
+        self.lower = lower
+        self.text = text
+        self.tokens = tokens
+        self.token_set: FrozenSet[str] = frozenset(tokens)
+
+    def __repr__(self) -> str:
+        return f"NormalizedMessage({self.text!r})"
+
+
+def normalize_message(message: Union[str, NormalizedMessage]) -> NormalizedMessage:
+    """Normalisasi pesan mentah (pesan yang sudah dinormalisasi dikembalikan apa adanya)"""
+    if isinstance(message, NormalizedMessage):
+        return message
+
+    lower = message.lower().strip()
+    tokens = []
+    for token in _PUNCTUATION.sub(' ', lower).split():
+        replacement = INFORMAL_VARIANTS.get(token)
+        if replacement is None:
+            tokens.append(token)
+        else:
+            tokens.extend(replacement.split())
+
+    tokens = tuple(tokens)
+    return NormalizedMessage(message, lower, " ".join(tokens), tokens)
@@ -0,0 +1,219 @@
+"""
+Retrieval BM25 atas isi knowledge base untuk pesan yang confidence-nya rendah.
+Setiap respons EcoBuddyKnowledgeBase dipecah per bagian (paragraf), lalu
+diindeks dalam inverted index kecil. Bobot BM25 tiap posting dihitung saat
+build sehingga query cukup menjumlahkan bobot posting dari token pesan.
+Index dibangun ulang otomatis jika isi knowledge base berubah.
+"""
+
+import math
+import re
+import threading
+from array import array
+from typing import Dict, Hashable, Iterable, List, NamedTuple, Optional, Tuple
+
+try:
+    from .normalization import normalize_message
+except ImportError:
+    # Dijalankan langsung dari folder api/
+    from normalization import normalize_message
+
+_PARAGRAPH_BREAK = re.compile(r'\n\s*\n')
+_TITLE = re.compile(r'\*\*(.+?)\*\*')
+
+# Kata fungsi yang tidak ikut diindeks maupun dicari
+STOPWORDS = frozenset({
+    'apa', 'itu', 'ini', 'yang', 'dan', 'di', 'ke', 'dari', 'untuk', 'dengan', 'atau',
+    'adalah', 'saya', 'anda', 'kamu', 'kita', 'ada', 'saja', 'juga', 'bisa', 'dapat',
+    'tidak', 'ya', 'dong', 'sih', 'hari', 'jadi', 'lebih', 'tentang', 'bagaimana',
+    'mengapa', 'the', 'a', 'an', 'is', 'of', 'to', 'and', 'what', 'how',
+})
+
+
+class VersionedDict(dict):
+    """dict yang menaikkan `version` setiap kali isinya diubah"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.version = 0
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.version += 1
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.version += 1
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self.version += 1
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self.version += 1
+        return super().setdefault(key, default)
+
+    def pop(self, *args):
+        self.version += 1
+        return super().pop(*args)
+
+    def popitem(self):
+        self.version += 1
+        return super().popitem()
+
+    def clear(self):
+        super().clear()
+        self.version += 1
+
+    def __reduce__(self):
+        # Unpickle lewat __init__ (dict subclass biasa mengisi item sebelum atribut dipulihkan)
+        return VersionedDict, (dict(self),)
+
+
+class RetrievalHit(NamedTuple):
+    """Bagian knowledge base yang paling cocok dengan pesan"""
+    key: Hashable
+    section: str
+    score: float
+
+
+def split_sections(text: str) -> List[str]:
+    """
+    Pecah respons knowledge base per paragraf. Judul yang berdiri sendiri
+    (mis. "**Dampak:**") digabung dengan paragraf berikutnya, dan kalimat
+    tanya penutup (mis. "Mau tahu lebih dalam ...?") tidak dijadikan bagian.
+    """
+    sections: List[str] = []
+    heading = None
+    for paragraph in _PARAGRAPH_BREAK.split(text.strip()):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if '\n' not in paragraph and paragraph.rstrip('*').endswith(':'):
+            heading = paragraph if heading is None else f"{heading}\n\n{paragraph}"
+            continue
+        if heading is not None:
+            paragraph = f"{heading}\n\n{paragraph}"
+            heading = None
+        elif '\n' not in paragraph and paragraph.endswith('?'):
+            continue
+        sections.append(paragraph)
+    if heading is not None:
+        sections.append(heading)
+    return sections
+
+
+class BM25Index:
+    """
+    Inverted index BM25 yang ringkas: per token satu array id dokumen (uint32)
+    dan satu array bobot (float32) yang sudah mencakup idf dan normalisasi panjang.
+    """
+
+    def __init__(self, documents: Iterable[Iterable[str]], k1: float = 1.2, b: float = 0.75):
+        """documents: token tiap dokumen"""
+        counts: List[Dict[str, int]] = []
+        lengths: List[int] = []
+        for tokens in documents:
+            tf: Dict[str, int] = {}
+            length = 0
+            for token in tokens:
+                if token in STOPWORDS:
+                    continue
+                tf[token] = tf.get(token, 0) + 1
+                length += 1
+            counts.append(tf)
+            lengths.append(length)
+
+        self.size = len(counts)
+        average_length = (sum(lengths) / self.size) if self.size else 0.0
+
+        doc_frequency: Dict[str, int] = {}
+        for tf in counts:
+            for token in tf:
+                doc_frequency[token] = doc_frequency.get(token, 0) + 1
+
+        self.postings: Dict[str, Tuple[array, array]] = {}
+        for doc_id, (tf, length) in enumerate(zip(counts, lengths)):
+            norm = k1 * (1.0 - b + b * length / average_length) if average_length else k1
+            for token, freq in tf.items():
+                df = doc_frequency[token]
+                idf = math.log(1.0 + (self.size - df + 0.5) / (df + 0.5))
+                posting = self.postings.get(token)
+                if posting is None:
+                    posting = self.postings[token] = (array('I'), array('f'))
+                posting[0].append(doc_id)
+                posting[1].append(idf * freq * (k1 + 1.0) / (freq + norm))
+
+    def search(self, tokens: Iterable[str]) -> Optional[Tuple[int, float]]:
+        """(id dokumen, skor) terbaik untuk token query, atau None jika tidak ada yang cocok"""
+        scores: Dict[int, float] = {}
+        for token in set(tokens) - STOPWORDS:
+            posting = self.postings.get(token)
+            if posting is None:
+                continue
+            for doc_id, weight in zip(*posting):
+                scores[doc_id] = scores.get(doc_id, 0.0) + weight
+
+        if not scores:
+            return None
+        # Skor sama: dokumen yang lebih awal (urutan knowledge base) menang
+        doc_id = min(scores, key=lambda d: (-scores[d], d))
+        return doc_id, scores[doc_id]
+
+
+class KnowledgeRetriever:
+    """
+    Cari bagian knowledge base yang paling relevan untuk pesan.
+    Judul respons (teks **tebal** pertama) ikut diindeks di setiap bagiannya
+    agar bagian seperti "**Dampak:**" tetap terhubung dengan topiknya.
+    """
+
+    def __init__(self, kb, min_score: float = 0.0, exclude: Iterable[Hashable] = ()):
+        """
+        kb        : objek dengan `responses` (dict key -> teks) dan `version`
+        min_score : skor BM25 minimum agar bagian dikembalikan
+        exclude   : key respons yang tidak diindeks (mis. respons UNKNOWN)
+        """
+        self.kb = kb
+        self.min_score = min_score
+        self.exclude = frozenset(exclude)
+        self._lock = threading.Lock()
+        # (versi knowledge base, bagian, index) diganti sekaligus saat rebuild
+        self._state: Tuple[Hashable, List[Tuple[Hashable, str]], BM25Index] = (None, [], BM25Index([]))
+        self._ensure_current()
+
+    def _ensure_current(self) -> Tuple[Hashable, List[Tuple[Hashable, str]], BM25Index]:
+        """Bangun ulang index jika knowledge base berubah sejak build terakhir"""
+        version = self.kb.version
+        state = self._state
+        if state[0] == version:
+            return state
+        with self._lock:
+            if self._state[0] == version:
+                return self._state
+            sections = []
+            documents = []
+            for key, text in list(self.kb.responses.items()):
+                if key in self.exclude:
+                    continue
+                title = _TITLE.search(text)
+                title_tokens = normalize_message(title.group(1)).tokens if title else ()
+                for section in split_sections(text):
+                    sections.append((key, section))
+                    documents.append(normalize_message(section).tokens + title_tokens)
+            self._state = (version, sections, BM25Index(documents))
+            return self._state
+
+    def sections(self) -> List[Tuple[Hashable, str]]:
+        """Semua bagian yang diindeks: (key respons, teks bagian)"""
+        return list(self._ensure_current()[1])
+
+    def search(self, tokens: Iterable[str]) -> Optional[RetrievalHit]:
+        """Bagian terbaik untuk token pesan (NormalizedMessage.tokens), atau None"""
+        _, sections, index = self._ensure_current()
+        result = index.search(tokens)
+        if result is None or result[1] < self.min_score:
+            return None
+        key, section = sections[result[0]]
+        return RetrievalHit(key, section, result[1])
@@ -0,0 +1,427 @@
+"""
+Rule pack: intent, pola, keyword, weight dan teks respons di luar kode Python.
+Content editor mengubah sumber JSON, lalu compiler memvalidasinya dan menulis
+artefak biner yang dimuat lewat mmap (halaman file dibagi antar worker lewat
+page cache) tanpa menjalankan _init_intent_patterns/_init_responses.
+
+Dari root repo:
+    python -m api.rulepack export api/rules/ecobuddy.json          # dari rules bawaan
+    python -m api.rulepack compile api/rules/ecobuddy.json api/rules/ecobuddy.erp
+
+Layout artefak (little-endian):
+    header : magic "ECORULES", u16 versi format, u16 jumlah section, u32 crc32 isi
+    tabel  : per section tag 4 byte, u32 offset, u32 panjang (isi rata 4 byte)
+    STRS   : string table, u32 n, u32 offset[n + 1], blob UTF-8 (semua string di-intern)
+    INTS   : per intent u32 nama, u32 awal/jumlah pola, u32 awal/jumlah keyword, f64 weight
+    PATS   : id string pola regex       KWDS : id string keyword
+    VOCB   : kosakata kata keyword      TERM : id string term automaton (urut term_id)
+    TENT   : entry term (u32 term_id, u32 intent)
+    WIDX   : indeks kata (u32 id kosakata, u32 intent, u32 jumlah)
+    ACND   : node Aho-Corasick (u32 awal/jumlah transisi, u32 fail, u32 awal/jumlah output)
+    ACTR   : transisi (u32 codepoint, u32 node)     ACOU : output (u32 term_id)
+    RESP   : respons (u32 nama intent, u32 teks)
+"""
+
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+import zlib
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from .chatbot_logic import EcoBuddyKnowledgeBase, Intent, IntentClassifier
+    from .matching import CompiledPatternSet, KeywordAutomaton, KeywordIndex
+    from .normalization import normalize_message
+except ImportError:
+    # Dijalankan langsung dari folder api/
+    from chatbot_logic import EcoBuddyKnowledgeBase, Intent, IntentClassifier
+    from matching import CompiledPatternSet, KeywordAutomaton, KeywordIndex
+    from normalization import normalize_message
+
+RULEPACK_MAGIC = b"ECORULES"
+RULEPACK_FORMAT = 1
+
+_HEADER = struct.Struct("<8sHHI")
+_SECTION = struct.Struct("<4sII")
+_INTENT_ROW = struct.Struct("<5Id")
+
+
+class RulePackError(ValueError):
+    """Sumber rule pack tidak valid atau artefak rusak/tidak cocok versinya"""
+
+
+def export_rules(classifier: Optional[IntentClassifier] = None,
+                 kb: Optional[EcoBuddyKnowledgeBase] = None) -> Dict:
+    """Rules classifier & knowledge base dalam bentuk sumber rule pack (JSON)"""
+    classifier = classifier or IntentClassifier(fuzzy_max_distance=0)
+    kb = kb or EcoBuddyKnowledgeBase()
+    return {
+        'format': RULEPACK_FORMAT,
+        'intents': [
+            {
+                'name': intent.value,
+                'weight': config['weight'],
+                'patterns': list(config['patterns']),
+                'keywords': list(config['keywords']),
+            }
+            for intent, config in classifier.intent_patterns.items()
+        ],
+        'responses': {intent.value: text for intent, text in kb.responses.items()},
+    }
+
+
+def validate_rules(source: Dict) -> Tuple[List[str], List[str]]:
+    """Periksa sumber rule pack. Returns: (errors, warnings)"""
+    errors: List[str] = []
+    warnings: List[str] = []
+    known = {intent.value for intent in Intent}
+
+    if source.get('format') != RULEPACK_FORMAT:
+        errors.append(f"format harus {RULEPACK_FORMAT}, bukan {source.get('format')!r}")
+
+    intents = source.get('intents')
+    if not isinstance(intents, list) or not intents:
+        return errors + ["'intents' harus list yang tidak kosong"], warnings
+
+    seen = set()
+    for position, item in enumerate(intents):
+        name = item.get('name') if isinstance(item, dict) else None
+        where = f"intents[{position}] ({name})"
+        if name not in known or name == Intent.UNKNOWN.value:
+            errors.append(f"{where}: nama intent tidak dikenal")
+            continue
+        if name in seen:
+            errors.append(f"{where}: intent duplikat")
+        seen.add(name)
+
+        weight = item.get('weight')
+        if not isinstance(weight, (int, float)) or isinstance(weight, bool) or weight <= 0:
+            errors.append(f"{where}: weight harus angka > 0")
+
+        patterns = item.get('patterns', [])
+        if not isinstance(patterns, list):
+            errors.append(f"{where}: patterns harus list")
+            patterns = []
+        for pattern in patterns:
+            if not isinstance(pattern, str) or not pattern:
+                errors.append(f"{where}: pola kosong atau bukan string: {pattern!r}")
+                continue
+            try:
+                compiled = re.compile(pattern, re.IGNORECASE)
+            except re.error as e:
+                errors.append(f"{where}: pola {pattern!r} tidak valid: {e}")
+                continue
+            if compiled.search(""):
+                errors.append(f"{where}: pola {pattern!r} cocok dengan string kosong")
+
+        keywords = item.get('keywords', [])
+        if not isinstance(keywords, list):
+            errors.append(f"{where}: keywords harus list")
+            keywords = []
+        for keyword in keywords:
+            if not isinstance(keyword, str) or not keyword.split():
+                errors.append(f"{where}: keyword kosong atau bukan string: {keyword!r}")
+                continue
+            # Keyword dicocokkan ke teks yang sudah dinormalisasi
+            normalized = normalize_message(keyword).text
+            if normalized != keyword:
+                warnings.append(f"{where}: keyword {keyword!r} tidak akan pernah cocok utuh "
+                                f"(setelah normalisasi: {normalized!r})")
+
+    responses = source.get('responses')
+    if not isinstance(responses, dict):
+        return errors + ["'responses' harus object nama intent -> teks"], warnings
+    for name, text in responses.items():
+        if name not in known:
+            errors.append(f"responses: nama intent tidak dikenal: {name!r}")
+        elif not isinstance(text, str) or not text.strip():
+            errors.append(f"responses[{name!r}]: teks kosong")
+    for name in sorted(seen | {Intent.UNKNOWN.value}):
+        if name not in responses:
+            errors.append(f"responses: intent {name!r} tidak punya respons")
+
+    if not errors:
+        # Semua pola juga harus bisa digabung menjadi satu regex
+        try:
+            CompiledPatternSet({item['name']: item.get('patterns', []) for item in intents})
+        except re.error as e:
+            errors.append(f"gabungan pola tidak valid: {e}")
+
+    return errors, warnings
+
+
+class _StringTable:
+    """Intern string: string yang sama hanya disimpan sekali"""
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.strings: List[str] = []
+
+    def intern(self, value: str) -> int:
+        string_id = self.ids.get(value)
+        if string_id is None:
+            string_id = self.ids[value] = len(self.strings)
+            self.strings.append(value)
+        return string_id
+
+    def encode(self) -> bytes:
+        blobs = [value.encode("utf-8") for value in self.strings]
+        offsets = array('I', [0])
+        for blob in blobs:
+            offsets.append(offsets[-1] + len(blob))
+        return struct.pack("<I", len(blobs)) + _le(offsets) + b"".join(blobs)
+
+
+def _le(values: array) -> bytes:
+    """Byte little-endian dari array('I')"""
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _u32(values) -> bytes:
+    return _le(array('I', values))
+
+
+def compile_rules(source: Dict) -> bytes:
+    """Validasi sumber rule pack lalu kembalikan artefak biner"""
+    errors, _ = validate_rules(source)
+    if errors:
+        raise RulePackError("Rule pack tidak valid:\n  " + "\n  ".join(errors))
+
+    strings = _StringTable()
+    intents = source['intents']
+
+    # Intent direferensikan dengan posisinya di INTS (urutan = prioritas saat skor sama)
+    keyword_index = KeywordIndex({
+        position: item.get('keywords', []) for position, item in enumerate(intents)
+    })
+
+    intent_rows, pattern_ids, keyword_ids = [], [], []
+    for item in intents:
+        patterns, keywords = item.get('patterns', []), item.get('keywords', [])
+        intent_rows.append(_INTENT_ROW.pack(
+            strings.intern(item['name']),
+            len(pattern_ids), len(patterns), len(keyword_ids), len(keywords),
+            float(item['weight'])
+        ))
+        pattern_ids.extend(strings.intern(pattern) for pattern in patterns)
+        keyword_ids.extend(strings.intern(keyword) for keyword in keywords)
+
+    vocabulary = sorted(keyword_index.word_index)
+    vocabulary_ids = {word: i for i, word in enumerate(vocabulary)}
+
+    term_entries = []
+    for term_id, entries in enumerate(keyword_index.term_entries):
+        for position, _, _ in entries:
+            term_entries.extend((term_id, position))
+
+    word_rows = []
+    for word in vocabulary:
+        for position, count in keyword_index.word_index[word].items():
+            word_rows.extend((vocabulary_ids[word], position, count))
+
+    goto, fail, output = keyword_index.automaton.tables()
+    nodes, transitions, outputs = [], [], []
+    for node, edges in enumerate(goto):
+        nodes.extend((len(transitions) // 2, len(edges), fail[node], len(outputs), len(output[node])))
+        for char, target in sorted(edges.items()):
+            transitions.extend((ord(char), target))
+        outputs.extend(output[node])
+
+    responses = []
+    for name, text in source['responses'].items():
+        responses.extend((strings.intern(name), strings.intern(text)))
+
+    sections = [
+        (b"INTS", b"".join(intent_rows)),
+        (b"PATS", _u32(pattern_ids)),
+        (b"KWDS", _u32(keyword_ids)),
+        (b"VOCB", _u32(strings.intern(word) for word in vocabulary)),
+        (b"TERM", _u32(strings.intern(term) for term in keyword_index.automaton.terms)),
+        (b"TENT", _u32(term_entries)),
+        (b"WIDX", _u32(word_rows)),
+        (b"ACND", _u32(nodes)),
+        (b"ACTR", _u32(transitions)),
+        (b"ACOU", _u32(outputs)),
+        (b"RESP", _u32(responses)),
+    ]
+    # String table terakhir di-encode setelah semua string di-intern
+    sections.insert(0, (b"STRS", strings.encode()))
+
+    offset = _HEADER.size + _SECTION.size * len(sections)
+    table, body = [], []
+    for tag, data in sections:
+        padding = -offset % 4
+        body.append(b"\0" * padding)
+        offset += padding
+        table.append(_SECTION.pack(tag, offset, len(data)))
+        body.append(data)
+        offset += len(data)
+
+    payload = b"".join(table) + b"".join(body)
+    return _HEADER.pack(RULEPACK_MAGIC, RULEPACK_FORMAT, len(sections), zlib.crc32(payload)) + payload
+
+
+def compile_file(source_path: str, output_path: str) -> List[str]:
+    """Compile sumber JSON ke artefak biner (ditulis atomik). Returns: warnings"""
+    with open(source_path, encoding="utf-8") as f:
+        source = json.load(f)
+    _, warnings = validate_rules(source)
+    data = compile_rules(source)
+
+    tmp_path = f"{output_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, output_path)
+    return warnings
+
+
+class RulePack:
+    """Artefak rule pack yang dimuat lewat mmap (read-only)"""
+
+    def __init__(self, buffer, source: str = "<bytes>"):
+        self.source = source
+        self._buffer = buffer
+        view = memoryview(buffer)
+
+        if len(view) < _HEADER.size:
+            raise RulePackError(f"{source}: file terlalu kecil untuk rule pack")
+        magic, version, count, checksum = _HEADER.unpack_from(view)
+        if magic != RULEPACK_MAGIC:
+            raise RulePackError(f"{source}: bukan file rule pack")
+        if version != RULEPACK_FORMAT:
+            raise RulePackError(f"{source}: versi format {version} tidak didukung (butuh {RULEPACK_FORMAT})")
+        if zlib.crc32(view[_HEADER.size:]) != checksum:
+            raise RulePackError(f"{source}: checksum tidak cocok (file rusak)")
+
+        self._sections: Dict[str, memoryview] = {}
+        for i in range(count):
+            tag, offset, length = _SECTION.unpack_from(view, _HEADER.size + i * _SECTION.size)
+            self._sections[tag.decode("ascii")] = view[offset:offset + length]
+
+        strings = self._sections['STRS']
+        (n_strings,) = struct.unpack_from("<I", strings)
+        self._string_offsets = self._array('STRS', start=4, count=n_strings + 1)
+        self._string_blob = strings[4 + 4 * (n_strings + 1):]
+
+    @classmethod
+    def load(cls, path: str) -> "RulePack":
+        """Muat artefak lewat mmap"""
+        with open(path, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(buffer, path)
+
+    def _array(self, tag: str, start: int = 0, count: Optional[int] = None):
+        """Isi section sebagai deretan u32 (tanpa salinan jika byte order native little-endian)"""
+        view = self._sections[tag][start:]
+        if count is not None:
+            view = view[:4 * count]
+        if sys.byteorder == "little":
+            return view.cast("I")
+        values = array('I', view.tobytes())
+        values.byteswap()
+        return values
+
+    def string(self, string_id: int) -> str:
+        start, end = self._string_offsets[string_id], self._string_offsets[string_id + 1]
+        return str(self._string_blob[start:end], "utf-8")
+
+    def _intents(self) -> List[Tuple[Intent, int, int, int, int, float]]:
+        return [
+            (Intent(self.string(name)), pattern_start, pattern_count, keyword_start, keyword_count, weight)
+            for name, pattern_start, pattern_count, keyword_start, keyword_count, weight
+            in _INTENT_ROW.iter_unpack(self._sections['INTS'])
+        ]
+
+    def intent_patterns(self) -> Dict:
+        """Rules dalam format IntentClassifier.intent_patterns"""
+        patterns, keywords = self._array('PATS'), self._array('KWDS')
+        return {
+            intent: {
+                'patterns': [self.string(i) for i in patterns[p_start:p_start + p_count]],
+                'keywords': [self.string(i) for i in keywords[k_start:k_start + k_count]],
+                'weight': weight,
+            }
+            for intent, p_start, p_count, k_start, k_count, weight in self._intents()
+        }
+
+    def keyword_index(self) -> KeywordIndex:
+        """KeywordIndex dari tabel yang sudah dikompilasi (tanpa membangun automaton ulang)"""
+        intents = [row[0] for row in self._intents()]
+
+        terms = [self.string(i) for i in self._array('TERM')]
+        term_entries: List[list] = [[] for _ in terms]
+        entries = self._array('TENT')
+        for i in range(0, len(entries), 2):
+            term_id = entries[i]
+            words = terms[term_id].split()
+            term_entries[term_id].append((intents[entries[i + 1]], len(words) * 2.0, words))
+
+        vocabulary = [self.string(i) for i in self._array('VOCB')]
+        word_index: Dict[str, Dict[Intent, int]] = {}
+        rows = self._array('WIDX')
+        for i in range(0, len(rows), 3):
+            word_index.setdefault(vocabulary[rows[i]], {})[intents[rows[i + 1]]] = rows[i + 2]
+
+        nodes = self._array('ACND').tolist()
+        transitions = self._array('ACTR').tolist()
+        chars, targets = [chr(c) for c in transitions[0::2]], transitions[1::2]
+        outputs = self._array('ACOU').tolist()
+        goto, output = [], []
+        for i in range(0, len(nodes), 5):
+            t_start, t_count, _, o_start, o_count = nodes[i:i + 5]
+            t_end = t_start + t_count
+            goto.append(dict(zip(chars[t_start:t_end], targets[t_start:t_end])))
+            output.append(tuple(outputs[o_start:o_start + o_count]))
+        fail = nodes[2::5]
+
+        automaton = KeywordAutomaton.from_tables(terms, goto, fail, output)
+        return KeywordIndex.from_tables(term_entries, word_index, automaton)
+
+    def responses(self) -> Dict[Intent, str]:
+        """Teks respons per intent"""
+        rows = self._array('RESP')
+        return {
+            Intent(self.string(rows[i])): self.string(rows[i + 1])
+            for i in range(0, len(rows), 2)
+        }
+
+
+def _main(argv: List[str]) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m api.rulepack", description="Export/compile rule pack EcoBuddy")
+    commands = parser.add_subparsers(dest="command", required=True)
+    export = commands.add_parser("export", help="Tulis rules bawaan chatbot_logic.py ke sumber JSON")
+    export.add_argument("source")
+    build = commands.add_parser("compile", help="Validasi sumber JSON dan tulis artefak biner")
+    build.add_argument("source")
+    build.add_argument("output")
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        with open(args.source, "w", encoding="utf-8") as f:
+            json.dump(export_rules(), f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"✅ Sumber rule pack ditulis ke {args.source}")
+        return 0
+
+    try:
+        warnings = compile_file(args.source, args.output)
+    except RulePackError as e:
+        print(f"❌ {e}")
+        return 1
+    for warning in warnings:
+        print(f"⚠️  {warning}")
+    print(f"✅ Rule pack ditulis ke {args.output} ({os.path.getsize(args.output):,} byte)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(_main(sys.argv[1:]))
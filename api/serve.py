@@ -0,0 +1,32 @@
+"""
+Menjalankan API di luar Vercel sesuai config.SERVER_MODE.
+Jalankan dari root repo:
+    python -m api.serve
+    SERVER_MODE=prefork python -m api.serve   # butuh: pip install gunicorn
+    SERVER_MODE=asgi python -m api.serve      # butuh: pip install uvicorn
+"""
+
+import os
+import sys
+
+from .config import DEBUG, PORT, SERVER_MODE
+
+
+def main():
+    if SERVER_MODE == "prefork":
+        from gunicorn.app.wsgiapp import run
+        config_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gunicorn_conf.py")
+        sys.argv = ["gunicorn", "-c", config_path, "api.index:app"]
+        run()
+    elif SERVER_MODE == "asgi":
+        import uvicorn
+        uvicorn.run("api.asgi:app", host="0.0.0.0", port=PORT, lifespan="on")
+    elif SERVER_MODE == "wsgi":
+        from .index import app
+        app.run(host="0.0.0.0", port=PORT, debug=DEBUG, threaded=True)
+    else:
+        raise ValueError(f"SERVER_MODE tidak dikenal: {SERVER_MODE!r} (pilih 'wsgi', 'prefork' atau 'asgi')")
+
+
+if __name__ == "__main__":
+    main()
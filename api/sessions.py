@@ -0,0 +1,134 @@
+"""
+Session percakapan untuk pertanyaan lanjutan ("Manfaatnya apa?" setelah
+bertanya tentang ekonomi sirkular).
+Setiap session hanya menyimpan beberapa intent terakhir dalam record
+__slots__ kecil. Jumlah session dan perkiraan byte-nya dibatasi secara global
+(LRU) dan session yang tidak aktif kedaluwarsa setelah TTL, sehingga memori
+tetap datar walaupun ada ratusan ribu client.
+
+Byte per session = sys.getsizeof(session_id) + record_overhead(history_size):
+record __slots__ 48 + float 24 + tuple intent 40 + 8 x history_size (intent
+sendiri objek enum bersama) + ~88 entry OrderedDict (slot hash table dan node
+linked list, diukur dengan tracemalloc, lihat benchmarks/session_bench.py).
+Dengan history 5: ~240 byte + id; id UUID 36 karakter (85 byte) ~325 byte,
+terburuk id 128 karakter non-ASCII (588 byte) ~830 byte per session.
+"""
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+# Session id lebih panjang dari ini diabaikan (membatasi memori per key)
+MAX_SESSION_ID_LENGTH = 128
+
+# Byte satu entry OrderedDict di luar key dan value (CPython 64-bit, diukur dengan tracemalloc)
+_ENTRY_BYTES = 88
+
+
+class SessionRecord:
+    """Intent terakhir satu session (terbaru di akhir) dan waktu kedaluwarsanya"""
+    __slots__ = ('intents', 'expires_at')
+
+    def __init__(self, intents: Tuple[Hashable, ...], expires_at: float):
+        self.intents = intents
+        self.expires_at = expires_at
+
+
+def record_overhead(history_size: int) -> int:
+    """Byte terburuk satu session di luar session_id-nya (history penuh)"""
+    return (sys.getsizeof(SessionRecord((), 0.0)) + sys.getsizeof(0.0)
+            + sys.getsizeof((None,) * history_size) + _ENTRY_BYTES)
+
+
+class SessionStore:
+    """
+    session_id -> SessionRecord dengan batas global max_sessions dan max_bytes (LRU),
+    maksimal history_size intent per session dan TTL sejak aktivitas terakhir.
+    """
+
+    def __init__(self, max_sessions: int, ttl: float, history_size: int = 5,
+                 clock: Callable[[], float] = time.monotonic, max_bytes: int = 0):
+        """max_bytes: batas perkiraan byte semua session (0 = hanya max_sessions)"""
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.history_size = max(1, history_size)
+        self._clock = clock
+        self._lock = threading.Lock()
+        # Urutan = urutan aktivitas terakhir, jadi yang paling lama di depan
+        self._records: "OrderedDict[str, SessionRecord]" = OrderedDict()
+        self._overhead = record_overhead(self.history_size)
+        self.bytes = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def history(self, session_id: str) -> Tuple[Hashable, ...]:
+        """Intent terakhir session (terbaru di akhir), tuple kosong jika tidak ada/kedaluwarsa"""
+        now = self._clock()
+        with self._lock:
+            record = self._records.get(session_id)
+            if record is None:
+                return ()
+            if record.expires_at <= now:
+                del self._records[session_id]
+                self.bytes -= self._size(session_id)
+                self.expirations += 1
+                return ()
+            return record.intents
+
+    def last_intent(self, session_id: str) -> Optional[Hashable]:
+        intents = self.history(session_id)
+        return intents[-1] if intents else None
+
+    def record(self, session_id: str, intent: Hashable):
+        """Tambahkan intent ke session dan perpanjang TTL-nya"""
+        if not session_id or len(session_id) > MAX_SESSION_ID_LENGTH:
+            return
+
+        now = self._clock()
+        with self._lock:
+            record = self._records.get(session_id)
+            if record is None:
+                self.bytes += self._size(session_id)
+            if record is None or record.expires_at <= now:
+                self._records[session_id] = SessionRecord((intent,), now + self.ttl)
+            else:
+                intents = record.intents
+                if intents[-1] != intent:
+                    intents = (intents + (intent,))[-self.history_size:]
+                record.intents = intents
+                record.expires_at = now + self.ttl
+            self._records.move_to_end(session_id)
+            self._evict(now)
+
+    def _size(self, session_id: str) -> int:
+        return sys.getsizeof(session_id) + self._overhead
+
+    def _evict(self, now: float):
+        """Buang session kedaluwarsa di depan antrean, lalu LRU jika melebihi batas"""
+        records = self._records
+        while records:
+            oldest = next(iter(records.values()))
+            if oldest.expires_at > now:
+                break
+            self.bytes -= self._size(records.popitem(last=False)[0])
+            self.expirations += 1
+        # Session yang baru dicatat (paling belakang) selalu disimpan
+        while len(records) > 1 and (len(records) > self.max_sessions
+                                    or (self.max_bytes and self.bytes > self.max_bytes)):
+            self.bytes -= self._size(records.popitem(last=False)[0])
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'sessions': len(self._records),
+                'bytes': self.bytes,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
@@ -0,0 +1,32 @@
+"""
+Format Server-Sent Events untuk endpoint /api/chat/stream.
+Dipakai bersama oleh app Flask (index.py) dan app ASGI (asgi.py).
+"""
+
+import json
+from typing import Iterator
+
+try:
+    from .chatbot_logic import BotReply
+except ImportError:
+    # Dijalankan langsung dari folder api/
+    from chatbot_logic import BotReply
+
+
+def sse_event(event: str, data: dict) -> str:
+    """Format satu event Server-Sent Events"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def iter_reply_events(reply: BotReply, chunk_size: int) -> Iterator[str]:
+    """Event 'intent' lebih dulu, lalu teks respons per potongan, diakhiri 'done'"""
+    yield sse_event("intent", {
+        "intent": reply.intent.value,
+        "confidence": reply.confidence
+    })
+
+    text = reply.response
+    for start in range(0, len(text), chunk_size):
+        yield sse_event("chunk", {"text": text[start:start + chunk_size]})
+
+    yield sse_event("done", {})
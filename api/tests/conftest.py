@@ -0,0 +1,7 @@
+# Test mengimpor modul lewat paket `api` (seperti Vercel/gunicorn). `python -m pytest` dari
+# root repo sudah menambahkan root ke sys.path, `pytest` biasa tidak; folder api/ sendiri
+# sengaja tidak ditambahkan agar chatbot_logic tidak terimpor dua kali (api.* dan top-level)
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
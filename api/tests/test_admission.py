@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+
+from api import index
+from api.admission import (AdmissionController, AdmissionRejected, AsyncAdmissionController,
+                           TokenBucketLimiter, client_address)
+
+
+def test_batch_weight_takes_slots_up_to_limit():
+    admission = AdmissionController(4, 0, 0.01)
+    admission.acquire(3)
+    with pytest.raises(AdmissionRejected):
+        admission.acquire(2)
+    admission.release(3)
+    # Batch lebih besar dari semua slot tetap bisa masuk, tetapi sendirian
+    with admission.admit(1000):
+        assert admission.in_flight == 4
+    assert admission.in_flight == 0
+
+
+def test_async_admission_is_fifo_and_times_out():
+    async def scenario():
+        admission = AsyncAdmissionController(2, 1, 0.05)
+        await admission.acquire_async(1)
+        batch = asyncio.ensure_future(admission.acquire_async(2))
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected):
+            await admission.acquire_async(1)
+        admission.release(1)
+        await batch
+        assert admission.in_flight == 2 and admission.queued == 0
+        with pytest.raises(AdmissionRejected):
+            await admission.acquire_async(1)
+        admission.release(2)
+        stats = admission.stats()
+        assert stats['rejected_queue_full'] == 1 and stats['rejected_timeout'] == 1
+        assert admission.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_rate_limit_cost_and_debt():
+    now = [0.0]
+    limiter = TokenBucketLimiter(1.0, 10, clock=lambda: now[0])
+    assert limiter.allow("a", 50)
+    assert not limiter.allow("a")
+    now[0] += 39.0
+    assert not limiter.allow("a")
+    now[0] += 2.0
+    assert limiter.allow("a")
+
+
+def test_forwarded_for_only_behind_trusted_proxy():
+    assert client_address("10.0.0.1", "6.6.6.6", 0) == "10.0.0.1"
+    assert client_address("10.0.0.1", "6.6.6.6, 1.2.3.4", 1) == "1.2.3.4"
+    assert client_address("10.0.0.1", "6.6.6.6, 1.2.3.4, 10.0.0.2", 2) == "1.2.3.4"
+
+
+def test_batch_and_stream_are_load_shed(monkeypatch):
+    client = index.app.test_client()
+    monkeypatch.setattr(index, "rate_limiter", TokenBucketLimiter(1.0, 3))
+    assert client.post("/api/chat/batch", json={"messages": ["halo"] * 5}).status_code == 200
+    response = client.post("/api/chat/batch", json={"messages": ["halo"]})
+    assert response.status_code == 429 and "Retry-After" in response.headers
+    assert client.post("/api/chat/stream", json={"message": "halo"}).status_code == 429
+
+    monkeypatch.setattr(index, "rate_limiter", TokenBucketLimiter(0, 0))
+    full = AdmissionController(1, 0, 0.01)
+    full.acquire()
+    monkeypatch.setattr(index, "admission", full)
+    assert client.post("/api/chat/batch", json={"messages": ["halo"]}).status_code == 503
+    assert client.post("/api/chat/stream", json={"message": "halo"}).status_code == 503
+    full.release()
+    assert client.post("/api/chat/stream", json={"message": "halo"}).status_code == 200
+
+
+def test_cached_reply_only_when_admission_sheds(monkeypatch):
+    client = index.app.test_client()
+    message = {"message": "apa itu ekonomi sirkular"}
+    monkeypatch.setattr(index, "rate_limiter", TokenBucketLimiter(0, 0))
+    assert client.post("/api/chat", json=message).status_code == 200
+
+    # Rate limit: selalu 429 walaupun jawabannya ada di cache
+    monkeypatch.setattr(index, "rate_limiter", TokenBucketLimiter(0.001, 1))
+    assert client.post("/api/chat", json=message).status_code == 200
+    response = client.post("/api/chat", json=message)
+    assert response.status_code == 429 and "Retry-After" in response.headers
+
+    # Admission penuh: jawaban cache, pesan lain 503
+    monkeypatch.setattr(index, "rate_limiter", TokenBucketLimiter(0, 0))
+    full = AdmissionController(1, 0, 0.01)
+    full.acquire()
+    monkeypatch.setattr(index, "admission", full)
+    response = client.post("/api/chat", json=message)
+    assert response.status_code == 200 and response.headers["X-Load-Shed"] == "cached"
+    response = client.post("/api/chat", json={"message": "pesan yang belum pernah ditanyakan"})
+    assert response.status_code == 503 and "Retry-After" in response.headers
@@ -0,0 +1,57 @@
+import asyncio
+import gzip
+import json
+
+from api.asgi import ChatASGIApp
+
+
+def call(app, method, path, body=b"", headers=()):
+    """Satu request ASGI; (status, header, body)"""
+    scope = {"type": "http", "method": method, "path": path, "headers": list(headers),
+             "client": ("127.0.0.1", 1234)}
+    received = [{"type": "http.request", "body": body, "more_body": False}]
+    sent = []
+
+    async def receive():
+        return received.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    return sent[0]["status"], dict(sent[0]["headers"]), b"".join(m.get("body", b"") for m in sent[1:])
+
+
+def test_chat_matches_flask_response():
+    app = ChatASGIApp()
+    status, headers, body = call(app, "POST", "/api/chat", json.dumps({
+        "message": "apa itu ekonomi sirkular", "session_id": "s1",
+    }).encode(), [(b"accept-encoding", b"gzip")])
+    assert status == 200
+    assert headers[b"content-encoding"] == b"gzip" and headers[b"etag"]
+    assert "ekonomi sirkular" in json.loads(gzip.decompress(body))["response"].lower()
+
+
+def test_health_endpoints():
+    app = ChatASGIApp()
+    assert call(app, "GET", "/healthz")[0] == 200
+    call(app, "POST", "/api/chat", b'{"message": "halo"}')
+    status, _, body = call(app, "GET", "/readyz")
+    assert status == 200 and json.loads(body) == {"status": "ready"}
+
+
+def test_batch_replies_per_message():
+    app = ChatASGIApp()
+    status, _, body = call(app, "POST", "/api/chat/batch",
+                           json.dumps({"messages": ["apa itu ekonomi sirkular", "terima kasih"]}).encode())
+    assert status == 200
+    assert [result["intent"] for result in json.loads(body)["results"]] == ["ce_definition", "thanks"]
+
+
+def test_bad_json_is_rejected():
+    app = ChatASGIApp()
+    for body in (b"{bukan json", b"[1, 2]", b'"halo"', b"null"):
+        status, _, response = call(app, "POST", "/api/chat", body)
+        assert status == 400, body
+        assert "error" in json.loads(response)
+    assert call(app, "POST", "/api/chat/batch", b'{"messages": "halo"}')[0] == 400
@@ -0,0 +1,14 @@
+import json
+
+from api import index
+
+
+def test_if_none_match_is_ignored_on_post():
+    client = index.app.test_client()
+    first = client.post("/api/chat", json={"message": "apa itu ekonomi sirkular"})
+    assert first.status_code == 200 and first.headers["ETag"]
+
+    again = client.post("/api/chat", json={"message": "apa itu ekonomi sirkular"},
+                        headers={"If-None-Match": first.headers["ETag"]})
+    assert again.status_code == 200
+    assert json.loads(again.get_data()) == json.loads(first.get_data())
@@ -0,0 +1,30 @@
+from api import fuzzy
+from api.chatbot_logic import Intent, IntentClassifier
+from api.fuzzy import FUZZY_IGNORE, SymSpellIndex
+
+
+def test_typos_are_corrected():
+    classifier = IntentClassifier()
+    index = classifier.typo_index
+    assert index.lookup("sirkuler") == "sirkular"
+    assert index.lookup("sustainibility") == "sustainability"
+    assert index.lookup("plastk") == "plastik"
+    assert classifier.classify("apa itu sustainibility")[0] == Intent.SUSTAINABILITY_GENERAL
+
+
+def test_common_words_are_not_corrected(monkeypatch):
+    vocabulary = IntentClassifier().typo_index.vocabulary
+    assert all(SymSpellIndex(vocabulary).lookup(word) is None for word in FUZZY_IGNORE)
+
+    # Tanpa FUZZY_IGNORE kata-kata ini "dikoreksi" ke kata intent, mis. "sampai" -> "sampah"
+    monkeypatch.setattr(fuzzy, "FUZZY_IGNORE", frozenset())
+    index = SymSpellIndex(vocabulary)
+    assert index.lookup("sampai") == "sampah"
+    assert index.lookup("majalah") == "masalah"
+    assert index.lookup("bahasa") == "bahaya"
+
+
+def test_fuzzy_can_be_disabled():
+    classifier = IntentClassifier(fuzzy_max_distance=0)
+    assert classifier.typo_index is None
+    assert classifier.classify("apa itu sustainibility")[0] != Intent.SUSTAINABILITY_GENERAL
@@ -0,0 +1,23 @@
+import gzip
+import json
+
+from api.intent_anlyzer import BatchSummary, iter_messages
+
+
+def test_bad_jsonl_lines_are_skipped_and_counted(tmp_path):
+    path = tmp_path / "messages.jsonl.gz"
+    lines = [
+        json.dumps({"message": "apa itu ekonomi sirkular"}),
+        '{"message": "terpotong',
+        json.dumps(["bukan", "object"]),
+        json.dumps("string"),
+        json.dumps({"text": "tanpa field message"}),
+        "",
+        json.dumps({"message": "tips hemat energi"}),
+    ]
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+    summary = BatchSummary()
+    assert list(iter_messages(str(path), summary=summary)) == ["apa itu ekonomi sirkular", "tips hemat energi"]
+    assert summary.skipped == 4
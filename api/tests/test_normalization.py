@@ -0,0 +1,20 @@
+from api.chatbot_logic import Intent, IntentClassifier
+from api.normalization import INFORMAL_VARIANTS, normalize_message
+
+
+def test_variants_are_not_chained():
+    # Penggantian hanya satu kali: hasil penggantian harus sudah bentuk akhir
+    for variant, replacement in INFORMAL_VARIANTS.items():
+        for word in replacement.split():
+            assert word not in INFORMAL_VARIANTS, (variant, replacement)
+
+
+def test_informal_why_matches_formal():
+    expected = normalize_message("mengapa ekonomi sirkular penting").tokens
+    assert normalize_message("knp ekonomi sirkular penting").tokens == expected
+    assert normalize_message("kenapa ekonomi sirkular penting").tokens == expected
+
+
+def test_makasih_is_thanks():
+    assert normalize_message("makasih ya").text == "terima kasih ya"
+    assert IntentClassifier().classify("makasih ya")[0] == Intent.THANKS
@@ -0,0 +1,19 @@
+from api.benchmarks.corpus import MessageGenerator
+from api.chatbot_logic import IntentClassifier
+
+
+def test_pruned_and_guarded_scores_match_full_scoring():
+    exhaustive = IntentClassifier(pruning=False, guarded=False)
+    pruned = IntentClassifier(guarded=False)
+    guarded = IntentClassifier(time_budget=0)
+    # Guarded tidak memakai CandidateIndex (lihat INTENT_PRUNING di config.py)
+    assert guarded.candidate_index is None
+    corpus = MessageGenerator(exhaustive, seed=7).generate({'short': 300, 'medium': 300, 'long': 20})
+
+    for message, _, _ in corpus:
+        normalized = exhaustive.normalize(message)
+        expected = {intent: score for intent, score in exhaustive._score_exhaustive(normalized).items() if score > 0}
+        for classifier in (pruned, guarded):
+            scores, complete = classifier._score_normalized(normalized)
+            assert complete
+            assert {intent: score for intent, score in scores.items() if score > 0} == expected, message
@@ -0,0 +1,23 @@
+from api.chatbot_logic import CircularEconomyBot, Intent
+
+
+def test_fallback_answers_with_matching_section():
+    bot = CircularEconomyBot(cache_size=0)
+    cases = {
+        "suhu bumi naik 1.1 derajat": (Intent.CLIMATE_CHANGE, "**Dampak:**"),
+        "batu bara minyak fosil pembakaran": (Intent.CLIMATE_CHANGE, "**Penyebab Utama:**"),
+        "H&M dan Zara program take-back": (Intent.CE_EXAMPLES, "**Industri:**"),
+    }
+    for message, (key, heading) in cases.items():
+        reply = bot.get_reply(message)
+        assert reply.fallback_used and reply.intent == Intent.UNKNOWN
+        assert reply.response.startswith(heading), message
+        hit = bot.retriever.search(bot.classifier.normalize(message).tokens)
+        assert hit.key == key and hit.section in bot.kb.responses[key]
+
+
+def test_fallback_without_relevant_section():
+    bot = CircularEconomyBot(cache_size=0)
+    reply = bot.get_reply("qwerty zxcv")
+    assert reply.fallback_used and "belum memahami" in reply.response
+    assert bot.retriever.search(bot.classifier.normalize("qwerty zxcv").tokens) is None
@@ -0,0 +1,47 @@
+import json
+import os
+
+import pytest
+
+from api.chatbot_logic import EcoBuddyKnowledgeBase, IntentClassifier
+from api.rulepack import RulePack, RulePackError, compile_rules, export_rules
+
+SOURCE = os.path.join(os.path.dirname(os.path.dirname(__file__)), "rules", "ecobuddy.json")
+
+
+def load_source() -> dict:
+    with open(SOURCE, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_json_source_matches_builtin_rules():
+    # Gagal jika chatbot_logic.py diubah tanpa `python -m api.rulepack export api/rules/ecobuddy.json`
+    assert export_rules() == load_source()
+
+
+def test_compiled_pack_round_trips():
+    pack = RulePack(compile_rules(load_source()))
+    classifier = IntentClassifier.from_rule_pack(pack)
+    builtin = IntentClassifier()
+    assert classifier.intent_patterns == builtin.intent_patterns
+    assert EcoBuddyKnowledgeBase.from_rule_pack(pack).responses == EcoBuddyKnowledgeBase().responses
+    for message in ("apa itu ekonomi sirkular", "bahaya plastik", "terima kasih", "sirkuler itu apa"):
+        assert classifier.classify(message) == builtin.classify(message)
+
+
+def test_corrupted_pack_is_rejected(tmp_path):
+    data = bytearray(compile_rules(load_source()))
+    data[len(data) // 2] ^= 0xFF
+    path = tmp_path / "ecobuddy.erp"
+    path.write_bytes(bytes(data))
+    with pytest.raises(RulePackError, match="checksum"):
+        RulePack.load(str(path))
+    with pytest.raises(RulePackError):
+        RulePack(b"BUKAN RULE PACK SAMA SEKALI")
+
+
+def test_invalid_source_is_rejected():
+    source = load_source()
+    source['intents'][0]['patterns'].append("(tidak ditutup")
+    with pytest.raises(RulePackError):
+        compile_rules(source)
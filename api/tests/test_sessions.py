@@ -0,0 +1,38 @@
+import sys
+
+from api.sessions import SessionStore, record_overhead
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_byte_budget_evicts_oldest_sessions():
+    per_session = sys.getsizeof("session-0000") + record_overhead(5)
+    store = SessionStore(1000, ttl=60, history_size=5, max_bytes=per_session * 10)
+    for i in range(25):
+        store.record(f"session-{i:04d}", "intent")
+    assert len(store) == 10
+    assert store.bytes == per_session * 10
+    assert store.last_intent("session-0014") is None
+    assert store.last_intent("session-0024") == "intent"
+
+
+def test_bytes_are_released_on_expiry():
+    clock = FakeClock()
+    store = SessionStore(1000, ttl=60, clock=clock)
+    store.record("a", 1)
+    store.record("b" * 100, 2)
+    store.record("a", 3)
+    assert store.bytes == sys.getsizeof("a") + sys.getsizeof("b" * 100) + 2 * record_overhead(5)
+
+    clock.now = 61
+    assert store.history("a") == ()
+    store.record("c", 4)
+    assert len(store) == 1
+    assert store.bytes == sys.getsizeof("c") + record_overhead(5)
+    assert store.stats()['bytes'] == store.bytes
@@ -0,0 +1,31 @@
+from api.benchmarks.corpus import MessageGenerator
+from api.chatbot_logic import EcoBuddyKnowledgeBase, Intent, IntentClassifier
+from api.snapshot import build_snapshot, load_snapshot
+
+
+def test_loaded_snapshot_classifies_like_fresh_build(tmp_path):
+    path = str(tmp_path / "classifier_snapshot.pkl")
+    build_snapshot(path)
+    loaded, kb = load_snapshot(path)
+    fresh = IntentClassifier()
+
+    # Cache DFA tidak ikut di-pickle: snapshot yang baru dimuat selalu dingin
+    assert loaded.linear_matcher.cached_states <= 1
+
+    messages = [message for message, _, _ in MessageGenerator(fresh, seed=7).generate(
+        {'short': 200, 'medium': 200, 'long': 50, 'adversarial': 10})]
+    messages.append("apa itu " + " ".join(["kata"] * 400) + " ekonomi sirkular")
+    for message in messages:
+        assert loaded.classify(message) == fresh.classify(message), message
+    assert loaded.classify(messages[-1]) == (Intent.CE_DEFINITION, 1.0)
+    assert loaded.budget_exhausted == 0
+    assert kb.responses == EcoBuddyKnowledgeBase().responses
+
+
+def test_snapshot_built_with_other_settings_is_ignored(tmp_path, monkeypatch):
+    import api.snapshot as snapshot
+
+    path = str(tmp_path / "classifier_snapshot.pkl")
+    build_snapshot(path)
+    monkeypatch.setattr(snapshot, "GUARDED_MATCHING", not snapshot.GUARDED_MATCHING)
+    assert load_snapshot(path) is None
@@ -0,0 +1,36 @@
+from api.chatbot_logic import CircularEconomyBot, Intent, IntentClassifier
+
+# Pesan panjang yang wajar (di bawah MAX_MESSAGE_LENGTH) dengan pola di akhir
+LONG_MESSAGE = "apa itu " + " ".join(["kata"] * 400) + " ekonomi sirkular"
+
+
+def test_budget_is_opt_in():
+    classifier = IntentClassifier()
+    scores = classifier.score(LONG_MESSAGE)
+    assert scores.complete
+    assert scores.intent == Intent.CE_DEFINITION
+    assert classifier.budget_exhausted == 0
+
+
+def test_exhausted_budget_is_reported():
+    classifier = IntentClassifier(time_budget=1e-9)
+    scores = classifier.score(LONG_MESSAGE)
+    assert not scores.complete
+    assert classifier.budget_exhausted == 1
+    assert classifier.classify_with_status(LONG_MESSAGE)[2] is False
+    # Budget per panggilan (mis. job offline) menggantikan budget classifier
+    assert classifier.score(LONG_MESSAGE, time_budget=0).complete
+
+
+def test_partial_reply_is_not_cached_or_recorded_in_session():
+    bot = CircularEconomyBot(classifier=IntentClassifier(time_budget=1e-9))
+    reply = bot.get_reply(LONG_MESSAGE, session_id="s1")
+    assert not reply.complete
+    assert len(bot.response_cache) == 0
+    assert bot.sessions.last_intent("s1") is None
+
+    bot.classifier.time_budget = 0
+    reply = bot.get_reply(LONG_MESSAGE, session_id="s1")
+    assert reply.complete and reply.intent == Intent.CE_DEFINITION
+    assert len(bot.response_cache) == 1
+    assert bot.sessions.last_intent("s1") == Intent.CE_DEFINITION
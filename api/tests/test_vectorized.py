@@ -0,0 +1,18 @@
+import pytest
+
+from api.benchmarks.corpus import MessageGenerator
+from api.benchmarks.vectorized_bench import build_log_corpus
+from api.chatbot_logic import IntentClassifier
+
+pytest.importorskip("numpy")
+
+
+def test_vectorized_scorer_matches_rules_scorer():
+    classifier = IntentClassifier()
+    messages = build_log_corpus(classifier, 3000, seed=7)
+    messages += [message for message, _, _ in MessageGenerator(classifier, seed=7).generate(
+        {'short': 300, 'medium': 300, 'long': 20})]
+    messages += ["", "   ", "sirkuler", "apa itu sustainibility"]
+
+    expected = [classifier.classify(message) for message in messages]
+    assert classifier.classify_batch(messages, vectorized=True) == expected
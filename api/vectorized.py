@@ -0,0 +1,146 @@
+"""
+Scoring intent tervektorisasi dengan NumPy untuk evaluasi offline korpus besar.
+Hasilnya identik dengan IntentClassifier.classify, tetapi skor, argmax dan
+confidence dihitung sebagai operasi array untuk ribuan pesan sekaligus.
+
+NumPy tidak termasuk dependency API (Vercel), install terpisah:
+    pip install numpy
+"""
+
+from typing import Dict, List, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - tergantung environment
+    np = None
+
+try:
+    from .chatbot_logic import Intent, IntentClassifier
+except ImportError:
+    # Dijalankan langsung dari folder api/
+    from chatbot_logic import Intent, IntentClassifier
+
+
+class VectorizedIntentScorer:
+    """
+    Scoring banyak pesan sekaligus dengan matriks fitur sparse (format COO).
+
+    Fitur per pesan:
+    - token   : kata keyword yang ada di token pesan           (T)
+    - keyword : keyword yang ditemukan utuh oleh automaton      (F)
+    - overlap : jumlah kata keyword utuh yang juga ada di token (H)
+    - pattern : intent yang polanya cocok                       (P, dense)
+
+    Skor keyword mentah = T @ W_token + F @ W_full - 0.5 * H @ W_entry,
+    lalu skor = where(P, 10 * weight, 0) + skor_keyword * weight,
+    persis urutan operasi di IntentClassifier._score_normalized.
+    """
+
+    def __init__(self, classifier: IntentClassifier, chunk_size: int = 50000):
+        if np is None:
+            raise ImportError("VectorizedIntentScorer membutuhkan numpy (pip install numpy)")
+
+        self.classifier = classifier
+        self.chunk_size = chunk_size
+        self.intents: List[Intent] = list(classifier.intent_patterns)
+        self._intent_index: Dict[Intent, int] = {intent: i for i, intent in enumerate(self.intents)}
+        self.weights = np.array(
+            [classifier.intent_patterns[intent]['weight'] for intent in self.intents],
+            dtype=np.float64
+        )
+        self._pattern_scores = 10.0 * self.weights
+
+        index = classifier.keyword_index
+        n_intents = len(self.intents)
+
+        # Kolom token: kata keyword -> baris di W_token
+        self._token_columns: Dict[str, int] = {}
+        self.w_token = np.zeros((len(index.word_index), n_intents), dtype=np.float64)
+        for column, (word, counts) in enumerate(index.word_index.items()):
+            self._token_columns[word] = column
+            for intent, count in counts.items():
+                self.w_token[column, self._intent_index[intent]] = count * 0.5
+
+        # Kolom keyword: term automaton -> skor utuh dan jumlah entry per intent
+        n_terms = len(index.term_entries)
+        self.w_full = np.zeros((n_terms, n_intents), dtype=np.float64)
+        self.w_entry = np.zeros((n_terms, n_intents), dtype=np.float64)
+        self._term_words: List[List[List[str]]] = []
+        for term_id, entries in enumerate(index.term_entries):
+            for intent, full_score, _ in entries:
+                self.w_full[term_id, self._intent_index[intent]] += full_score
+                self.w_entry[term_id, self._intent_index[intent]] += 1.0
+            self._term_words.append(entries[0][2])
+
+    def _extract(self, messages: List[str]):
+        """Bangun fitur sparse (COO) untuk teks pesan yang sudah dinormalisasi (NormalizedMessage.text)"""
+        matcher = self.classifier.pattern_matcher
+        automaton = self.classifier.keyword_index.automaton
+        token_columns = self._token_columns
+        intent_index = self._intent_index
+
+        pattern_hits = np.zeros((len(messages), len(self.intents)), dtype=bool)
+        token_rows, token_cols = [], []
+        term_rows, term_cols, overlap_vals = [], [], []
+
+        for row, message in enumerate(messages):
+            if not message:
+                continue
+
+            for intent in matcher.match(message):
+                pattern_hits[row, intent_index[intent]] = True
+
+            tokens = set(message.split())
+            for token in tokens:
+                column = token_columns.get(token)
+                if column is not None:
+                    token_rows.append(row)
+                    token_cols.append(column)
+
+            for term_id in automaton.find(message):
+                term_rows.append(row)
+                term_cols.append(term_id)
+                overlap_vals.append(sum(1 for word in self._term_words[term_id] if word in tokens))
+
+        return (
+            pattern_hits,
+            (np.array(token_rows, dtype=np.intp), np.array(token_cols, dtype=np.intp)),
+            (np.array(term_rows, dtype=np.intp), np.array(term_cols, dtype=np.intp),
+             np.array(overlap_vals, dtype=np.float64)),
+        )
+
+    def score_matrix(self, messages: List[str]) -> "np.ndarray":
+        """Matriks skor (jumlah_pesan x jumlah_intent) untuk teks yang sudah dinormalisasi"""
+        pattern_hits, (token_rows, token_cols), (term_rows, term_cols, overlaps) = self._extract(messages)
+
+        keyword_scores = np.zeros((len(messages), len(self.intents)), dtype=np.float64)
+        np.add.at(keyword_scores, token_rows, self.w_token[token_cols])
+        np.add.at(keyword_scores, term_rows, self.w_full[term_cols])
+        np.add.at(keyword_scores, term_rows, -0.5 * overlaps[:, None] * self.w_entry[term_cols])
+
+        base = np.where(pattern_hits, self._pattern_scores, 0.0)
+        return base + keyword_scores * self.weights
+
+    def classify_many(self, messages: List[str]) -> List[Tuple[Intent, float]]:
+        """Sama dengan [classifier.classify(m) for m in messages], tetapi tervektorisasi"""
+        normalized = np.array([self.classifier.normalize(message).text for message in messages], dtype=object)
+        results: List[Tuple[Intent, float]] = []
+
+        for start in range(0, len(normalized), self.chunk_size):
+            chunk = normalized[start:start + self.chunk_size]
+            # Log percakapan sangat repetitif: fitur cukup dihitung untuk pesan unik
+            unique, inverse = np.unique(chunk.astype(str), return_inverse=True)
+
+            scores = self.score_matrix(unique.tolist())
+            best_index = np.argmax(scores, axis=1)
+            best_score = scores[np.arange(len(unique)), best_index]
+            confidences = np.minimum(best_score / 20.0, 1.0)
+            known = best_score > 0.0
+
+            unique_results = [
+                (self.intents[i], float(c)) if ok else (Intent.UNKNOWN, 0.0)
+                for i, c, ok in zip(best_index.tolist(), confidences.tolist(), known.tolist())
+            ]
+            results.extend(unique_results[i] for i in inverse.ravel().tolist())
+
+        return results